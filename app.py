@@ -8,7 +8,7 @@ import json
 from typing import Dict, Any, Optional
 
 # Import configuration first
-from config.settings import APP_TITLE, APP_ICON, DEFAULT_THEME, DEFAULT_LANGUAGE
+from config.settings import APP_TITLE, APP_ICON, DEFAULT_THEME, DEFAULT_LANGUAGE, LLM_CACHE_ENABLED, MODEL_ROUTING_ENABLED
 
 from dotenv import load_dotenv
 load_dotenv()  # This will load the environment variables from .env
@@ -25,8 +25,11 @@ st.set_page_config(
 from config.prompts import DEFAULT_PROMPTS
 
 # Import services
-from services.llm_service import LLMService
-from services.news_service import NewsAPIService
+from services.llm_service import get_llm_service
+from services.llm_cache import get_llm_cache
+from services.telemetry import get_telemetry_log
+from services.llm_limiter import get_llm_limiter
+from services.model_router import get_model_router
 
 # Import models
 from models.newsletter import Newsletter
@@ -57,9 +60,8 @@ from utils.file_utils import (
 from utils.content_utils import export_newsletter
 from utils.autosave import setup_autosave
 
-# Initialize services
-llm_service = LLMService()
-news_service = NewsAPIService()
+# Services are process-wide; each run gets its own copy for the per-session settings
+llm_service = get_llm_service().with_options()
 
 # Setup session state
 if "newsletter_data" not in st.session_state:
@@ -239,14 +241,103 @@ def render_sidebar(llm_service):
         "Select Model",
         options=list(models.keys()),
         format_func=lambda x: models[x],
-        key="selected_model"
+        key="selected_model",
+        on_change=lambda: st.session_state.update(model_explicit=True)
     )
     
+    # Section routing controls
+    with st.sidebar.expander("Model Routing", expanded=False):
+        llm_service.route_models = st.checkbox(
+            "Route sections to model tiers",
+            value=MODEL_ROUTING_ENABLED,
+            key="model_routing",
+            help="Short sections such as Rearview Mirror use a faster model, and every section gets its own output cap"
+        )
+        # A model other than the provider's first one was picked, whether in an earlier run or
+        # from a restored session, unless the user has since handed the choice back to routing
+        llm_service.explicit_model = st.session_state.get(
+            "model_explicit", selected_model != next(iter(models), selected_model)
+        )
+        if llm_service.route_models and llm_service.explicit_model:
+            st.caption(f"Every section uses {models.get(selected_model, selected_model)}, as you selected it.")
+            if st.button("Let sections pick their model", key="reset_model_explicit"):
+                st.session_state.model_explicit = False
+                st.rerun()
+        elif llm_service.route_models:
+            fast_model = get_model_router().fast_models.get(selected_provider)
+            if fast_model in models and fast_model != selected_model:
+                st.caption(f"Rearview Mirror stories use {models[fast_model]}, other sections {models[selected_model]}.")
+        stats = get_model_router().stats()
+        if stats["routed_calls"]:
+            st.caption(
+                f"{stats['routed_calls']} routed calls ({stats['downgraded_calls']} on the fast tier) • "
+                f"saved ~${stats['saved_cost']:.4f}, ~{stats['saved_seconds']:.1f}s"
+            )
+    
+    # Response cache controls
+    with st.sidebar.expander("Response Cache", expanded=False):
+        llm_service.use_cache = st.checkbox(
+            "Reuse cached responses",
+            value=LLM_CACHE_ENABLED,
+            key="llm_cache_enabled",
+            help="Identical requests return the stored response instead of calling the provider"
+        )
+        llm_service.force_refresh = st.checkbox(
+            "Force regenerate (bypass cache)",
+            key="llm_force_refresh",
+            disabled=not llm_service.use_cache,
+            help="Always call the provider and replace the stored response"
+        )
+        if llm_service.use_cache:
+            stats = get_llm_cache().stats()
+            st.caption(
+                f"Hits: {stats['memory_hits'] + stats['disk_hits']} "
+                f"(memory {stats['memory_hits']}, disk {stats['disk_hits']}) • "
+                f"Misses: {stats['misses']} • Saved: {stats['saved_seconds']:.1f}s • "
+                f"{stats['entries']} entries, {stats['bytes'] / 1024:.0f} KB"
+            )
+    
+    # Per-call telemetry summary
+    llm_service.issue = st.session_state.get("newsletter_id", "")
+    with st.sidebar.expander("LLM Usage", expanded=False):
+        telemetry = get_telemetry_log()
+        issue_totals = telemetry.summary(by="issue").get(llm_service.issue)
+        if issue_totals:
+            st.markdown(
+                f"**This issue:** {issue_totals['calls']} calls, ${issue_totals['cost']:.4f}, "
+                f"{issue_totals['wall_seconds']:.1f}s"
+            )
+        else:
+            st.caption("No LLM calls for this issue yet.")
+        model_totals = telemetry.summary(by="model")
+        if model_totals:
+            st.markdown("**All issues by model:**")
+        for name, totals in sorted(model_totals.items(), key=lambda item: -item[1]["cost"]):
+            first_token = totals["avg_first_token_seconds"]
+            st.caption(
+                f"{name}: {totals['calls']} calls"
+                + (f" ({totals['errors']} failed)" if totals["errors"] else "")
+                + f" • {totals['input_tokens']:,} in ({totals['cached_input_tokens']:,} cached) / "
+                f"{totals['output_tokens']:,} out • ${totals['cost']:.4f} • {totals['wall_seconds']:.1f}s"
+                + (f" • first token {first_token:.2f}s avg" if first_token is not None else "")
+            )
+        limiter_stats = get_llm_limiter().stats()
+        if limiter_stats:
+            st.markdown("**Rate limits:**")
+        for name, stats in limiter_stats.items():
+            st.caption(
+                f"{name}: {stats['queue_depth']} queued • wait {stats['avg_wait_seconds']:.2f}s avg, "
+                f"{stats['max_wait_seconds']:.2f}s max • {stats['throttled']} throttled, {stats['retries']} retries"
+                + (f" • paused {stats['paused_for']:.0f}s" if stats["paused_for"] else "")
+            )
+    
     # API key status
     st.sidebar.markdown("### API Key Status")
     api_status = llm_service.check_api_keys()
     for provider, status in api_status.items():
         st.sidebar.markdown(f"{provider} API Key: {'✅' if status else '❌'}")
+    if llm_service.provider_mode != "live":
+        st.sidebar.caption(f"Provider mode: {llm_service.provider_mode} (set with LLM_PROVIDER_MODE)")
     
     # Draft controls
     st.sidebar.markdown("---")
@@ -263,6 +354,7 @@ def render_sidebar(llm_service):
     if st.sidebar.button("Load Draft") and selected_draft:
         newsletter = load_draft(selected_draft)
         update_session_state_from_newsletter(newsletter)
+        st.session_state.newsletter_id = Path(selected_draft).stem
         st.sidebar.success(f"Draft loaded! Language: {st.session_state['language']}")
         st.rerun()
     
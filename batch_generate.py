@@ -0,0 +1,75 @@
+"""
+Generates saved newsletter drafts headlessly through the providers' batch APIs.
+
+Each input draft supplies the section URLs, notes and prompts. Every draft is
+generated in every requested language and written as a new draft that can be
+opened from the app's "Load Draft" menu.
+
+Usage:
+    python batch_generate.py drafts/draft_20250101_120000.json [more drafts...]
+        [--languages English Hebrew] [--provider Anthropic] [--model claude-sonnet-4-20250514]
+        [--output-dir drafts] [--poll-interval 30] [--timeout 86400]
+"""
+import argparse
+import datetime
+import json
+import os
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from config.settings import (
+    DEFAULT_PROVIDER,
+    DEFAULT_MODEL,
+    DRAFTS_DIR,
+    SUPPORTED_LANGUAGES,
+    BATCH_POLL_INTERVAL,
+    BATCH_TIMEOUT
+)
+from models.newsletter import Newsletter
+from services.llm_service import get_llm_service
+from utils.batch_generation import LANGUAGE_CODES, generate_newsletters_in_batch
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate newsletter drafts through the providers' batch APIs.")
+    parser.add_argument("drafts", nargs="+", help="draft JSON files with the section URLs, notes and prompts")
+    parser.add_argument("--languages", nargs="+", default=["English"], choices=SUPPORTED_LANGUAGES)
+    parser.add_argument("--provider", default=DEFAULT_PROVIDER)
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--output-dir", default=DRAFTS_DIR)
+    parser.add_argument("--poll-interval", type=float, default=BATCH_POLL_INTERVAL, help="seconds between status checks")
+    parser.add_argument("--timeout", type=float, default=BATCH_TIMEOUT, help="seconds to wait for the batch")
+    args = parser.parse_args()
+
+    load_dotenv()
+    llm_service = get_llm_service()
+    if args.model not in llm_service.MODELS.get(args.provider, {}):
+        parser.error(f"unknown model {args.model!r} for provider {args.provider!r}")
+
+    newsletters = [Newsletter.load(path) for path in args.drafts]
+    outputs = generate_newsletters_in_batch(
+        llm_service,
+        newsletters,
+        args.languages,
+        args.provider,
+        args.model,
+        poll_interval=args.poll_interval,
+        timeout=args.timeout
+    )
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    for output in outputs:
+        stem = Path(args.drafts[output.index]).stem
+        path = Path(args.output_dir) / f"{stem}_{LANGUAGE_CODES.get(output.language, output.language)}_batch_{timestamp}.json"
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(output.newsletter.to_dict(), f, indent=4, ensure_ascii=False)
+        status = f", {len(output.failed_sections)} sections failed" if output.failed_sections else ""
+        print(f"Wrote {path}{status}")
+        for section_name, error in output.failed_sections.items():
+            print(f"  {section_name}: {error}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Offline benchmark for article extraction.
+
+Serves the fixture pages in benchmarks/fixtures/extraction from a local
+HTTP server, runs them through the same fetch + extract path used by
+extract_article_text, and scores the text that comes back against the gold
+text stored next to each page. Fetch and parse times are the ones measured
+by FetchService on that path.
+
+The fixtures are synthetic pages built to mimic common publisher layouts
+(a tech blog, a wire story, table and div-soup layouts) with scripts, ads
+and navigation around the article, not copies of real publisher pages,
+which cannot be redistributed with the repository.
+
+Usage:
+    python -m benchmarks.extraction_benchmark [--engines scoring legacy] [--repeat 20] [--output results.json]
+"""
+import argparse
+import datetime
+import functools
+import json
+import os
+import re
+import statistics
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services.fetch_service import FetchService
+from utils.article_extraction import EXTRACTION_ENGINES, etree
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures" / "extraction"
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def start_fixture_server(directory: Path) -> ThreadingHTTPServer:
+    """Starts a local HTTP server for the fixture pages on a free port."""
+    handler = functools.partial(_QuietHandler, directory=str(directory))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def token_overlap(extracted: str, gold: str) -> Dict[str, float]:
+    """Returns bag-of-words precision, recall and F1 of the extracted text against the gold text."""
+    extracted_tokens = Counter(re.findall(r"\w+", extracted.lower()))
+    gold_tokens = Counter(re.findall(r"\w+", gold.lower()))
+    common = sum((extracted_tokens & gold_tokens).values())
+    precision = common / sum(extracted_tokens.values()) if extracted_tokens else 0.0
+    recall = common / sum(gold_tokens.values()) if gold_tokens else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {"precision": round(precision, 4), "recall": round(recall, 4), "f1": round(f1, 4)}
+
+
+def benchmark_page(fetcher: FetchService, engine_name: str, url: str, gold: str, repeat: int) -> Dict:
+    """Fetches and extracts one page repeat times and scores the extracted text against the gold text."""
+    engine = EXTRACTION_ENGINES[engine_name]
+    fetched = [fetcher.fetch_one(url, engine) for _ in range(repeat)]
+    parse_times = [result.parse_time for result in fetched]
+    fetch_times = [result.fetch_time for result in fetched]
+
+    tracemalloc.start()
+    fetcher.fetch_one(url, engine)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    text = fetched[-1].text
+    return {
+        "parse_ms_median": round(statistics.median(parse_times) * 1000, 3),
+        "parse_ms_min": round(min(parse_times) * 1000, 3),
+        "fetch_ms_median": round(statistics.median(fetch_times) * 1000, 3),
+        "peak_memory_kb": round(peak / 1024, 1),
+        "fetch_error": fetched[-1].error,
+        "extracted_chars": len(text),
+        "gold_chars": len(gold),
+        **token_overlap(text, gold)
+    }
+
+
+def run(engines: List[str], repeat: int) -> Dict:
+    """Runs every engine over every fixture page and returns the results."""
+    pages = sorted(path.stem for path in FIXTURES_DIR.glob("*.html"))
+    server = start_fixture_server(FIXTURES_DIR)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    # No cache and no fetch policy: every run must exercise the full fetch and parse path
+    fetcher = FetchService(cache=None)
+
+    results = {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "parser_backend": "lxml" if etree is not None else "html.parser",
+        "repeat": repeat,
+        "engines": {}
+    }
+    try:
+        for engine_name in engines:
+            engine_results = {}
+            for page in pages:
+                gold = (FIXTURES_DIR / f"{page}.gold.txt").read_text(encoding="utf-8")
+                page_result = benchmark_page(fetcher, engine_name, f"{base_url}/{page}.html", gold, repeat)
+                page_result["html_bytes"] = (FIXTURES_DIR / f"{page}.html").stat().st_size
+                engine_results[page] = page_result
+
+            results["engines"][engine_name] = {
+                "pages": engine_results,
+                "summary": {
+                    "parse_ms_total": round(sum(r["parse_ms_median"] for r in engine_results.values()), 3),
+                    "mean_f1": round(statistics.mean(r["f1"] for r in engine_results.values()), 4),
+                    "max_peak_memory_kb": max(r["peak_memory_kb"] for r in engine_results.values())
+                }
+            }
+    finally:
+        server.shutdown()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark article extraction against the fixture pages.")
+    parser.add_argument("--engines", nargs="+", default=list(EXTRACTION_ENGINES), choices=list(EXTRACTION_ENGINES))
+    parser.add_argument("--repeat", type=int, default=20, help="fetch and parse repetitions per page")
+    parser.add_argument("--output", help="path of the JSON results file")
+    args = parser.parse_args()
+
+    results = run(args.engines, args.repeat)
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"extraction_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    os.makedirs(output.parent, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+    for engine_name, engine_results in results["engines"].items():
+        summary = engine_results["summary"]
+        print(
+            f"{engine_name:>8}: {summary['parse_ms_total']:.2f} ms total parse, "
+            f"mean F1 {summary['mean_f1']:.3f}, peak {summary['max_peak_memory_kb']:.0f} KB"
+        )
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Offline load benchmark for the generation pipeline.
+
+Generates several newsletter issues at once through run_section_generation,
+the same path as the app's Generate All, with the providers replaced by the
+fake provider or by replayed recordings (see services.llm_providers). The
+gold texts of the extraction fixtures stand in for the fetched articles.
+
+Reports section latency, time to first token, rate limiter waits and token
+usage. Exits with status 1 if a section failed or, when a budget is given,
+if the 95th percentile section latency is over it.
+
+Usage:
+    python -m benchmarks.generation_benchmark [--mode fake] [--issues 4]
+        [--provider OpenAI] [--model gpt-4o] [--p95-budget 15] [--output results.json]
+"""
+import argparse
+import datetime
+import json
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config.prompts import DEFAULT_PROMPTS
+from config.settings import GENERATE_ALL_MAX_WORKERS
+from services.llm_limiter import get_llm_limiter
+from services.llm_service import LLMService
+from utils.content_utils import run_section_generation
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures" / "extraction"
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+# Sections of one issue, as generated by Generate All
+SECTIONS = ["windshield", "rearview_1", "rearview_2", "rearview_3", "dashboard", "nextlane"]
+
+
+def load_articles() -> List[str]:
+    """Returns the gold article texts of the extraction fixtures."""
+    return [path.read_text(encoding="utf-8") for path in sorted(FIXTURES_DIR.glob("*.gold.txt"))]
+
+
+def percentile(values: List[float], fraction: float) -> Optional[float]:
+    """Returns a percentile by nearest rank, or None for no values."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(int(fraction * len(ordered)), len(ordered) - 1)], 3)
+
+
+def run_issue(llm_service: LLMService, issue: int, articles: List[str], provider: str, model: str) -> List[Dict]:
+    """Generates every section of one issue concurrently and returns each section's statistics."""
+    service = llm_service.with_options(issue=f"benchmark-{issue}")
+
+    def generate(index_section):
+        index, section_key = index_section
+        start = time.perf_counter()
+        text, prompt_record = run_section_generation(
+            llm_service=service,
+            section_key=section_key,
+            article_text=articles[(issue + index) % len(articles)],
+            notes="",
+            section_prompt=DEFAULT_PROMPTS[section_key.split("_")[0]],
+            provider=provider,
+            model=model,
+            on_delta=lambda _: None
+        )
+        generate_stats = prompt_record["pipeline"]["generate"]
+        return {
+            "issue": issue,
+            "section": section_key,
+            "model": prompt_record["model"],
+            "seconds": round(time.perf_counter() - start, 3),
+            "first_token_seconds": generate_stats.get("first_token_seconds"),
+            "condense_seconds": sum(prompt_record["pipeline"]["condense"].get("stage_seconds", {}).values()),
+            "input_tokens": generate_stats.get("input_tokens", 0),
+            "output_tokens": generate_stats.get("output_tokens", 0),
+            "failed": text.startswith("Error generating content")
+        }
+
+    with ThreadPoolExecutor(max_workers=GENERATE_ALL_MAX_WORKERS) as executor:
+        return list(executor.map(generate, enumerate(SECTIONS)))
+
+
+def run(mode: str, issues: int, provider: str, model: str) -> Dict:
+    """Generates `issues` issues at once and summarizes the section statistics."""
+    llm_service = LLMService(use_cache=False, provider_mode=mode)
+    articles = load_articles()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=issues) as executor:
+        sections = [
+            section
+            for issue_sections in executor.map(
+                lambda issue: run_issue(llm_service, issue, articles, provider, model), range(issues)
+            )
+            for section in issue_sections
+        ]
+    wall_seconds = time.perf_counter() - start
+
+    seconds = [section["seconds"] for section in sections]
+    first_tokens = [section["first_token_seconds"] for section in sections if section["first_token_seconds"] is not None]
+    return {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "mode": mode,
+        "provider": provider,
+        "model": model,
+        "issues": issues,
+        "wall_seconds": round(wall_seconds, 3),
+        "sections_per_second": round(len(sections) / wall_seconds, 2),
+        "section_seconds": {
+            "median": round(statistics.median(seconds), 3),
+            "p95": percentile(seconds, 0.95),
+            "max": round(max(seconds), 3)
+        },
+        "first_token_seconds": {
+            "median": round(statistics.median(first_tokens), 3) if first_tokens else None,
+            "p95": percentile(first_tokens, 0.95)
+        },
+        "input_tokens": sum(section["input_tokens"] for section in sections),
+        "output_tokens": sum(section["output_tokens"] for section in sections),
+        "failed": sum(section["failed"] for section in sections),
+        "rate_limits": get_llm_limiter().stats(),
+        "sections": sections
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the generation pipeline against simulated providers.")
+    parser.add_argument("--mode", choices=["fake", "replay"], default="fake", help="how the providers are simulated")
+    parser.add_argument("--issues", type=int, default=4, help="issues generated at the same time")
+    parser.add_argument("--provider", default="OpenAI")
+    parser.add_argument("--model", default="gpt-4o")
+    parser.add_argument("--p95-budget", type=float, help="maximum 95th percentile section latency, in seconds")
+    parser.add_argument("--output", help="path of the JSON results file")
+    args = parser.parse_args()
+
+    results = run(args.mode, args.issues, args.provider, args.model)
+    problems = []
+    if results["failed"]:
+        problems.append(f"{results['failed']} sections failed")
+    if args.p95_budget is not None and results["section_seconds"]["p95"] > args.p95_budget:
+        problems.append(f"p95 section latency {results['section_seconds']['p95']:.2f}s (budget {args.p95_budget:.2f}s)")
+    results["problems"] = problems
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"generation_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    os.makedirs(output.parent, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+    section_seconds, first_token = results["section_seconds"], results["first_token_seconds"]
+    print(
+        f"{results['issues']} issues, {len(results['sections'])} sections in {results['wall_seconds']:.1f}s "
+        f"({results['sections_per_second']:.2f} sections/s)"
+    )
+    print(
+        f"section latency: {section_seconds['median']:.2f}s median, {section_seconds['p95']:.2f}s p95, "
+        f"{section_seconds['max']:.2f}s max"
+    )
+    if first_token["median"] is not None:
+        print(f"first token: {first_token['median']:.2f}s median, {first_token['p95']:.2f}s p95")
+    for name, stats in results["rate_limits"].items():
+        print(f"{name}: wait {stats['avg_wait_seconds']:.2f}s avg, {stats['max_wait_seconds']:.2f}s max")
+    for problem in problems:
+        print(f"FAIL: {problem}")
+    print(f"Results written to {output}")
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
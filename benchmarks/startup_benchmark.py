@@ -0,0 +1,160 @@
+"""
+Startup benchmark for the app.
+
+Measures the cold import time of the app's modules, each in a fresh
+interpreter, checks that the provider SDKs and export libraries are not
+imported until they are used, and times full script runs of app.py with
+Streamlit's test runner to track the per-rerun overhead.
+
+Exits with status 1 if a lazy module was imported eagerly or, when budgets
+are given, if a module or a rerun is slower than its budget.
+
+Usage:
+    python -m benchmarks.startup_benchmark [--repeat 5] [--reruns 10]
+        [--import-budget 1.5] [--rerun-budget 0.5] [--output results.json]
+"""
+import argparse
+import datetime
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+# Modules imported on every script run of the app
+STARTUP_MODULES = [
+    "services.llm_service",
+    "utils.content_utils",
+    "ui.generate_view",
+    "ui.edit_view",
+    "ui.discovery_view",
+]
+
+# Modules that must only be imported when a provider is called or a newsletter is exported
+LAZY_MODULES = ["openai", "anthropic", "google.generativeai", "pdfkit", "docx", "html2text", "yaml"]
+
+_IMPORT_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+print(json.dumps({{"seconds": seconds, "loaded": [m for m in {lazy!r} if m in sys.modules]}}))
+"""
+
+
+def measure_import(module: str, repeat: int) -> Dict:
+    """Imports a module in `repeat` fresh interpreters and returns its timings and eagerly loaded lazy modules."""
+    timings = []
+    loaded = set()
+    for _ in range(repeat):
+        completed = subprocess.run(
+            [sys.executable, "-c", _IMPORT_PROBE.format(module=module, lazy=LAZY_MODULES)],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        probe = json.loads(completed.stdout.strip().splitlines()[-1])
+        timings.append(probe["seconds"])
+        loaded.update(probe["loaded"])
+    return {
+        "import_ms_median": round(statistics.median(timings) * 1000, 1),
+        "import_ms_min": round(min(timings) * 1000, 1),
+        "eager_lazy_modules": sorted(loaded)
+    }
+
+
+def measure_reruns(reruns: int) -> Dict:
+    """Runs app.py once cold and then `reruns` more times, as Streamlit does on every interaction."""
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(str(ROOT / "app.py"), default_timeout=60)
+    start = time.perf_counter()
+    app.run()
+    first_run = time.perf_counter() - start
+
+    timings = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        app.run()
+        timings.append(time.perf_counter() - start)
+    return {
+        "first_run_ms": round(first_run * 1000, 1),
+        "rerun_ms_median": round(statistics.median(timings) * 1000, 1) if timings else None,
+        "rerun_ms_max": round(max(timings) * 1000, 1) if timings else None,
+        "exceptions": [str(exception.value) for exception in app.exception],
+        "eager_lazy_modules": [module for module in LAZY_MODULES if module in sys.modules]
+    }
+
+
+def run(modules: List[str], repeat: int, reruns: int) -> Dict:
+    """Measures every module's cold import and the app's script runs."""
+    results = {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "repeat": repeat,
+        "imports": {module: measure_import(module, repeat) for module in modules}
+    }
+    if reruns:
+        os.chdir(ROOT)
+        results["app"] = measure_reruns(reruns)
+    return results
+
+
+def check(results: Dict, import_budget: Optional[float], rerun_budget: Optional[float]) -> List[str]:
+    """Returns a description of every regression in the results."""
+    problems = []
+    for module, result in results["imports"].items():
+        if result["eager_lazy_modules"]:
+            problems.append(f"importing {module} loads {', '.join(result['eager_lazy_modules'])}")
+        if import_budget is not None and result["import_ms_median"] > import_budget * 1000:
+            problems.append(f"{module} imports in {result['import_ms_median']:.0f} ms (budget {import_budget * 1000:.0f} ms)")
+    app = results.get("app")
+    if app:
+        if app["exceptions"]:
+            problems.append(f"app.py raised: {'; '.join(app['exceptions'])}")
+        if app["eager_lazy_modules"]:
+            problems.append(f"running app.py loads {', '.join(app['eager_lazy_modules'])}")
+        if rerun_budget is not None and app["rerun_ms_median"] is not None and app["rerun_ms_median"] > rerun_budget * 1000:
+            problems.append(f"app.py reruns in {app['rerun_ms_median']:.0f} ms (budget {rerun_budget * 1000:.0f} ms)")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the app's cold start and per-rerun overhead.")
+    parser.add_argument("--modules", nargs="+", default=STARTUP_MODULES)
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per module import")
+    parser.add_argument("--reruns", type=int, default=10, help="script reruns of app.py (0 to skip)")
+    parser.add_argument("--import-budget", type=float, help="maximum median import time per module, in seconds")
+    parser.add_argument("--rerun-budget", type=float, help="maximum median rerun time of app.py, in seconds")
+    parser.add_argument("--output", help="path of the JSON results file")
+    args = parser.parse_args()
+
+    results = run(args.modules, args.repeat, args.reruns)
+    problems = check(results, args.import_budget, args.rerun_budget)
+    results["problems"] = problems
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"startup_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    os.makedirs(output.parent, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+    for module, result in results["imports"].items():
+        print(f"{module:>24}: {result['import_ms_median']:.0f} ms median cold import")
+    if "app" in results:
+        app = results["app"]
+        print(f"{'app.py':>24}: {app['first_run_ms']:.0f} ms first run, {app['rerun_ms_median']:.0f} ms median rerun")
+    for problem in problems:
+        print(f"FAIL: {problem}")
+    print(f"Results written to {output}")
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
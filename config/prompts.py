@@ -54,3 +54,28 @@ DEFAULT_PROMPTS = {
         "Keep it brief and to the point."
     )
 }
+
+# Prompt used to condense long source articles before section generation
+CONDENSE_PROMPT = (
+    "You are preparing source material for a newsletter writer. "
+    "Condense the following article excerpt into a dense list of the key facts, figures, names, dates and quotes. "
+    "Keep every concrete detail a writer might cite and drop navigation text, ads and repetition. "
+    "Do not add commentary or information that is not in the excerpt."
+)
+
+# Instructions for generating every Rearview Mirror story in a single request
+REARVIEW_BATCH_PROMPT = (
+    "Write one short Rearview Mirror story for each story below, using only that story's articles and notes "
+    "and following that story's instructions.\n"
+    "Reply with exactly one line per story and nothing else. Each line must be a JSON object of the form "
+    '{"id": <story id>, "text": "<the story>"}, in story order. '
+    "Use \\n inside the text for line breaks."
+)
+
+# Instructions for patch-style edits, which return only the changed parts of a section
+EDIT_PATCH_PROMPT = (
+    "Do not rewrite the whole section. Reply only with the changes, one per line, each a JSON object of the form "
+    '{"find": "<exact text from the original section>", "replace": "<new text>"}. '
+    "Copy every find exactly from the original section and include enough words for it to occur only once. "
+    "Use \\n inside the strings for line breaks and reply with nothing else."
+)
@@ -34,4 +34,180 @@ HEBREW_MONTHS = [
 
 # NewsAPI settings
 NEWS_DEFAULT_TOPICS = ["AI", "Auto Industry", "Technology"]
-NEWS_DEFAULT_TIMEFRAMES = ["Last Week", "Last Month"]
\ No newline at end of file
+NEWS_DEFAULT_TIMEFRAMES = ["Last Week", "Last Month"]
+
+# Article fetching settings
+FETCH_TIMEOUT = 10  # seconds per request
+FETCH_DEADLINE = 25  # seconds for a whole section's URL list
+FETCH_MAX_WORKERS = 8
+FETCH_PER_HOST_LIMIT = 2
+
+# HTTP connection pool settings
+HTTP_POOL_CONNECTIONS = 20  # number of hosts kept in the pool
+HTTP_POOL_MAXSIZE = 4  # keep-alive connections per host
+HTTP_HOST_POOL_SIZES = {
+    "newsapi.org": 8,
+}
+
+# Article cache settings
+ARTICLE_CACHE_ENABLED = True
+ARTICLE_CACHE_DIR = "cache/articles"
+ARTICLE_CACHE_TTL = 6 * 60 * 60  # seconds before an entry is revalidated
+ARTICLE_CACHE_MAX_BYTES = 200 * 1024 * 1024
+
+# Article extraction settings
+ARTICLE_EXTRACTION_ENGINE = "scoring"  # "scoring" or "legacy"
+
+# Process-pool parsing settings
+PARSE_POOL_ENABLED = False  # parse article HTML in worker processes
+PARSE_POOL_WORKERS = None  # defaults to the number of CPU cores
+PARSE_POOL_MAX_PENDING = 16  # pages queued for the pool before falling back to in-process parsing
+PARSE_POOL_MIN_BYTES = 20 * 1024  # smaller pages are cheaper to parse in-process
+PARSE_POOL_TASK_TIMEOUT = 30  # seconds
+
+# Source condensing settings (map-reduce summarization of long article text)
+SOURCE_TEXT_BUDGET_CHARS = 12000  # longer article text is condensed before generation
+CONDENSE_CHUNK_CHARS = 6000
+CONDENSE_MAX_WORKERS = 4
+CONDENSE_MAX_ROUNDS = 2
+CONDENSE_MODELS = {
+    "OpenAI": "gpt-4o-mini",
+    "Anthropic": "claude-3-5-haiku-latest",
+    "Local Stub": "stub-echo",
+}
+
+# Cross-article paragraph deduplication settings
+DEDUP_ENABLED = True
+DEDUP_SIMILARITY = 0.8  # shingle Jaccard similarity at which paragraphs count as duplicates
+DEDUP_MIN_PARAGRAPH_CHARS = 80  # shorter paragraphs are always kept
+
+# Background prefetch settings
+PREFETCH_ENABLED = True
+PREFETCH_MAX_WORKERS = 4
+PREFETCH_FAILED_LIMIT = 500  # failed URLs remembered for the status indicator
+
+# Fetch policy settings (per-host rate limit, retries and circuit breaker)
+FETCH_RATE_PER_HOST = 2.0  # requests per second allowed to a single host
+FETCH_RATE_BURST = 4  # requests that may be sent to a host back to back
+FETCH_MAX_RETRIES = 2  # retries after the first attempt for transient failures
+FETCH_RETRY_STATUSES = (429, 502, 503, 504)
+FETCH_RETRY_BASE_DELAY = 0.5  # seconds; doubled on every retry, with full jitter
+FETCH_RETRY_MAX_DELAY = 8  # seconds; also caps the wait requested by Retry-After
+BREAKER_FAILURE_THRESHOLD = 3  # consecutive failures before a host's circuit opens
+BREAKER_RESET_TIMEOUT = 60  # seconds a circuit stays open before a trial request
+
+# Parallel generation settings
+GENERATE_ALL_MAX_WORKERS = 8  # sections fetched and generated at once by "Generate All"
+LLM_PROVIDER_CONCURRENCY = {  # maximum concurrent LLM calls per provider, across all sessions
+    "OpenAI": 4,
+    "Anthropic": 2,
+}
+LLM_DEFAULT_CONCURRENCY = 2  # for providers not listed above
+
+# Streaming settings
+STREAM_RENDER_INTERVAL = 0.05  # seconds between UI refreshes while text is streaming
+
+# LLM response cache settings (opt-in; identical requests reuse the stored response)
+LLM_CACHE_ENABLED = False
+LLM_CACHE_MEMORY_ENTRIES = 256
+LLM_CACHE_DIR = "cache/llm"
+LLM_CACHE_TTL = 7 * 24 * 60 * 60  # seconds
+LLM_CACHE_MAX_BYTES = 50 * 1024 * 1024
+
+# Provider-side prompt caching settings
+PROMPT_CACHING_ENABLED = True  # mark the system prompt and article context as cacheable prefixes
+PROMPT_CACHE_MIN_TOKENS = 1024  # shorter prefixes are not cached by the providers
+
+# Local stub provider (deterministic offline responses, no API key needed)
+# Off by default; for offline runs LLM_PROVIDER_MODE = "fake" simulates the real providers instead
+LOCAL_STUB_ENABLED = False
+LOCAL_STUB_PROVIDER = "Local Stub"
+
+# Batch generation settings (non-interactive runs through the providers' batch APIs)
+BATCH_POLL_INTERVAL = 30  # seconds between batch status checks
+BATCH_TIMEOUT = 24 * 60 * 60  # seconds before giving up on a batch
+BATCH_FORCE_LOCAL = False  # run batches through the local stand-in instead of the provider batch APIs
+BATCH_LOCAL_MAX_WORKERS = 4
+
+# Hedged request settings (duplicate slow requests to an alternate model)
+# Off by default: a hedged request sends the content to a second vendor, is
+# paid for twice and may be answered by a model the user did not pick
+HEDGE_ENABLED = False
+HEDGE_PERCENTILE = 95  # hedge once time-to-first-token exceeds this percentile of recent calls
+HEDGE_MIN_SAMPLES = 10  # streamed calls observed for a model (including earlier runs) before it is hedged
+HEDGE_MIN_DELAY = 1.0  # seconds; never hedge sooner than this
+HEDGE_WINDOW = 200  # recent calls per model kept for the percentile
+HEDGE_ALTERNATES = {  # model -> (provider, model) to send the duplicate to
+    "gpt-4o": ("Anthropic", "claude-sonnet-4-20250514"),
+    "gpt-4o-mini": ("Anthropic", "claude-3-5-haiku-latest"),
+    "claude-opus-4-20250514": ("OpenAI", "gpt-4o"),
+    "claude-sonnet-4-20250514": ("OpenAI", "gpt-4o"),
+    "claude-3-7-sonnet-latest": ("OpenAI", "gpt-4o"),
+    "claude-3-haiku-20240307": ("OpenAI", "gpt-4o-mini"),
+    "claude-3-5-haiku-latest": ("OpenAI", "gpt-4o-mini"),
+}
+
+# LLM call telemetry (latency, tokens and estimated cost of every call)
+TELEMETRY_ENABLED = True
+TELEMETRY_LOG_PATH = "logs/llm_calls.jsonl"  # append-only, one JSON record per line
+
+# LLM rate limits (process-wide, per provider and model; callers queue in arrival order)
+LLM_RATE_LIMITS = {  # provider -> requests and tokens per minute for each of its models
+    "OpenAI": {"rpm": 500, "tpm": 30000},
+    "Anthropic": {"rpm": 50, "tpm": 30000},
+}
+LLM_MODEL_RATE_LIMITS = {}  # model -> limits that override its provider's, e.g. {"gpt-4o-mini": {"rpm": 500, "tpm": 200000}}
+LLM_MAX_RETRIES = 3  # retries of rate-limited or transiently failing calls
+LLM_RETRY_STATUSES = (408, 409, 429, 500, 502, 503, 504, 529)
+LLM_RETRY_BASE_DELAY = 1.0  # seconds, doubled per attempt (with jitter) when there is no Retry-After
+LLM_RETRY_MAX_DELAY = 60
+
+# Batched Rearview Mirror generation (all stories in one LLM request)
+REARVIEW_BATCH_ENABLED = True
+REARVIEW_BATCH_MIN_STORIES = 2  # fewer stories are generated one call each
+
+# Section-aware model routing (model tier, output cap and stop sequences per section type)
+# A section may add "stop": [...] sequences; they cut the reply wherever they appear, so only use
+# text the prompt asks the model to emit after the section (never markdown such as "---").
+MODEL_ROUTING_ENABLED = True
+SECTION_ROUTING_POLICY = {  # "standard" is the model selected in the sidebar, "fast" the provider's model below
+    "windshield": {"tier": "standard", "max_tokens": 700},
+    "rearview": {"tier": "fast", "max_tokens": 200},
+    "dashboard": {"tier": "standard", "max_tokens": 600},
+    "nextlane": {"tier": "standard", "max_tokens": 500},
+}
+ROUTING_FAST_MODELS = {
+    "OpenAI": "gpt-4o-mini",
+    "Anthropic": "claude-3-5-haiku-latest",
+    "Local Stub": "stub-echo",
+}
+
+# Patch-style AI edits (the model returns replacements instead of the whole section)
+EDIT_PATCH_ENABLED = True
+EDIT_PATCH_MIN_CHARS = 300  # shorter sections are cheaper to rewrite in full
+
+# Provider mode: "live" calls the providers, "record" also saves every call to the
+# cassette, "replay" answers from the cassette and "fake" simulates the providers
+# offline. The LLM_PROVIDER_MODE environment variable overrides this.
+LLM_PROVIDER_MODE = "live"
+LLM_CASSETTE_PATH = "benchmarks/fixtures/llm_cassette.jsonl"
+LLM_REPLAY_MISS = "fake"  # how replay answers unrecorded requests: "fake" or "error"
+LLM_SIMULATION_TIME_SCALE = 1.0  # multiplies simulated and replayed delays; 0 disables them
+
+# Fake provider timing per model: first token as (median, sigma) of a log-normal in
+# seconds, output speed as (mean, sd) tokens per second and reply length as
+# (mean, sd) output tokens, capped at the request's max_tokens
+FAKE_PROVIDER_SEED = 0
+FAKE_PROVIDER_PROFILES = {
+    "default": {"first_token_seconds": (0.8, 0.4), "tokens_per_second": (50, 10), "output_tokens": (250, 80)},
+    "gpt-4o": {"first_token_seconds": (0.6, 0.4), "tokens_per_second": (70, 15), "output_tokens": (250, 80)},
+    "gpt-4o-mini": {"first_token_seconds": (0.4, 0.3), "tokens_per_second": (100, 20), "output_tokens": (200, 60)},
+    "claude-opus-4-20250514": {"first_token_seconds": (1.5, 0.4), "tokens_per_second": (30, 6), "output_tokens": (300, 90)},
+    "claude-sonnet-4-20250514": {"first_token_seconds": (1.0, 0.4), "tokens_per_second": (55, 10), "output_tokens": (280, 80)},
+    "claude-3-5-haiku-latest": {"first_token_seconds": (0.6, 0.3), "tokens_per_second": (90, 15), "output_tokens": (200, 60)},
+}
+
+# Background generation jobs ("🔄 Gen" and "Apply AI Edit" run as cancellable jobs)
+GENERATION_JOB_WORKERS = 8  # jobs running at once across all sessions
+GENERATION_JOB_POLL_INTERVAL = 0.5  # seconds between UI refreshes of a running job
+GENERATION_JOB_RETENTION = 60 * 60  # seconds a finished job is kept for its session to collect
@@ -24,6 +24,9 @@ class SectionData:
     prompt: str = ""
     content: str = ""
     media_content: List[MediaContent] = field(default_factory=list)
+    # Article text extracted at generation time and the fingerprint of the URLs it came from
+    source_text: str = ""
+    source_fingerprint: str = ""
     
     def is_generated(self) -> bool:
         """Check if this section has generated content."""
@@ -104,6 +107,31 @@ class Newsletter:
         sections.extend(["Dashboard Data", "The Next Lane"])
         return sections
     
+    def get_sections_by_name(self) -> Dict[str, SectionData]:
+        """Get all sections keyed by their display name."""
+        sections = {"Windshield View": self.windshield}
+        for i, section in self.rearview_sections.items():
+            sections[f"Rearview Mirror {i}"] = section
+        sections["Dashboard Data"] = self.dashboard
+        sections["The Next Lane"] = self.nextlane
+        return sections
+    
+    def get_section_sources(self) -> Dict[str, Dict[str, str]]:
+        """Get the stored source text and URL fingerprint of each section that has them."""
+        return {
+            name: {"fingerprint": section.source_fingerprint, "text": section.source_text}
+            for name, section in self.get_sections_by_name().items()
+            if section.source_text
+        }
+    
+    def set_section_sources(self, sources: Dict[str, Dict[str, str]]) -> None:
+        """Set the stored source text and URL fingerprint of sections by name."""
+        sections = self.get_sections_by_name()
+        for name, source in sources.items():
+            if name in sections:
+                sections[name].source_text = source.get("text", "")
+                sections[name].source_fingerprint = source.get("fingerprint", "")
+    
     def get_generated_sections(self) -> Dict[str, str]:
         """Get a dictionary of all generated sections."""
         sections = {}
@@ -157,6 +185,7 @@ class Newsletter:
             "nextlane_notes": self.nextlane.notes,
             "nextlane_prompt": self.nextlane.prompt,
             "generated_sections": self.get_generated_sections(),
+            "section_sources": self.get_section_sources(),
             "edited_sections": self.edited_sections,
             "selected_provider": self.selected_provider,
             "selected_model": self.selected_model,
@@ -217,6 +246,8 @@ class Newsletter:
                 content=data.get("generated_sections", {}).get(f"Rearview Mirror {i}", "")
             )
         
+        newsletter.set_section_sources(data.get("section_sources", {}))
+        
         return newsletter
 
     def save(self, drafts_dir="drafts") -> str:
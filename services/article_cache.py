@@ -0,0 +1,289 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from config.settings import (
+    ARTICLE_CACHE_ENABLED,
+    ARTICLE_CACHE_DIR,
+    ARTICLE_CACHE_TTL,
+    ARTICLE_CACHE_MAX_BYTES
+)
+
+# Query parameters that only track the click; other names (e.g. "referrer", "refid") can select content
+TRACKING_PARAM_PREFIXES = ("utm_",)
+TRACKING_PARAMS = frozenset({"fbclid", "gclid", "mc_cid", "mc_eid", "ref"})
+
+
+def is_tracking_param(name: str) -> bool:
+    """True for query parameters that only track the click, such as utm_source or fbclid."""
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PARAM_PREFIXES)
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Normalizes a URL so trivially different links share a cache entry.
+
+    Lowercases the scheme and host, drops default ports, fragments and
+    tracking parameters, sorts the query string and trims trailing slashes.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and not ((scheme == "http" and parts.port == 80) or (scheme == "https" and parts.port == 443)):
+        host = f"{host}:{parts.port}"
+
+    path = parts.path or "/"
+    if len(path) > 1:
+        path = path.rstrip("/")
+
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not is_tracking_param(key)
+    )
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+
+@dataclass
+class CachedArticle:
+    """A cached article together with its HTTP validators."""
+    url: str
+    text: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    fetched_at: float = 0.0
+    html_size: int = 0
+    extractor: str = ""
+
+
+class ArticleCache:
+    """On-disk cache of fetched article HTML and extracted text with TTL and LRU eviction."""
+
+    def __init__(
+        self,
+        cache_dir: str = ARTICLE_CACHE_DIR,
+        ttl: float = ARTICLE_CACHE_TTL,
+        max_bytes: int = ARTICLE_CACHE_MAX_BYTES
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        # key -> bytes on disk, least recently used first
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self._load_index()
+
+    def _load_index(self) -> None:
+        """Rebuilds the LRU index from the files on disk, oldest access first."""
+        entries = []
+        for meta_file in self.cache_dir.glob("*.json"):
+            key = meta_file.stem
+            try:
+                size = self._entry_size(key)
+                entries.append((meta_file.stat().st_mtime, key, size))
+            except OSError:
+                continue
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._total_bytes += size
+
+    @staticmethod
+    def key_for(url: str) -> str:
+        """Returns the cache key for a URL."""
+        return hashlib.sha256(canonicalize_url(url).encode("utf-8")).hexdigest()
+
+    def _meta_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def _html_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.html"
+
+    def _entry_size(self, key: str) -> int:
+        size = self._meta_path(key).stat().st_size
+        if self._html_path(key).exists():
+            size += self._html_path(key).stat().st_size
+        return size
+
+    def get(self, url: str) -> Optional[CachedArticle]:
+        """
+        Looks up a URL without counting a hit or miss.
+
+        Args:
+            url: Article URL
+
+        Returns:
+            The cached article, or None if the URL is not cached
+        """
+        key = self.key_for(url)
+        try:
+            with open(self._meta_path(key), "r", encoding="utf-8") as f:
+                entry = CachedArticle(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            return None
+
+        with self._lock:
+            if key in self._index:
+                self._index.move_to_end(key)
+        try:
+            os.utime(self._meta_path(key))
+        except OSError:
+            pass
+        return entry
+
+    def get_html(self, url: str) -> Optional[str]:
+        """Returns the raw HTML stored for a URL, if any."""
+        try:
+            return self._html_path(self.key_for(url)).read_text(encoding="utf-8")
+        except OSError:
+            return None
+
+    def is_fresh(self, entry: CachedArticle) -> bool:
+        """True if the entry is younger than the TTL and can be used without revalidation."""
+        return time.time() - entry.fetched_at < self.ttl
+
+    def validators(self, entry: CachedArticle) -> Dict[str, str]:
+        """Returns conditional request headers for revalidating an entry."""
+        headers = {}
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def record_hit(self) -> None:
+        with self._lock:
+            self.hits += 1
+
+    def record_miss(self) -> None:
+        with self._lock:
+            self.misses += 1
+
+    def mark_revalidated(self, entry: CachedArticle) -> CachedArticle:
+        """Restarts the TTL of an entry after a 304 Not Modified response."""
+        entry.fetched_at = time.time()
+        self._write_meta(self.key_for(entry.url), entry)
+        with self._lock:
+            self.revalidated += 1
+        return entry
+
+    def put(
+        self,
+        url: str,
+        html: str,
+        text: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        extractor: str = "",
+        fetched_at: Optional[float] = None
+    ) -> CachedArticle:
+        """
+        Stores the HTML and extracted text for a URL.
+
+        Args:
+            url: Article URL
+            html: Raw HTML of the page
+            text: Extracted article text
+            etag: ETag response header, if any
+            last_modified: Last-Modified response header, if any
+            extractor: Name of the engine that produced the text
+            fetched_at: When the HTML was fetched, defaults to now
+
+        Returns:
+            The stored entry
+        """
+        key = self.key_for(url)
+        entry = CachedArticle(
+            url=url,
+            text=text,
+            etag=etag,
+            last_modified=last_modified,
+            fetched_at=fetched_at if fetched_at is not None else time.time(),
+            html_size=len(html),
+            extractor=extractor
+        )
+        self._write_file(self._html_path(key), html)
+        self._write_meta(key, entry)
+        self._evict()
+        return entry
+
+    def _write_meta(self, key: str, entry: CachedArticle) -> None:
+        self._write_file(self._meta_path(key), json.dumps(asdict(entry), ensure_ascii=False))
+        with self._lock:
+            self._total_bytes -= self._index.pop(key, 0)
+            try:
+                size = self._entry_size(key)
+            except OSError:
+                return
+            self._index[key] = size
+            self._total_bytes += size
+
+    @staticmethod
+    def _write_file(path: Path, content: str) -> None:
+        """Writes a file atomically so concurrent readers never see partial data."""
+        tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+    def delete(self, url: str) -> None:
+        """Removes a URL's entry, e.g. after the page was taken down."""
+        key = self.key_for(url)
+        with self._lock:
+            self._total_bytes -= self._index.pop(key, 0)
+            self._remove_files(key)
+
+    def _remove_files(self, key: str) -> None:
+        for path in (self._meta_path(key), self._html_path(key)):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def _evict(self) -> None:
+        """Removes least recently used entries until the cache fits in max_bytes."""
+        with self._lock:
+            while self._total_bytes > self.max_bytes and len(self._index) > 1:
+                key, size = self._index.popitem(last=False)
+                self._total_bytes -= size
+                self.evictions += 1
+                self._remove_files(key)
+
+    def stats(self) -> Dict[str, int]:
+        """Returns hit/miss counters and the current cache size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "revalidated": self.revalidated,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._index),
+                "bytes": self._total_bytes
+            }
+
+
+_article_cache: Optional[ArticleCache] = None
+_article_cache_lock = threading.Lock()
+
+
+def get_article_cache() -> Optional[ArticleCache]:
+    """Returns the process-wide article cache, or None if caching is disabled."""
+    global _article_cache
+    if not ARTICLE_CACHE_ENABLED:
+        return None
+    with _article_cache_lock:
+        if _article_cache is None:
+            _article_cache = ArticleCache()
+        return _article_cache
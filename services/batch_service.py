@@ -0,0 +1,268 @@
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from config.settings import BATCH_FORCE_LOCAL, BATCH_LOCAL_MAX_WORKERS
+from services.llm_types import LLMResponse
+
+
+@dataclass
+class BatchRequest:
+    """One generation request in a batch, identified by a caller-chosen custom_id."""
+    custom_id: str  # letters, digits, "_" and "-" only, at most 64 characters
+    model: str
+    system_prompt: str
+    user_prompt: str
+    context: str = ""
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one request in a batch."""
+    custom_id: str
+    response: Optional[LLMResponse] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.response is not None and self.error is None
+
+
+@dataclass
+class BatchJob:
+    """A submitted batch and its last known status."""
+    provider: str
+    backend: str
+    batch_id: str
+    custom_ids: List[str] = field(default_factory=list)
+    status: str = "submitted"
+    done: bool = False
+    submitted_at: float = field(default_factory=time.time)
+
+
+class OpenAIBatchBackend:
+    """Submits chat completions through the OpenAI Batch API."""
+    name = "openai-batch"
+    final_statuses = {"completed", "failed", "expired", "cancelled"}
+
+    def __init__(self, llm_service):
+        self.llm_service = llm_service
+        self.client = llm_service.openai_client
+
+    def submit(self, requests: List[BatchRequest]) -> str:
+        lines = [
+            json.dumps({
+                "custom_id": request.custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": self.llm_service._openai_request(
+                    request.model, request.system_prompt, request.user_prompt, request.context
+                )
+            }, ensure_ascii=False)
+            for request in requests
+        ]
+        input_file = self.client.files.create(
+            file=("batch.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch"
+        )
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        return batch.id
+
+    def poll(self, batch_id: str) -> Tuple[str, bool]:
+        batch = self.client.batches.retrieve(batch_id)
+        return batch.status, batch.status in self.final_statuses
+
+    def results(self, batch_id: str) -> List[BatchResult]:
+        batch = self.client.batches.retrieve(batch_id)
+        results = []
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            for line in self.client.files.content(file_id).text.splitlines():
+                if line.strip():
+                    results.append(self._parse_line(json.loads(line)))
+        return results
+
+    @staticmethod
+    def _parse_line(entry: Dict) -> BatchResult:
+        custom_id = entry.get("custom_id", "")
+        response = entry.get("response") or {}
+        if entry.get("error") or response.get("status_code") != 200:
+            error = entry.get("error") or response.get("body", {}).get("error") or response
+            return BatchResult(custom_id, error=str(error))
+        body = response["body"]
+        usage = body.get("usage") or {}
+        details = usage.get("prompt_tokens_details") or {}
+        return BatchResult(custom_id, response=LLMResponse(
+            text=body["choices"][0]["message"]["content"].strip(),
+            provider="OpenAI",
+            model=body.get("model", ""),
+            input_tokens=usage.get("prompt_tokens", 0),
+            cached_input_tokens=details.get("cached_tokens", 0) or 0,
+            output_tokens=usage.get("completion_tokens", 0)
+        ))
+
+
+class AnthropicBatchBackend:
+    """Submits messages through the Anthropic Message Batches API."""
+    name = "anthropic-batch"
+
+    def __init__(self, llm_service):
+        self.llm_service = llm_service
+        self.client = llm_service.anthropic_client
+
+    def submit(self, requests: List[BatchRequest]) -> str:
+        batch = self.client.messages.batches.create(requests=[
+            {
+                "custom_id": request.custom_id,
+                "params": self.llm_service._anthropic_request(
+                    request.model, request.system_prompt, request.user_prompt, request.context
+                )
+            }
+            for request in requests
+        ])
+        return batch.id
+
+    def poll(self, batch_id: str) -> Tuple[str, bool]:
+        batch = self.client.messages.batches.retrieve(batch_id)
+        return batch.processing_status, batch.processing_status == "ended"
+
+    def results(self, batch_id: str) -> List[BatchResult]:
+        results = []
+        for entry in self.client.messages.batches.results(batch_id):
+            if entry.result.type != "succeeded":
+                error = getattr(entry.result, "error", None)
+                results.append(BatchResult(entry.custom_id, error=f"{entry.result.type}: {error}" if error else entry.result.type))
+                continue
+            message = entry.result.message
+            response = LLMResponse(text=message.content[0].text.strip(), provider="Anthropic", model=message.model)
+            self.llm_service._read_anthropic_usage(message.usage, response)
+            results.append(BatchResult(entry.custom_id, response=response))
+        return results
+
+
+class LocalBatchBackend:
+    """
+    Stand-in for a provider batch API: runs the requests through the regular
+    LLMService calls on a small thread pool. Used for providers without a
+    batch API (such as the Local Stub), for simulated providers (see
+    services.llm_providers) and when BATCH_FORCE_LOCAL is set.
+    """
+    name = "local"
+
+    def __init__(self, max_workers: int = BATCH_LOCAL_MAX_WORKERS):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="local-batch")
+        self._batches: Dict[str, List[Tuple[str, Future]]] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, llm_service, provider: str, requests: List[BatchRequest]) -> str:
+        batch_id = f"local_{uuid.uuid4().hex[:12]}"
+        futures = [
+            (request.custom_id, self._executor.submit(
+                llm_service.generate, provider, request.model, request.system_prompt, request.user_prompt, request.context
+            ))
+            for request in requests
+        ]
+        with self._lock:
+            self._batches[batch_id] = futures
+        return batch_id
+
+    def poll(self, batch_id: str) -> Tuple[str, bool]:
+        with self._lock:
+            futures = self._batches.get(batch_id, [])
+        finished = sum(future.done() for _, future in futures)
+        return f"{finished}/{len(futures)} finished", finished == len(futures)
+
+    def results(self, batch_id: str) -> List[BatchResult]:
+        with self._lock:
+            futures = self._batches.pop(batch_id, [])
+        results = []
+        for custom_id, future in futures:
+            try:
+                response = future.result()
+                if response is None:
+                    results.append(BatchResult(custom_id, error="Unknown provider"))
+                else:
+                    results.append(BatchResult(custom_id, response=response))
+            except Exception as e:
+                results.append(BatchResult(custom_id, error=str(e)))
+        return results
+
+
+PROVIDER_BATCH_BACKENDS = {
+    "OpenAI": OpenAIBatchBackend,
+    "Anthropic": AnthropicBatchBackend,
+}
+
+_local_backend: Optional[LocalBatchBackend] = None
+_local_backend_lock = threading.Lock()
+
+
+def get_local_batch_backend() -> LocalBatchBackend:
+    """Returns the process-wide local batch stand-in, which keeps track of running local batches."""
+    global _local_backend
+    with _local_backend_lock:
+        if _local_backend is None:
+            _local_backend = LocalBatchBackend()
+        return _local_backend
+
+
+def submit_batch(llm_service, provider: str, requests: List[BatchRequest]) -> BatchJob:
+    """
+    Submits requests for one provider as a single batch.
+
+    Args:
+        llm_service: LLMService whose clients and request formats are used
+        provider: LLM provider name
+        requests: Requests to submit
+
+    Returns:
+        BatchJob to poll with poll_batch
+    """
+    simulated = provider in llm_service.providers and llm_service.providers[provider].simulated
+    backend_class = None if BATCH_FORCE_LOCAL or simulated else PROVIDER_BATCH_BACKENDS.get(provider)
+    if backend_class is None:
+        backend = get_local_batch_backend()
+        batch_id = backend.submit(llm_service, provider, requests)
+    else:
+        backend = backend_class(llm_service)
+        batch_id = backend.submit(requests)
+    print(f"[Batch] Submitted {len(requests)} {provider} requests as batch {batch_id} ({backend.name})")
+    return BatchJob(provider, backend.name, batch_id, [request.custom_id for request in requests])
+
+
+def _backend_for(llm_service, job: BatchJob):
+    if job.backend == LocalBatchBackend.name:
+        return get_local_batch_backend()
+    return PROVIDER_BATCH_BACKENDS[job.provider](llm_service)
+
+
+def poll_batch(llm_service, job: BatchJob) -> BatchJob:
+    """Refreshes the status of a batch job in place and returns it."""
+    job.status, job.done = _backend_for(llm_service, job).poll(job.batch_id)
+    return job
+
+
+def get_batch_results(llm_service, job: BatchJob) -> Dict[str, BatchResult]:
+    """
+    Collects the results of a finished batch.
+
+    Requests that produced no result (e.g. because the batch expired) are
+    reported with an error.
+
+    Returns:
+        BatchResult per custom_id
+    """
+    results = {result.custom_id: result for result in _backend_for(llm_service, job).results(job.batch_id)}
+    for custom_id in job.custom_ids:
+        if custom_id not in results:
+            results[custom_id] = BatchResult(custom_id, error=f"No result (batch {job.status})")
+    return results
@@ -0,0 +1,246 @@
+import email.utils
+import random
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+from config.settings import (
+    FETCH_RATE_PER_HOST,
+    FETCH_RATE_BURST,
+    FETCH_MAX_RETRIES,
+    FETCH_RETRY_STATUSES,
+    FETCH_RETRY_BASE_DELAY,
+    FETCH_RETRY_MAX_DELAY,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_RESET_TIMEOUT
+)
+
+# Circuit breaker states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request to a host whose circuit is open."""
+
+
+class TokenBucket:
+    """Token-bucket rate limiter: `rate` tokens per second, holding at most `burst`."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Takes one token, waiting for it if necessary.
+
+        Args:
+            timeout: Maximum seconds to wait, or None to wait indefinitely
+
+        Returns:
+            True if a token was taken, False if it would not arrive in time
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if deadline is not None and now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    """
+    Fails fast for a host that keeps failing.
+
+    After `failure_threshold` consecutive failures the circuit opens and
+    requests are refused for `reset_timeout` seconds. The first request after
+    that is let through as a trial: success closes the circuit, failure opens
+    it again.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """True if a request may be sent now."""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                self._trial_running = False
+            if self.state == HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def release(self) -> None:
+        """Ends a trial that was allowed but never sent, so the next request can try instead."""
+        with self._lock:
+            self._trial_running = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self._trial_running = False
+
+    def record_failure(self) -> bool:
+        """Records a failure and returns True if this opened the circuit."""
+        with self._lock:
+            self.failures += 1
+            self._trial_running = False
+            if self.state == HALF_OPEN or (self.state == CLOSED and self.failures >= self.failure_threshold):
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+                return True
+            return False
+
+    def retry_in(self) -> float:
+        """Seconds until an open circuit lets a trial request through."""
+        with self._lock:
+            if self.state != OPEN:
+                return 0.0
+            return max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parses a Retry-After header given either as seconds or as an HTTP date.
+
+    Args:
+        value: Header value
+
+    Returns:
+        Seconds to wait, or None if the header is missing or malformed
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class FetchPolicy:
+    """
+    Per-host rate limits, retry timing and circuit breakers for article fetches.
+
+    A single instance is shared by every session in the process, so a host
+    that is failing for one user fails fast for everyone.
+    """
+
+    def __init__(
+        self,
+        rate: float = FETCH_RATE_PER_HOST,
+        burst: int = FETCH_RATE_BURST,
+        max_retries: int = FETCH_MAX_RETRIES,
+        retry_statuses=FETCH_RETRY_STATUSES,
+        base_delay: float = FETCH_RETRY_BASE_DELAY,
+        max_delay: float = FETCH_RETRY_MAX_DELAY,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        reset_timeout: float = BREAKER_RESET_TIMEOUT
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self.retry_statuses = set(retry_statuses)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def host(url: str) -> str:
+        return urlparse(url).netloc.lower()
+
+    def bucket(self, url: str) -> TokenBucket:
+        """Returns the rate limiter for the URL's host."""
+        host = self.host(url)
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(self.rate, self.burst)
+            return self._buckets[host]
+
+    def breaker(self, url: str) -> CircuitBreaker:
+        """Returns the circuit breaker for the URL's host."""
+        host = self.host(url)
+        with self._lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            return self._breakers[host]
+
+    def should_retry(self, status_code: int) -> bool:
+        """True for responses that are worth retrying (rate limited or temporarily unavailable)."""
+        return status_code in self.retry_statuses
+
+    def retry_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """
+        Returns how long to wait before the next attempt.
+
+        Uses the server's Retry-After when given, otherwise exponential backoff
+        with full jitter. Both are capped at max_delay.
+
+        Args:
+            attempt: Number of the attempt that just failed, starting at 1
+            retry_after: Retry-After header of the failed response, if any
+
+        Returns:
+            Delay in seconds
+        """
+        requested = parse_retry_after(retry_after)
+        if requested is not None:
+            return min(requested, self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+
+    def stats(self) -> Dict[str, Dict]:
+        """Returns the breaker state of every host that has seen a failure."""
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {
+            host: {"state": breaker.state, "failures": breaker.failures, "retry_in": round(breaker.retry_in(), 1)}
+            for host, breaker in breakers.items()
+            if breaker.failures
+        }
+
+
+_fetch_policy: Optional[FetchPolicy] = None
+_fetch_policy_lock = threading.Lock()
+
+
+def get_fetch_policy() -> FetchPolicy:
+    """Returns the process-wide fetch policy so breaker state is shared across sessions."""
+    global _fetch_policy
+    with _fetch_policy_lock:
+        if _fetch_policy is None:
+            _fetch_policy = FetchPolicy()
+        return _fetch_policy
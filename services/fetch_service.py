@@ -0,0 +1,359 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+
+from services.http_session import get_session
+from services.fetch_policy import CircuitOpenError, FetchPolicy, get_fetch_policy
+from services.article_cache import ArticleCache, CachedArticle, canonicalize_url, get_article_cache
+from config.settings import (
+    FETCH_TIMEOUT,
+    FETCH_DEADLINE,
+    FETCH_MAX_WORKERS,
+    FETCH_PER_HOST_LIMIT
+)
+
+# Headers to mimic a real browser
+BROWSER_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+}
+
+
+@dataclass
+class FetchResult:
+    """Outcome of fetching and extracting a single URL."""
+    url: str
+    text: str = ""
+    status_code: Optional[int] = None
+    error: Optional[str] = None
+    fetch_time: float = 0.0
+    parse_time: float = 0.0
+    cache_status: str = ""  # "hit", "revalidated", "stale" or "miss" when a cache is in use
+
+    @property
+    def ok(self) -> bool:
+        """True when the URL produced usable article text."""
+        return self.error is None and bool(self.text.strip())
+
+    @property
+    def elapsed(self) -> float:
+        """Total time spent on this URL in seconds."""
+        return self.fetch_time + self.parse_time
+
+
+class FetchService:
+    """
+    Fetches article URLs concurrently with per-host limits and an overall deadline.
+
+    With a FetchPolicy, requests are also rate limited per host, transient
+    failures are retried with backoff and hosts that keep failing are skipped
+    until their circuit breaker lets a trial request through.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = FETCH_MAX_WORKERS,
+        per_host_limit: int = FETCH_PER_HOST_LIMIT,
+        timeout: float = FETCH_TIMEOUT,
+        deadline: float = FETCH_DEADLINE,
+        cache: Optional[ArticleCache] = None,
+        policy: Optional[FetchPolicy] = None
+    ):
+        self.max_workers = max_workers
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout
+        self.deadline = deadline
+        self.cache = cache
+        self.policy = policy
+        self._host_limits: Dict[str, threading.BoundedSemaphore] = {}
+        self._in_flight: Dict[Tuple[str, str], Future] = {}
+        self._lock = threading.Lock()
+
+    def _host_semaphore(self, url: str) -> threading.BoundedSemaphore:
+        """Returns the semaphore limiting concurrent requests to the URL's host."""
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            if host not in self._host_limits:
+                self._host_limits[host] = threading.BoundedSemaphore(self.per_host_limit)
+            return self._host_limits[host]
+
+    def fetch_one(self, url: str, extract: Callable[[str], str]) -> FetchResult:
+        """
+        Fetches a single URL and extracts its article text.
+
+        Concurrent calls for the same URL (e.g. a background prefetch and a
+        foreground generation) share a single request.
+
+        Args:
+            url: URL to fetch
+            extract: Function turning the page HTML into article text
+
+        Returns:
+            FetchResult with the extracted text, or the error that occurred
+        """
+        key = (canonicalize_url(url), getattr(extract, "__name__", ""))
+        with self._lock:
+            pending = self._in_flight.get(key)
+            is_owner = pending is None
+            if is_owner:
+                pending = self._in_flight[key] = Future()
+
+        if not is_owner:
+            return replace(pending.result(), url=url)
+
+        try:
+            result = self._fetch_one(url, extract)
+            pending.set_result(result)
+            return result
+        except BaseException as e:
+            pending.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def is_in_flight(self, url: str) -> bool:
+        """True while a request for the URL is running."""
+        canonical = canonicalize_url(url)
+        with self._lock:
+            return any(key[0] == canonical for key in self._in_flight)
+
+    def _fetch_one(self, url: str, extract: Callable[[str], str]) -> FetchResult:
+        """Fetches and extracts a single URL, consulting the article cache."""
+        result = FetchResult(url=url)
+        extractor_name = getattr(extract, "__name__", "")
+        cached = self.cache.get(url) if self.cache else None
+        if cached and cached.extractor != extractor_name:
+            cached = self._reextract(cached, extract, extractor_name)
+        if cached and self.cache.is_fresh(cached):
+            self.cache.record_hit()
+            result.text = cached.text
+            result.cache_status = "hit"
+            return result
+
+        headers = dict(BROWSER_HEADERS)
+        if cached:
+            headers.update(self.cache.validators(cached))
+
+        start = time.perf_counter()
+        try:
+            response = self._get(url, headers, start)
+            result.status_code = response.status_code
+            if cached and response.status_code == 304:
+                result.fetch_time = time.perf_counter() - start
+                self.cache.mark_revalidated(cached)
+                self.cache.record_hit()
+                result.text = cached.text
+                result.cache_status = "revalidated"
+                return result
+            response.raise_for_status()
+            html = response.text
+            result.fetch_time = time.perf_counter() - start
+
+            parse_start = time.perf_counter()
+            result.text = extract(html)
+            result.parse_time = time.perf_counter() - parse_start
+
+            if not result.text.strip():
+                result.error = "No article content found"
+            elif self.cache:
+                self.cache.put(
+                    url,
+                    html,
+                    result.text,
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified"),
+                    extractor=extractor_name
+                )
+        except Exception as e:
+            if not result.fetch_time:
+                result.fetch_time = time.perf_counter() - start
+            result.error = str(e)
+            if cached and self._is_transient(e):
+                # Serve the stale copy rather than failing the whole source
+                print(f"[Article Cache] Serving stale copy of {url} after error: {e}")
+                result.text = cached.text
+                result.error = None
+                result.cache_status = "stale"
+                return result
+            if cached and result.status_code in (404, 410):
+                print(f"[Article Cache] Dropping {url}: the page is gone ({result.status_code})")
+                self.cache.delete(url)
+
+        if self.cache:
+            self.cache.record_miss()
+            result.cache_status = "miss"
+        return result
+
+    @staticmethod
+    def _is_transient(error: Exception) -> bool:
+        """True for failures worth riding out on a stale copy: network trouble, 429, 5xx or an open circuit."""
+        if isinstance(error, (requests.ConnectionError, requests.Timeout, TimeoutError, CircuitOpenError)):
+            return True
+        status = getattr(getattr(error, "response", None), "status_code", None)
+        return status is not None and (status == 429 or status >= 500)
+
+    def _get(self, url: str, headers: Dict[str, str], started: float) -> requests.Response:
+        """
+        Sends a GET request, applying the fetch policy when one is configured.
+
+        Args:
+            url: URL to fetch
+            headers: Request headers
+            started: perf_counter() value when fetching this URL began; retries
+                and rate-limit waits are not allowed to run past the deadline
+
+        Returns:
+            The final response, which may still be an error status
+
+        Raises:
+            CircuitOpenError: If the host's circuit breaker is open
+            TimeoutError: If the rate limit would delay the request past the deadline
+        """
+        if self.policy is None:
+            with self._host_semaphore(url):
+                return get_session().get(url, headers=headers, timeout=self.timeout)
+
+        policy = self.policy
+        host = policy.host(url)
+        breaker = policy.breaker(url)
+        attempts = policy.max_retries + 1
+        last_error: Optional[Exception] = None
+
+        for attempt in range(1, attempts + 1):
+            # An open circuit fails fast instead of waiting for, and spending, a rate limit token
+            if not breaker.allow():
+                if last_error:
+                    raise last_error
+                raise CircuitOpenError(
+                    f"Skipping {host} after repeated failures (retrying in {breaker.retry_in():.0f}s)"
+                )
+            remaining = self.deadline - (time.perf_counter() - started)
+            if not policy.bucket(url).acquire(timeout=max(remaining, 0)):
+                breaker.release()
+                raise last_error or TimeoutError(f"Rate limit for {host} would exceed the {self.deadline}s deadline")
+
+            # The rate limit wait counts against the deadline too
+            remaining = self.deadline - (time.perf_counter() - started)
+            retry_after = None
+            try:
+                with self._host_semaphore(url):
+                    response = get_session().get(url, headers=headers, timeout=min(self.timeout, max(remaining, 1)))
+            except requests.Timeout:
+                # A slow host would cost another full timeout; let the breaker deal with it
+                self._record_failure(breaker, host)
+                raise
+            except requests.ConnectionError as e:
+                self._record_failure(breaker, host)
+                last_error = e
+                if attempt == attempts:
+                    raise
+            except Exception:
+                # Redirect loops, broken encodings and the like are not retried, but a
+                # half-open breaker's trial must still end, or the host stays blocked
+                self._record_failure(breaker, host)
+                raise
+            else:
+                if not policy.should_retry(response.status_code):
+                    if response.status_code >= 500:
+                        self._record_failure(breaker, host)
+                    else:
+                        breaker.record_success()
+                    return response
+                self._record_failure(breaker, host)
+                if attempt == attempts:
+                    return response
+                retry_after = response.headers.get("Retry-After")
+                last_error = requests.HTTPError(f"{response.status_code} Error for url: {url}", response=response)
+
+            delay = policy.retry_delay(attempt, retry_after)
+            if time.perf_counter() - started + delay >= self.deadline:
+                print(f"[Fetch Policy] Not retrying {url}: waiting {delay:.1f}s would exceed the deadline")
+                raise last_error
+            print(f"[Fetch Policy] Retrying {url} in {delay:.1f}s (attempt {attempt + 1} of {attempts}): {last_error}")
+            time.sleep(delay)
+
+        raise last_error
+
+    @staticmethod
+    def _record_failure(breaker, host: str) -> None:
+        if breaker.record_failure():
+            print(f"[Fetch Policy] Circuit opened for {host} after {breaker.failures} consecutive failures")
+
+    def _reextract(
+        self,
+        cached: CachedArticle,
+        extract: Callable[[str], str],
+        extractor_name: str
+    ) -> Optional[CachedArticle]:
+        """Re-runs extraction on the cached HTML after the extraction engine changed."""
+        html = self.cache.get_html(cached.url)
+        if not html:
+            return None
+        text = extract(html)
+        if not text.strip():
+            return None
+        return self.cache.put(
+            cached.url,
+            html,
+            text,
+            etag=cached.etag,
+            last_modified=cached.last_modified,
+            extractor=extractor_name,
+            fetched_at=cached.fetched_at
+        )
+
+    def fetch_all(self, urls: List[str], extract: Callable[[str], str]) -> List[FetchResult]:
+        """
+        Fetches all URLs concurrently.
+
+        Args:
+            urls: URLs to fetch
+            extract: Function turning the page HTML into article text
+
+        Returns:
+            One FetchResult per URL, in input order. URLs that did not finish
+            before the deadline are reported as failed.
+        """
+        if not urls:
+            return []
+
+        executor = ThreadPoolExecutor(
+            max_workers=min(self.max_workers, len(urls)),
+            thread_name_prefix="article-fetch"
+        )
+        futures = [executor.submit(self.fetch_one, url, extract) for url in urls]
+        done, _ = wait(futures, timeout=self.deadline)
+        # Don't block the caller on stragglers; they finish in the background
+        executor.shutdown(wait=False, cancel_futures=True)
+
+        results = []
+        for url, future in zip(urls, futures):
+            if future in done:
+                results.append(future.result())
+            else:
+                results.append(FetchResult(
+                    url=url,
+                    error=f"Deadline of {self.deadline}s exceeded",
+                    fetch_time=self.deadline
+                ))
+        return results
+
+
+_fetch_service: Optional[FetchService] = None
+_fetch_service_lock = threading.Lock()
+
+
+def get_fetch_service() -> FetchService:
+    """Returns the process-wide FetchService so host limits apply across sessions."""
+    global _fetch_service
+    with _fetch_service_lock:
+        if _fetch_service is None:
+            _fetch_service = FetchService(cache=get_article_cache(), policy=get_fetch_policy())
+        return _fetch_service
@@ -0,0 +1,160 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+from config.settings import GENERATION_JOB_WORKERS, GENERATION_JOB_RETENTION
+from services.llm_types import CancelToken, GenerationCancelled
+
+
+@dataclass
+class GenerationJob:
+    """A generation running in the background, identified by job_id."""
+    job_id: str
+    key: str  # what the job generates, e.g. "<session>:windshield"
+    started: float = field(default_factory=time.time)
+    cancel_token: CancelToken = field(default_factory=CancelToken)
+    status: str = "queued"  # queued, running, done, failed or cancelled
+    text: str = ""  # streamed so far
+    result: Any = None
+    error: str = ""
+    superseded_by: str = ""  # id of the job that replaced this one
+    finished: Optional[float] = None
+
+    @property
+    def active(self) -> bool:
+        return self.status in ("queued", "running")
+
+    def update(self, text: str) -> None:
+        """Stores the text streamed so far; used as the on_delta callback."""
+        self.text = text
+
+
+class GenerationJobs:
+    """
+    Background generation jobs, at most one active per key.
+
+    Submitting a job for a key whose previous job is still active supersedes
+    it: the previous job is cancelled, which closes its provider stream, and
+    its result is discarded. Finished jobs are kept until their session
+    collects them with pop, or for GENERATION_JOB_RETENTION seconds.
+    """
+
+    def __init__(self, max_workers: int = GENERATION_JOB_WORKERS, retention: float = GENERATION_JOB_RETENTION):
+        self.retention = retention
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="generation-job")
+        self._jobs: Dict[str, GenerationJob] = {}
+        self._lock = threading.Lock()
+        self.cancelled = 0
+        self.superseded = 0
+
+    def submit(self, key: str, work: Callable[[GenerationJob], Any]) -> GenerationJob:
+        """
+        Starts a job, superseding the active job for the same key.
+
+        Args:
+            key: What the job generates; unique per session and section
+            work: Called on a worker thread with the job; should stream into
+                job.update and stop when job.cancel_token is cancelled. Its
+                return value becomes job.result.
+
+        Returns:
+            The new job
+        """
+        job = GenerationJob(job_id=uuid.uuid4().hex[:12], key=key)
+        with self._lock:
+            self._prune()
+            previous = self._jobs.get(key)
+            self._jobs[key] = job
+        if previous is not None and previous.active:
+            previous.superseded_by = job.job_id
+            self._cancel(previous, superseded=True)
+            print(f"[Jobs] {key}: job {previous.job_id} superseded by {job.job_id}")
+        self._executor.submit(self._run, job, work)
+        return job
+
+    def _run(self, job: GenerationJob, work: Callable[[GenerationJob], Any]) -> None:
+        with self._lock:
+            if job.status != "queued":
+                return
+            job.status = "running"
+        try:
+            result = work(job)
+            error = ""
+        except GenerationCancelled:
+            result, error = None, ""
+        except Exception as e:
+            result, error = None, str(e)
+        with self._lock:
+            if job.status != "running":
+                return
+            if job.cancel_token.cancelled:
+                job.status = "cancelled"
+            elif error:
+                job.status, job.error = "failed", error
+            else:
+                job.status, job.result = "done", result
+            job.finished = time.time()
+
+    def _cancel(self, job: GenerationJob, superseded: bool = False) -> bool:
+        with self._lock:
+            if not job.active:
+                return False
+            job.status = "cancelled"
+            job.finished = time.time()
+            if superseded:
+                self.superseded += 1
+            else:
+                self.cancelled += 1
+        # Closing the provider stream happens outside the lock
+        job.cancel_token.cancel()
+        return True
+
+    def cancel(self, key: str) -> bool:
+        """Cancels the active job for a key; returns False if there was none."""
+        with self._lock:
+            job = self._jobs.get(key)
+        if job is None or not self._cancel(job):
+            return False
+        print(f"[Jobs] {key}: job {job.job_id} cancelled after {time.time() - job.started:.1f}s")
+        return True
+
+    def get(self, key: str) -> Optional[GenerationJob]:
+        """Returns the latest job for a key."""
+        with self._lock:
+            return self._jobs.get(key)
+
+    def pop(self, key: str, job_id: str) -> None:
+        """Forgets a finished job once its result has been collected."""
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and job.job_id == job_id and not job.active:
+                del self._jobs[key]
+
+    def _prune(self) -> None:
+        """Drops finished jobs nobody collected; the caller holds the lock."""
+        cutoff = time.time() - self.retention
+        for key, job in list(self._jobs.items()):
+            if not job.active and job.finished is not None and job.finished < cutoff:
+                del self._jobs[key]
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the number of active jobs and of cancelled and superseded jobs so far."""
+        with self._lock:
+            active = sum(job.active for job in self._jobs.values())
+        return {"active": active, "cancelled": self.cancelled, "superseded": self.superseded}
+
+
+_generation_jobs: Optional[GenerationJobs] = None
+_generation_jobs_lock = threading.Lock()
+
+
+def get_generation_jobs() -> GenerationJobs:
+    """Returns the process-wide generation jobs, so every session shares one worker pool."""
+    global _generation_jobs
+    with _generation_jobs_lock:
+        if _generation_jobs is None:
+            _generation_jobs = GenerationJobs()
+        return _generation_jobs
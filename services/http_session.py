@@ -0,0 +1,71 @@
+import threading
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config.settings import HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE, HTTP_HOST_POOL_SIZES
+
+try:
+    # urllib3 only decodes brotli responses when one of these is installed
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        ACCEPT_ENCODING = "gzip, deflate, br"
+    except ImportError:
+        ACCEPT_ENCODING = "gzip, deflate"
+
+
+def create_session(
+    pool_connections: int = HTTP_POOL_CONNECTIONS,
+    pool_maxsize: int = HTTP_POOL_MAXSIZE,
+    host_pool_sizes: Optional[Dict[str, int]] = None
+) -> requests.Session:
+    """
+    Creates a requests session with keep-alive connection pooling.
+    
+    Args:
+        pool_connections: Number of per-host pools to keep
+        pool_maxsize: Default number of connections kept alive per host
+        host_pool_sizes: Overrides of pool_maxsize for specific hosts
+        
+    Returns:
+        Configured requests.Session
+    """
+    session = requests.Session()
+    session.headers.update({
+        "Accept-Encoding": ACCEPT_ENCODING,
+        "Connection": "keep-alive",
+    })
+    
+    default_adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+    session.mount("https://", default_adapter)
+    session.mount("http://", default_adapter)
+    
+    # Longer prefixes win, so these take precedence over the defaults above
+    for host, size in (host_pool_sizes if host_pool_sizes is not None else HTTP_HOST_POOL_SIZES).items():
+        host_adapter = HTTPAdapter(pool_connections=1, pool_maxsize=size)
+        session.mount(f"https://{host}/", host_adapter)
+        session.mount(f"http://{host}/", host_adapter)
+    
+    return session
+
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """
+    Returns the process-wide pooled session shared by all outbound fetches.
+    
+    urllib3's connection pools are thread-safe, so one session can serve the
+    fetch worker threads and every Streamlit session at the same time.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = create_session()
+        return _session
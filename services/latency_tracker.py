@@ -0,0 +1,85 @@
+import threading
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+from config.settings import HEDGE_WINDOW, HEDGE_MIN_SAMPLES
+from services.telemetry import TelemetryLog, get_telemetry_log
+
+
+class LatencyTracker:
+    """Keeps the most recent time-to-first-token observations per provider and model."""
+
+    def __init__(self, window: int = HEDGE_WINDOW, min_samples: int = HEDGE_MIN_SAMPLES):
+        self.window = window
+        self.min_samples = min_samples
+        self._samples: Dict[Tuple[str, str], Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, provider: str, model: str, seconds: float) -> None:
+        with self._lock:
+            key = (provider, model)
+            if key not in self._samples:
+                self._samples[key] = deque(maxlen=self.window)
+            self._samples[key].append(seconds)
+
+    def percentile(self, provider: str, model: str, pct: float) -> Optional[float]:
+        """
+        Returns the given percentile of recent latencies.
+
+        Args:
+            provider: LLM provider name
+            model: Model identifier
+            pct: Percentile between 0 and 100
+
+        Returns:
+            Latency in seconds, or None until min_samples calls have been observed
+        """
+        with self._lock:
+            samples = sorted(self._samples.get((provider, model), ()))
+        if len(samples) < self.min_samples:
+            return None
+        index = min(len(samples) - 1, max(0, round(pct / 100 * len(samples)) - 1))
+        return samples[index]
+
+    def load_history(self, log: Optional[TelemetryLog] = None) -> int:
+        """
+        Seeds the samples with the time to first token of streamed calls in
+        the telemetry log, so hedging does not start cold after a restart.
+
+        Cached, hedged and failed calls are skipped: their first token says
+        nothing about the model's own latency. Blocking calls have no time to
+        first token and are never logged with one.
+
+        Args:
+            log: Log to read; defaults to the process-wide telemetry log
+
+        Returns:
+            Number of samples loaded
+        """
+        loaded = 0
+        for record in (log or get_telemetry_log()).read():
+            if record.first_token_seconds is None or record.from_cache or record.hedged or record.error:
+                continue
+            self.record(record.provider, record.model, record.first_token_seconds)
+            loaded += 1
+        return loaded
+
+    def sample_count(self, provider: str, model: str) -> int:
+        with self._lock:
+            return len(self._samples.get((provider, model), ()))
+
+
+_latency_tracker: Optional[LatencyTracker] = None
+_latency_tracker_lock = threading.Lock()
+
+
+def get_latency_tracker() -> LatencyTracker:
+    """Returns the process-wide latency tracker."""
+    global _latency_tracker
+    with _latency_tracker_lock:
+        if _latency_tracker is None:
+            _latency_tracker = LatencyTracker()
+            loaded = _latency_tracker.load_history()
+            if loaded:
+                print(f"[Hedge] Loaded {loaded} first-token latencies from the telemetry log")
+        return _latency_tracker
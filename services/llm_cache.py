@@ -0,0 +1,228 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+from config.settings import (
+    LLM_CACHE_MEMORY_ENTRIES,
+    LLM_CACHE_DIR,
+    LLM_CACHE_TTL,
+    LLM_CACHE_MAX_BYTES
+)
+
+
+@dataclass
+class CachedResponse:
+    """A stored LLM response."""
+    text: str
+    provider: str
+    model: str
+    created_at: float
+    latency: float  # seconds the original call took
+
+
+def request_key(
+    provider: str,
+    model: str,
+    system_prompt: str,
+    user_prompt: str,
+    temperature: float,
+    max_tokens: int,
+    stop: Sequence[str] = ()
+) -> str:
+    """Returns the cache key for a request: a hash of every field that affects the response."""
+    fields = [provider, model, system_prompt, user_prompt, temperature, max_tokens]
+    if stop:
+        # Only requests with stop sequences add them, so existing keys stay valid
+        fields.append(list(stop))
+    payload = json.dumps(fields, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    Two-tier cache of LLM responses keyed by request_key.
+
+    Responses are kept in an in-memory LRU of `memory_entries` and written to
+    disk, where entries expire after `ttl` seconds and the least recently
+    used are evicted once the directory exceeds `max_bytes`.
+    """
+
+    def __init__(
+        self,
+        memory_entries: int = LLM_CACHE_MEMORY_ENTRIES,
+        cache_dir: str = LLM_CACHE_DIR,
+        ttl: float = LLM_CACHE_TTL,
+        max_bytes: int = LLM_CACHE_MAX_BYTES
+    ):
+        self.memory_entries = memory_entries
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.saved_seconds = 0.0
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        # key -> bytes on disk, least recently used first
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self._load_index()
+
+    def _load_index(self) -> None:
+        """Rebuilds the LRU index from the files on disk, oldest access first."""
+        entries = []
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, path.stem, stat.st_size))
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._total_bytes += size
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def _is_fresh(self, entry: CachedResponse) -> bool:
+        return time.time() - entry.created_at < self.ttl
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """
+        Looks up a response, counting a hit or miss.
+
+        Args:
+            key: Key from request_key
+
+        Returns:
+            The cached response, or None if it is missing or expired
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry and self._is_fresh(entry):
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                self.saved_seconds += entry.latency
+                return entry
+
+        entry = self._read(key)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self.saved_seconds += entry.latency
+            self._remember(key, entry)
+            if key in self._index:
+                self._index.move_to_end(key)
+        try:
+            os.utime(self._path(key))
+        except OSError:
+            pass
+        return entry
+
+    def _read(self, key: str) -> Optional[CachedResponse]:
+        """Reads an entry from disk, dropping it if it has expired."""
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                entry = CachedResponse(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            return None
+        if not self._is_fresh(entry):
+            self._remove(key)
+            return None
+        return entry
+
+    def _remember(self, key: str, entry: CachedResponse) -> None:
+        """Adds an entry to the memory tier; the caller holds the lock."""
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def put(self, key: str, text: str, provider: str, model: str, latency: float) -> None:
+        """
+        Stores a response in both tiers.
+
+        Args:
+            key: Key from request_key
+            text: Response text
+            provider: LLM provider name
+            model: Model identifier
+            latency: Seconds the call took, credited as saved on later hits
+        """
+        entry = CachedResponse(text=text, provider=provider, model=model, created_at=time.time(), latency=latency)
+        path = self._path(key)
+        tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(asdict(entry), f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+            size = path.stat().st_size
+        except OSError as e:
+            print(f"[LLM Cache] Could not write cache entry: {e}")
+            size = None
+
+        with self._lock:
+            self._remember(key, entry)
+            if size is not None:
+                self._total_bytes -= self._index.pop(key, 0)
+                self._index[key] = size
+                self._total_bytes += size
+        self._evict()
+
+    def _remove(self, key: str) -> None:
+        with self._lock:
+            self._total_bytes -= self._index.pop(key, 0)
+            self._memory.pop(key, None)
+        try:
+            self._path(key).unlink()
+        except OSError:
+            pass
+
+    def _evict(self) -> None:
+        """Removes least recently used disk entries until the cache fits in max_bytes."""
+        with self._lock:
+            while self._total_bytes > self.max_bytes and len(self._index) > 1:
+                key, size = self._index.popitem(last=False)
+                self._total_bytes -= size
+                self.evictions += 1
+                try:
+                    self._path(key).unlink()
+                except OSError:
+                    pass
+
+    def stats(self) -> Dict[str, float]:
+        """Returns hit/miss counters, latency saved and the current cache size."""
+        with self._lock:
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "saved_seconds": round(self.saved_seconds, 2),
+                "entries": len(self._index),
+                "bytes": self._total_bytes
+            }
+
+
+_llm_cache: Optional[LLMResponseCache] = None
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """Returns the process-wide LLM response cache."""
+    global _llm_cache
+    with _llm_cache_lock:
+        if _llm_cache is None:
+            _llm_cache = LLMResponseCache()
+        return _llm_cache
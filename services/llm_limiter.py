@@ -0,0 +1,230 @@
+import random
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+from config.settings import (
+    LLM_RATE_LIMITS,
+    LLM_MODEL_RATE_LIMITS,
+    LLM_MAX_RETRIES,
+    LLM_RETRY_BASE_DELAY,
+    LLM_RETRY_MAX_DELAY
+)
+
+
+class RateLimiter:
+    """
+    Requests-per-minute and tokens-per-minute limits for one model.
+
+    Both budgets refill continuously. Callers are granted in arrival order:
+    only the caller at the head of the queue may take from the budgets, so a
+    large request is not starved by a stream of small ones. A Retry-After from
+    the provider pauses the whole queue.
+    """
+
+    def __init__(self, rpm: Optional[int], tpm: Optional[int]):
+        self.rpm = rpm
+        self.tpm = tpm
+        self._requests = float(rpm or 0)
+        self._tokens = float(tpm or 0)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._queue: deque = deque()
+        self._cond = threading.Condition()
+        self.granted = 0
+        self.throttled = 0
+        self.retries = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        if self.rpm:
+            self._requests = min(self.rpm, self._requests + elapsed * self.rpm / 60)
+        if self.tpm:
+            self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / 60)
+        self._updated = now
+
+    def _wait_needed(self, tokens: int, now: float) -> float:
+        """Seconds until a request of `tokens` fits in both budgets; the caller holds the lock."""
+        waits = [self._paused_until - now]
+        if self.rpm and self._requests < 1:
+            waits.append((1 - self._requests) * 60 / self.rpm)
+        if self.tpm and self._tokens < tokens:
+            waits.append((tokens - self._tokens) * 60 / self.tpm)
+        return max(waits)
+
+    def acquire(self, tokens: int) -> float:
+        """
+        Waits for this caller's turn and for room in the budgets, then takes
+        one request and `tokens` tokens.
+
+        Args:
+            tokens: Estimated tokens of the request (prompt plus max output)
+
+        Returns:
+            Seconds spent waiting
+        """
+        if self.tpm:
+            tokens = min(tokens, self.tpm)
+        ticket = object()
+        started = time.monotonic()
+        with self._cond:
+            self._queue.append(ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    wait = None
+                    if self._queue[0] is ticket:
+                        wait = self._wait_needed(tokens, now)
+                        if wait <= 0:
+                            self._requests -= 1
+                            self._tokens -= tokens
+                            break
+                    self._cond.wait(wait)
+            finally:
+                self._queue.remove(ticket)
+                self._cond.notify_all()
+            waited = time.monotonic() - started
+            self.granted += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+        return waited
+
+    def settle(self, reserved: int, used: int) -> None:
+        """Returns the difference between the reserved and the actually used tokens to the budget."""
+        if not self.tpm:
+            return
+        with self._cond:
+            self._tokens = min(self.tpm, self._tokens + min(reserved, self.tpm) - used)
+            self._cond.notify_all()
+
+    def record_retry(self) -> None:
+        with self._cond:
+            self.retries += 1
+
+    def pause(self, seconds: float) -> None:
+        """Holds every queued caller for `seconds`, e.g. after a 429 with Retry-After."""
+        with self._cond:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self.throttled += 1
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, float]:
+        """Returns queue depth, wait times and throttling counters."""
+        with self._cond:
+            return {
+                "queue_depth": len(self._queue),
+                "granted": self.granted,
+                "avg_wait_seconds": round(self.total_wait / self.granted, 2) if self.granted else 0.0,
+                "max_wait_seconds": round(self.max_wait, 2),
+                "throttled": self.throttled,
+                "retries": self.retries,
+                "paused_for": round(max(self._paused_until - time.monotonic(), 0), 1)
+            }
+
+
+class LLMLimiter:
+    """
+    Process-wide rate limits and retry timing for LLM calls.
+
+    Each provider/model pair gets its own RateLimiter, configured from the
+    provider's limits and any per-model override. Providers without limits
+    (such as the local stub) are not queued.
+    """
+
+    def __init__(
+        self,
+        limits: Dict[str, Dict[str, int]] = LLM_RATE_LIMITS,
+        model_limits: Dict[str, Dict[str, int]] = LLM_MODEL_RATE_LIMITS,
+        max_retries: int = LLM_MAX_RETRIES,
+        base_delay: float = LLM_RETRY_BASE_DELAY,
+        max_delay: float = LLM_RETRY_MAX_DELAY
+    ):
+        self.limits = limits
+        self.model_limits = model_limits
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._limiters: Dict[Tuple[str, str], RateLimiter] = {}
+        self._lock = threading.Lock()
+
+    def limiter(self, provider: str, model: str) -> Optional[RateLimiter]:
+        """Returns the rate limiter of a model, or None if its provider is not limited."""
+        limits = self.model_limits.get(model) or self.limits.get(provider)
+        if not limits:
+            return None
+        with self._lock:
+            if (provider, model) not in self._limiters:
+                self._limiters[(provider, model)] = RateLimiter(limits.get("rpm"), limits.get("tpm"))
+            return self._limiters[(provider, model)]
+
+    def acquire(self, provider: str, model: str, tokens: int) -> float:
+        """Waits for room to send a request; returns the seconds spent waiting."""
+        limiter = self.limiter(provider, model)
+        return limiter.acquire(tokens) if limiter else 0.0
+
+    def settle(self, provider: str, model: str, reserved: int, used: int) -> None:
+        """Corrects the token budget once a call's actual usage is known."""
+        limiter = self.limiter(provider, model)
+        if limiter:
+            limiter.settle(reserved, used)
+
+    def retry_delay(
+        self,
+        provider: str,
+        model: str,
+        attempt: int,
+        retry_after: Optional[float] = None,
+        rate_limited: bool = False
+    ) -> Optional[float]:
+        """
+        Returns how long to wait before retrying a transiently failed call.
+
+        Uses the provider's Retry-After when given, otherwise exponential
+        backoff with full jitter, capped at max_delay. When the provider asked
+        for a pause (Retry-After or a 429), the model's whole queue waits too.
+
+        Args:
+            provider: LLM provider name
+            model: Model identifier
+            attempt: Number of the attempt that just failed, starting at 1
+            retry_after: Seconds from the Retry-After header, if any
+            rate_limited: True if the call was rejected with a 429
+
+        Returns:
+            Delay in seconds, or None once the retries are used up
+        """
+        if attempt > self.max_retries:
+            return None
+        if retry_after is not None:
+            delay = min(retry_after, self.max_delay)
+        else:
+            delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+        limiter = self.limiter(provider, model)
+        if limiter:
+            limiter.record_retry()
+            if retry_after is not None or rate_limited:
+                limiter.pause(delay)
+        return delay
+
+    def stats(self) -> Dict[str, Dict]:
+        """Returns the metrics of every model that has been called, keyed by "provider model"."""
+        with self._lock:
+            limiters = dict(self._limiters)
+        return {f"{provider} {model}": limiter.stats() for (provider, model), limiter in limiters.items()}
+
+
+_llm_limiter: Optional[LLMLimiter] = None
+_llm_limiter_lock = threading.Lock()
+
+
+def get_llm_limiter() -> LLMLimiter:
+    """Returns the process-wide LLM rate limiter so every session shares the providers' limits."""
+    global _llm_limiter
+    with _llm_limiter_lock:
+        if _llm_limiter is None:
+            _llm_limiter = LLMLimiter()
+        return _llm_limiter
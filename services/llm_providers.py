@@ -0,0 +1,397 @@
+"""
+Provider backends for LLMService, including offline stand-ins for load
+testing and benchmarks.
+
+LLMService looks up a ProviderBackend per provider name. Besides the live
+providers, the provider mode (LLM_PROVIDER_MODE) can swap in:
+
+- "record": the live providers, with every completed call saved to a
+  cassette file of request/response pairs and their timing;
+- "replay": answers from the cassette, with the recorded timing;
+- "fake": a deterministic simulation with per-model latency and speed.
+"""
+import json
+import math
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from config.prompts import EDIT_PATCH_PROMPT, REARVIEW_BATCH_PROMPT
+from config.settings import (
+    LOCAL_STUB_PROVIDER,
+    LLM_CASSETTE_PATH,
+    LLM_REPLAY_MISS,
+    LLM_SIMULATION_TIME_SCALE,
+    FAKE_PROVIDER_SEED,
+    FAKE_PROVIDER_PROFILES
+)
+from services.llm_cache import request_key
+from services.llm_types import CancelToken, GenerationCancelled, LLMResponse, ModelConfig
+from services.stub_provider import count_tokens
+
+PROVIDER_MODES = ("live", "record", "replay", "fake")
+
+
+@dataclass
+class ProviderBackend:
+    """
+    How LLMService calls one provider.
+
+    generate(model, system_prompt, user_prompt, context, config) returns an
+    LLMResponse. stream(model, system_prompt, user_prompt, context, response,
+    cancel, config) yields text deltas and fills in the usage of response.
+    """
+    generate: Callable[..., LLMResponse]
+    stream: Callable[..., Iterator[str]]
+    simulated: bool = False  # answers without calling the provider, so it has no batch API
+
+
+class ReplayMiss(Exception):
+    """Raised when replaying a request that is not in the cassette."""
+
+
+def cassette_key(provider: str, model: str, system_prompt: str, user_prompt: str, context: str, config: ModelConfig) -> str:
+    """Returns the cassette key of a request: the response cache key of the same request."""
+    full_user_prompt = f"{context}\n\n{user_prompt}" if context else user_prompt
+    return request_key(provider, model, system_prompt, full_user_prompt, config.temperature, config.max_tokens, config.stop)
+
+
+def _sleep(seconds: float, cancel: Optional[CancelToken] = None) -> None:
+    """Sleeps, raising GenerationCancelled as soon as cancel is cancelled."""
+    if seconds <= 0:
+        return
+    if cancel is None:
+        time.sleep(seconds)
+    elif cancel.wait(seconds):
+        raise GenerationCancelled("Simulated request was cancelled")
+
+
+class FakeProvider:
+    """
+    Deterministic offline stand-in for a provider with realistic timing.
+
+    A request's time to first token, output speed and reply length are drawn
+    from its model's profile in FAKE_PROVIDER_PROFILES by a random generator
+    seeded with the request, so the same request always takes the same time
+    and gets the same reply. The reply is made of words from the prompt's
+    context, in the format the pipeline parses where it expects one: a JSON
+    line per story for batched Rearview requests and a replacement list for
+    patch edits.
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        profiles: Dict[str, Dict] = FAKE_PROVIDER_PROFILES,
+        seed: int = FAKE_PROVIDER_SEED,
+        time_scale: float = LLM_SIMULATION_TIME_SCALE
+    ):
+        self.provider = provider
+        self.profiles = profiles
+        self.seed = seed
+        self.time_scale = time_scale
+
+    @staticmethod
+    def _words(rng: random.Random, source: str, tokens: int) -> str:
+        """Returns a run of about `tokens` tokens of the source's words."""
+        words = re.findall(r"\S+", source) or ["lorem", "ipsum"]
+        start = rng.randrange(len(words))
+        parts: List[str] = []
+        length = 0
+        while length // 4 < tokens:
+            word = words[(start + len(parts)) % len(words)]
+            parts.append(word)
+            length += len(word) + 1
+        return " ".join(parts)
+
+    def _reply(self, rng: random.Random, user_prompt: str, context: str, tokens: int) -> str:
+        source = context or user_prompt
+        if REARVIEW_BATCH_PROMPT in user_prompt:
+            story_ids = re.findall(r"^Story (\d+):$", user_prompt, re.MULTILINE)
+            per_story = max(tokens // max(len(story_ids), 1) - 8, 5)
+            return "\n".join(
+                json.dumps({"id": int(story_id), "text": self._words(rng, source, per_story)}, ensure_ascii=False)
+                for story_id in story_ids
+            )
+        if EDIT_PATCH_PROMPT in user_prompt:
+            original = user_prompt.split("Original Section Content:\n", 1)[-1].split(f"\n\n{EDIT_PATCH_PROMPT}", 1)[0]
+            # Replace the first few words of the section, if they occur only once
+            find = " ".join(original.split(" ")[:6]).strip()
+            if find and original.count(find) == 1:
+                replace = f"{find} {self._words(rng, source, min(tokens, 20))}"
+                return json.dumps({"find": find, "replace": replace}, ensure_ascii=False)
+        return self._words(rng, source, tokens)
+
+    def _plan(
+        self,
+        model: str,
+        system_prompt: str,
+        user_prompt: str,
+        context: str,
+        config: ModelConfig
+    ) -> Tuple[str, float, float]:
+        """Returns the reply, seconds to first token and seconds per output token of a request."""
+        key = cassette_key(self.provider, model, system_prompt, user_prompt, context, config)
+        rng = random.Random(f"{self.seed}:{key}")
+        profile = self.profiles.get(model, self.profiles["default"])
+        median, sigma = profile["first_token_seconds"]
+        first_token = median * math.exp(rng.gauss(0, sigma))
+        mean, sd = profile["tokens_per_second"]
+        tokens_per_second = max(rng.gauss(mean, sd), 5.0)
+        mean, sd = profile["output_tokens"]
+        tokens = min(int(max(rng.gauss(mean, sd), 10)), config.max_tokens)
+        text = self._reply(rng, user_prompt, context, tokens)
+        for stop in config.stop:
+            text = text.split(stop, 1)[0]
+        return text, first_token * self.time_scale, self.time_scale / tokens_per_second
+
+    @staticmethod
+    def _usage(response: LLMResponse, text: str, system_prompt: str, user_prompt: str, context: str) -> None:
+        response.input_tokens = count_tokens(system_prompt + context + user_prompt)
+        response.output_tokens = count_tokens(text)
+
+    def generate(
+        self,
+        model: str,
+        system_prompt: str,
+        user_prompt: str,
+        context: str,
+        config: ModelConfig
+    ) -> LLMResponse:
+        """Returns the simulated reply after the time the whole response would take."""
+        text, first_token, per_token = self._plan(model, system_prompt, user_prompt, context, config)
+        _sleep(first_token + count_tokens(text) * per_token)
+        response = LLMResponse(text=text, provider=self.provider, model=model)
+        self._usage(response, text, system_prompt, user_prompt, context)
+        return response
+
+    def stream(
+        self,
+        model: str,
+        system_prompt: str,
+        user_prompt: str,
+        context: str,
+        response: LLMResponse,
+        cancel: Optional[CancelToken],
+        config: ModelConfig
+    ) -> Iterator[str]:
+        """Yields the simulated reply word by word at the sampled speed."""
+        text, first_token, per_token = self._plan(model, system_prompt, user_prompt, context, config)
+        _sleep(first_token, cancel)
+        for match in re.finditer(r"\S+\s*", text):
+            _sleep(max(count_tokens(match.group(0)), 1) * per_token, cancel)
+            yield match.group(0)
+        self._usage(response, text, system_prompt, user_prompt, context)
+
+
+class Cassette:
+    """
+    JSON Lines file of recorded LLM calls.
+
+    Each line holds a request's cassette key, the reply and its usage, the
+    call's duration and, for streamed calls, every delta with its offset from
+    the start of the call. A request recorded again replaces the earlier
+    recording on the next load.
+    """
+
+    def __init__(self, path: str = LLM_CASSETTE_PATH):
+        self.path = Path(path)
+        self._entries: Optional[Dict[str, Dict]] = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, Dict]:
+        """Reads the file on first use; the caller holds the lock."""
+        if self._entries is None:
+            self._entries = {}
+            if self.path.exists():
+                with open(self.path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            entry = json.loads(line)
+                            self._entries[entry["key"]] = entry
+                        except (ValueError, KeyError, TypeError):
+                            continue
+        return self._entries
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            return self._load().get(key)
+
+    def append(self, entry: Dict) -> None:
+        """Adds a recording and appends it to the file."""
+        line = json.dumps(entry, ensure_ascii=False)
+        with self._lock:
+            self._load()[entry["key"]] = entry
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+            except OSError as e:
+                print(f"[LLM Replay] Could not write recording: {e}")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._load())
+
+
+def _entry(key: str, response: LLMResponse, seconds: float, deltas: Optional[List[List]] = None) -> Dict:
+    return {
+        "key": key,
+        "provider": response.provider,
+        "model": response.model,
+        "recorded_at": time.time(),
+        "text": response.text,
+        "input_tokens": response.input_tokens,
+        "cached_input_tokens": response.cached_input_tokens,
+        "cache_write_tokens": response.cache_write_tokens,
+        "output_tokens": response.output_tokens,
+        "seconds": round(seconds, 4),
+        "deltas": deltas
+    }
+
+
+def _fill_usage(response: LLMResponse, entry: Dict) -> None:
+    response.input_tokens = entry["input_tokens"]
+    response.cached_input_tokens = entry["cached_input_tokens"]
+    response.cache_write_tokens = entry["cache_write_tokens"]
+    response.output_tokens = entry["output_tokens"]
+
+
+class RecordingProvider:
+    """Calls a live provider backend and saves every completed call to the cassette."""
+
+    def __init__(self, provider: str, backend: ProviderBackend, cassette: Cassette):
+        self.provider = provider
+        self.backend = backend
+        self.cassette = cassette
+
+    def generate(self, model, system_prompt, user_prompt, context, config) -> LLMResponse:
+        start = time.perf_counter()
+        response = self.backend.generate(model, system_prompt, user_prompt, context, config)
+        key = cassette_key(self.provider, model, system_prompt, user_prompt, context, config)
+        self.cassette.append(_entry(key, response, time.perf_counter() - start))
+        return response
+
+    def stream(self, model, system_prompt, user_prompt, context, response, cancel, config) -> Iterator[str]:
+        start = time.perf_counter()
+        deltas = []
+        stream = self.backend.stream(model, system_prompt, user_prompt, context, response, cancel, config)
+        try:
+            for delta in stream:
+                deltas.append([round(time.perf_counter() - start, 4), delta])
+                yield delta
+        finally:
+            stream.close()
+        # Streams that were closed early or failed are not recorded
+        key = cassette_key(self.provider, model, system_prompt, user_prompt, context, config)
+        recorded = LLMResponse(text="".join(delta for _, delta in deltas).strip(), provider=self.provider, model=model)
+        recorded.input_tokens = response.input_tokens
+        recorded.cached_input_tokens = response.cached_input_tokens
+        recorded.cache_write_tokens = response.cache_write_tokens
+        recorded.output_tokens = response.output_tokens
+        self.cassette.append(_entry(key, recorded, time.perf_counter() - start, deltas))
+
+
+class ReplayProvider:
+    """
+    Answers from the cassette with the recorded timing.
+
+    Streamed recordings are replayed delta by delta at their recorded offsets;
+    a call recorded without streaming is streamed as one delta at the end.
+    Requests that were never recorded go to the miss backend, or raise
+    ReplayMiss without one.
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        cassette: Cassette,
+        miss_backend: Optional[ProviderBackend] = None,
+        time_scale: float = LLM_SIMULATION_TIME_SCALE
+    ):
+        self.provider = provider
+        self.cassette = cassette
+        self.miss_backend = miss_backend
+        self.time_scale = time_scale
+
+    def _lookup(self, model, system_prompt, user_prompt, context, config) -> Optional[Dict]:
+        entry = self.cassette.get(cassette_key(self.provider, model, system_prompt, user_prompt, context, config))
+        if entry is None and self.miss_backend is None:
+            raise ReplayMiss(f"No recording of this {self.provider} {model} request in {self.cassette.path}")
+        return entry
+
+    def generate(self, model, system_prompt, user_prompt, context, config) -> LLMResponse:
+        entry = self._lookup(model, system_prompt, user_prompt, context, config)
+        if entry is None:
+            return self.miss_backend.generate(model, system_prompt, user_prompt, context, config)
+        _sleep(entry["seconds"] * self.time_scale)
+        response = LLMResponse(text=entry["text"], provider=self.provider, model=model)
+        _fill_usage(response, entry)
+        return response
+
+    def stream(self, model, system_prompt, user_prompt, context, response, cancel, config) -> Iterator[str]:
+        entry = self._lookup(model, system_prompt, user_prompt, context, config)
+        if entry is None:
+            yield from self.miss_backend.stream(model, system_prompt, user_prompt, context, response, cancel, config)
+            return
+        start = time.perf_counter()
+        deltas = entry["deltas"] or [[entry["seconds"], entry["text"]]]
+        for offset, delta in deltas:
+            _sleep(offset * self.time_scale - (time.perf_counter() - start), cancel)
+            yield delta
+        _fill_usage(response, entry)
+
+
+_cassette: Optional[Cassette] = None
+_cassette_lock = threading.Lock()
+
+
+def get_cassette() -> Cassette:
+    """Returns the process-wide cassette so recordings from every session go to one file."""
+    global _cassette
+    with _cassette_lock:
+        if _cassette is None:
+            _cassette = Cassette()
+        return _cassette
+
+
+def apply_provider_mode(providers: Dict[str, ProviderBackend], mode: str) -> Dict[str, ProviderBackend]:
+    """
+    Wraps or replaces the live provider backends for a provider mode.
+
+    The local stub is offline already and is left as it is.
+
+    Args:
+        providers: Live backends keyed by provider name
+        mode: One of PROVIDER_MODES
+
+    Returns:
+        Backends to use, keyed by provider name
+    """
+    if mode not in PROVIDER_MODES:
+        raise ValueError(f"Unknown LLM provider mode {mode!r}, expected one of {', '.join(PROVIDER_MODES)}")
+    if mode == "live":
+        return dict(providers)
+
+    backends = {}
+    for name, backend in providers.items():
+        if name == LOCAL_STUB_PROVIDER or backend.simulated:
+            backends[name] = backend
+            continue
+        if mode == "record":
+            recorder = RecordingProvider(name, backend, get_cassette())
+            backends[name] = ProviderBackend(recorder.generate, recorder.stream)
+            continue
+        fake = FakeProvider(name)
+        fake_backend = ProviderBackend(fake.generate, fake.stream, simulated=True)
+        if mode == "fake":
+            backends[name] = fake_backend
+        else:
+            replay = ReplayProvider(name, get_cassette(), fake_backend if LLM_REPLAY_MISS == "fake" else None)
+            backends[name] = ProviderBackend(replay.generate, replay.stream, simulated=True)
+    print(f"[LLM] Provider mode: {mode}")
+    return backends
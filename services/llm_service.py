@@ -1,22 +1,125 @@
+import copy
 import os
-import openai
-import anthropic
-from dataclasses import dataclass
-from typing import Dict, List, Optional
-import google.generativeai as genai
+import queue
+import sys
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from config.settings import (
+    LLM_PROVIDER_CONCURRENCY,
+    LLM_DEFAULT_CONCURRENCY,
+    LLM_CACHE_ENABLED,
+    PROMPT_CACHING_ENABLED,
+    LOCAL_STUB_ENABLED,
+    LOCAL_STUB_PROVIDER,
+    BATCH_POLL_INTERVAL,
+    BATCH_TIMEOUT,
+    HEDGE_ENABLED,
+    HEDGE_PERCENTILE,
+    HEDGE_MIN_DELAY,
+    HEDGE_ALTERNATES,
+    LLM_RETRY_STATUSES,
+    MODEL_ROUTING_ENABLED,
+    LLM_PROVIDER_MODE
+)
+from services import batch_service
+from services.batch_service import BatchJob, BatchRequest, BatchResult
+from services.fetch_policy import parse_retry_after
+from services.llm_cache import get_llm_cache, request_key
+from services.llm_limiter import get_llm_limiter
+from services.llm_providers import ProviderBackend, apply_provider_mode
+from services.latency_tracker import get_latency_tracker
+from services.llm_types import CancelToken, GenerationCancelled, LLMResponse, ModelConfig
+from services.stub_provider import get_stub_provider
+from services.telemetry import CallRecord, get_telemetry_log
+
+# Caps concurrent calls per provider for the whole process
+_provider_slots: Dict[str, threading.BoundedSemaphore] = {}
+_provider_slots_lock = threading.Lock()
+
+
+def provider_slot(provider: str) -> threading.BoundedSemaphore:
+    """Returns the semaphore limiting concurrent calls to a provider."""
+    with _provider_slots_lock:
+        if provider not in _provider_slots:
+            limit = LLM_PROVIDER_CONCURRENCY.get(provider, LLM_DEFAULT_CONCURRENCY)
+            _provider_slots[provider] = threading.BoundedSemaphore(limit)
+        return _provider_slots[provider]
+
+
+# SDK clients are created on first use and shared by every LLMService copy.
+# The SDKs are imported there too, so sessions that never call a provider
+# don't pay for importing it.
+_clients: Dict[str, Any] = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(provider: str):
+    """Returns the process-wide SDK client of a provider, creating it on first use."""
+    with _clients_lock:
+        if provider not in _clients:
+            if provider == "OpenAI":
+                import openai
+                _clients[provider] = openai.Client(api_key=os.getenv("OPENAI_API_KEY"))
+            elif provider == "Anthropic":
+                import anthropic
+                _clients[provider] = anthropic.Client(api_key=os.getenv("ANTHROPIC_API_KEY"))
+            else:
+                raise ValueError(f"No SDK client for provider {provider}")
+        return _clients[provider]
 
 
 @dataclass
-class ModelConfig:
-    display_name: str
-    max_tokens: int = 500
-    temperature: float = 0.7
+class ModelPrice:
+    """List prices in USD per million tokens."""
+    input: float
+    output: float
+    cached_input: float  # prompt tokens read from the provider's prompt cache
+    cache_write: float  # prompt tokens written to the provider's prompt cache
+
+    def cost(self, response: LLMResponse) -> float:
+        """Returns the estimated cost of a call in USD."""
+        uncached = max(response.uncached_input_tokens - response.cache_write_tokens, 0)
+        return (
+            uncached * self.input
+            + response.cached_input_tokens * self.cached_input
+            + response.cache_write_tokens * self.cache_write
+            + response.output_tokens * self.output
+        ) / 1_000_000
+
+
+# Price table for the models in LLMService.MODELS; models missing here are costed at zero
+MODEL_PRICES: Dict[str, ModelPrice] = {
+    "gpt-4o": ModelPrice(input=2.50, output=10.00, cached_input=1.25, cache_write=2.50),
+    "gpt-4o-mini": ModelPrice(input=0.15, output=0.60, cached_input=0.075, cache_write=0.15),
+    "claude-opus-4-20250514": ModelPrice(input=15.00, output=75.00, cached_input=1.50, cache_write=18.75),
+    "claude-sonnet-4-20250514": ModelPrice(input=3.00, output=15.00, cached_input=0.30, cache_write=3.75),
+    "claude-3-7-sonnet-latest": ModelPrice(input=3.00, output=15.00, cached_input=0.30, cache_write=3.75),
+    "claude-3-haiku-20240307": ModelPrice(input=0.25, output=1.25, cached_input=0.03, cache_write=0.30),
+    "claude-3-5-haiku-latest": ModelPrice(input=0.80, output=4.00, cached_input=0.08, cache_write=1.00),
+}
+
+
+def estimate_cost(response: LLMResponse) -> float:
+    """Returns the estimated cost of a call in USD; responses from the local response cache are free."""
+    price = MODEL_PRICES.get(response.model)
+    if price is None or response.from_cache:
+        return 0.0
+    return price.cost(response)
 
 class LLMService:
-    def __init__(self):
-        # Initialize API clients
-        self.openai_client = openai.Client(api_key=os.getenv("OPENAI_API_KEY"))
-        self.anthropic_client = anthropic.Client(api_key=os.getenv("ANTHROPIC_API_KEY"))
+    def __init__(self, use_cache: bool = LLM_CACHE_ENABLED, provider_mode: Optional[str] = None):
+        # Response cache switches: use_cache reuses identical earlier responses,
+        # force_refresh skips the lookup but still stores the new response
+        self.use_cache = use_cache
+        self.force_refresh = False
+        # Newsletter the calls are made for, recorded with each call's telemetry
+        self.issue = ""
+        # Section routing (services.model_router): route_models lets sections use
+        # their policy's model tier, explicit_model marks a model the user picked
+        self.route_models = MODEL_ROUTING_ENABLED
+        self.explicit_model = False
         
         # Define available models and their configurations
         self.MODELS = {
@@ -32,6 +135,60 @@ class LLMService:
                 "claude-3-5-haiku-latest": ModelConfig("Claude 3 Haiku")
             }
         }
+        if LOCAL_STUB_ENABLED:
+            self.MODELS[LOCAL_STUB_PROVIDER] = {
+                "stub-echo": ModelConfig("Stub (offline echo)")
+            }
+        
+        # Backend of each provider; the provider mode can swap the live ones for
+        # recorded or simulated stand-ins (see services.llm_providers)
+        self.provider_mode = provider_mode or os.getenv("LLM_PROVIDER_MODE", LLM_PROVIDER_MODE)
+        providers = {
+            "OpenAI": ProviderBackend(self._generate_openai, self._stream_openai),
+            "Anthropic": ProviderBackend(self._generate_anthropic, self._stream_anthropic)
+        }
+        if LOCAL_STUB_ENABLED:
+            providers[LOCAL_STUB_PROVIDER] = ProviderBackend(self._generate_stub, self._stream_stub, simulated=True)
+        self.providers = apply_provider_mode(providers, self.provider_mode)
+
+    @property
+    def openai_client(self):
+        return get_client("OpenAI")
+
+    @property
+    def anthropic_client(self):
+        return get_client("Anthropic")
+
+    def with_options(self, **options) -> "LLMService":
+        """
+        Returns a copy that shares the models and SDK clients, with the given
+        per-session settings (use_cache, force_refresh, issue, route_models,
+        explicit_model) replaced.
+        
+        Each Streamlit session works on its own copy of the process-wide
+        service so its sidebar choices don't leak into other sessions.
+        """
+        service = copy.copy(self)
+        for name, value in options.items():
+            if not hasattr(service, name):
+                raise AttributeError(f"Unknown LLMService option: {name}")
+            setattr(service, name, value)
+        return service
+
+    def register_provider(self, name: str, backend: ProviderBackend, models: Dict[str, ModelConfig]) -> None:
+        """
+        Adds a provider, or replaces the backend and models of an existing one.
+        
+        The registry is shared with every with_options copy, so a provider
+        registered on any copy is available to all sessions.
+        
+        Args:
+            name: Provider name shown in the sidebar and used in calls
+            backend: How to call the provider
+            models: The provider's models keyed by model identifier
+        """
+        self.providers[name] = backend
+        self.MODELS[name] = models
 
     def get_providers(self) -> List[str]:
         """Returns list of available providers."""
@@ -52,46 +209,845 @@ class LLMService:
             "NewsAPI": bool(os.getenv("NEWSAPI_API_KEY"))
         }
 
+    @staticmethod
+    def _full_user_prompt(context: str, user_prompt: str) -> str:
+        """Returns the user prompt as sent: the stable context first, so it forms a cacheable prefix."""
+        return f"{context}\n\n{user_prompt}" if context else user_prompt
+
+    def _config(self, provider: str, model: str, config: Optional[ModelConfig] = None) -> ModelConfig:
+        """Returns the settings of a request: the per-call config if given, otherwise the model's own."""
+        return config or self.MODELS.get(provider, {}).get(model) or ModelConfig(model)
+
+    def _cache_key(
+        self,
+        provider: str,
+        model: str,
+        system_prompt: str,
+        user_prompt: str,
+        config: Optional[ModelConfig] = None
+    ) -> str:
+        """Returns the response cache key for a request, including its sampling settings."""
+        config = self._config(provider, model, config)
+        return request_key(
+            provider, model, system_prompt, user_prompt, config.temperature, config.max_tokens, config.stop
+        )
+
+    def _simulated(self, provider: str) -> bool:
+        """True if the provider's backend answers without calling the provider."""
+        backend = self.providers.get(provider)
+        return bool(backend and backend.simulated)
+
+    def _cached_response(self, key: str, provider: str) -> Optional[str]:
+        """
+        Returns a cached response when caching is on and not bypassed.
+        
+        Simulated providers neither read nor write the response cache, which
+        is keyed like live calls; otherwise a later live session could be
+        served fake text.
+        """
+        if not self.use_cache or self.force_refresh or self._simulated(provider):
+            return None
+        entry = get_llm_cache().get(key)
+        if entry:
+            print(f"[LLM Cache] Hit for {entry.provider} {entry.model} (saved {entry.latency:.2f}s)")
+            return entry.text
+        return None
+
+    @staticmethod
+    def _log_usage(response: LLMResponse) -> None:
+        print(
+            f"[LLM Usage] {response.provider} {response.model}: {response.input_tokens} input tokens "
+            f"({response.cached_input_tokens} cached, {response.cache_write_tokens} written to cache), "
+            f"{response.output_tokens} output tokens"
+        )
+
+    def _record_call(
+        self,
+        provider: str,
+        model: str,
+        started: float,
+        response: Optional[LLMResponse] = None,
+        first_token_seconds: Optional[float] = None,
+        error: str = ""
+    ) -> None:
+        """Appends the latency, usage and cost of a call to the telemetry log; simulated calls are not logged."""
+        if self._simulated(response.provider if response else provider):
+            return
+        record = CallRecord(
+            timestamp=time.time(),
+            issue=self.issue,
+            provider=response.provider if response else provider,
+            model=response.model if response else model,
+            wall_seconds=round(time.perf_counter() - started, 3),
+            first_token_seconds=round(first_token_seconds, 3) if first_token_seconds is not None else None,
+            error=error
+        )
+        if response:
+            record.input_tokens = response.input_tokens
+            record.cached_input_tokens = response.cached_input_tokens
+            record.cache_write_tokens = response.cache_write_tokens
+            record.output_tokens = response.output_tokens
+            record.cost = round(estimate_cost(response), 6)
+            record.from_cache = response.from_cache
+            record.hedged = response.hedged
+            record.queue_seconds = round(response.queue_seconds, 3)
+        get_telemetry_log().append(record)
+
+    def generate(
+        self,
+        provider: str,
+        model: str,
+        system_prompt: str,
+        user_prompt: str,
+        context: str = "",
+        config: Optional[ModelConfig] = None
+    ) -> Optional[LLMResponse]:
+        """
+        Generates content and returns it with its token accounting.
+        
+        The system prompt and context are sent as a stable prefix ahead of the
+        user prompt and marked for provider-side prompt caching where the API
+        supports it.
+        
+        Args:
+            provider: LLM provider name
+            model: Model identifier
+            system_prompt: System prompt
+            user_prompt: Request-specific part of the user message
+            context: Stable part of the user message (e.g. article text), sent first
+            config: Settings for this call (max_tokens, stop, temperature) instead of the model's defaults
+            
+        Returns:
+            LLMResponse, or None for an unknown provider
+        """
+        if self._hedge_plan(provider, model):
+            # Hedging needs to watch for the first token, so collect a stream instead
+            completed = []
+            for _ in self.stream_content(
+                provider, model, system_prompt, user_prompt, context, on_complete=completed.append, config=config
+            ):
+                pass
+            return completed[0] if completed else None
+        
+        start = time.perf_counter()
+        key = self._cache_key(provider, model, system_prompt, self._full_user_prompt(context, user_prompt), config)
+        cached = self._cached_response(key, provider)
+        if cached is not None:
+            response = LLMResponse(text=cached, provider=provider, model=model, from_cache=True)
+            self._record_call(provider, model, start, response)
+            return response
+        
+        if provider not in self.MODELS:
+            return None
+        
+        try:
+            response = self._send(provider, model, system_prompt, user_prompt, context, config)
+        except Exception as e:
+            self._record_call(provider, model, start, error=str(e))
+            raise Exception(f"Error generating content with {provider} {model}: {e}")
+        
+        response.simulated = self._simulated(provider)
+        self._log_usage(response)
+        self._record_call(provider, model, start, response)
+        if self.use_cache and response.text and not response.simulated:
+            get_llm_cache().put(key, response.text, provider, model, time.perf_counter() - start)
+        return response
+
+    def _request_tokens(
+        self,
+        provider: str,
+        model: str,
+        system_prompt: str,
+        user_prompt: str,
+        context: str,
+        config: Optional[ModelConfig] = None
+    ) -> int:
+        """Estimates a request's tokens for the rate limiter: the prompt at ~4 characters per token plus the output cap."""
+        prompt_chars = len(system_prompt) + len(user_prompt) + len(context)
+        return prompt_chars // 4 + self._config(provider, model, config).max_tokens
+
+    @staticmethod
+    def _used_tokens(response: LLMResponse, reserved: int) -> int:
+        """Returns the tokens a call used, or the reservation if the provider reported no usage."""
+        used = response.input_tokens + response.output_tokens
+        return used or reserved
+
+    def _retry_delay(self, provider: str, model: str, attempt: int, error: Exception) -> Optional[float]:
+        """
+        Returns how long to wait before retrying a failed call, or None if it
+        should not be retried.
+        
+        Connection errors, timeouts and LLM_RETRY_STATUSES responses are
+        retried; the provider's Retry-After (or retry-after-ms) is honoured.
+        """
+        # An SDK that raised the error is already imported; don't import the other one just to check
+        connection_errors = tuple(
+            sdk.APIConnectionError for sdk in (sys.modules.get("openai"), sys.modules.get("anthropic")) if sdk
+        )
+        status = getattr(error, "status_code", None)
+        if status not in LLM_RETRY_STATUSES and not isinstance(error, connection_errors):
+            return None
+        headers = getattr(getattr(error, "response", None), "headers", None) or {}
+        retry_after = None
+        if headers.get("retry-after-ms"):
+            try:
+                retry_after = float(headers["retry-after-ms"]) / 1000
+            except ValueError:
+                pass
+        if retry_after is None:
+            retry_after = parse_retry_after(headers.get("retry-after"))
+        delay = get_llm_limiter().retry_delay(provider, model, attempt, retry_after, rate_limited=status == 429)
+        if delay is not None:
+            print(f"[LLM Limiter] {provider} {model} call failed ({error}); retry {attempt} in {delay:.1f}s")
+        return delay
+
+    def _send(
+        self,
+        provider: str,
+        model: str,
+        system_prompt: str,
+        user_prompt: str,
+        context: str,
+        config: Optional[ModelConfig] = None
+    ) -> LLMResponse:
+        """Sends a blocking request within the model's rate limits, retrying transient failures."""
+        limiter = get_llm_limiter()
+        config = self._config(provider, model, config)
+        reserved = self._request_tokens(provider, model, system_prompt, user_prompt, context, config)
+        waited = 0.0
+        attempt = 0
+        while True:
+            attempt += 1
+            waited += limiter.acquire(provider, model, reserved)
+            try:
+                with provider_slot(provider):
+                    response = self.providers[provider].generate(model, system_prompt, user_prompt, context, config)
+            except Exception as e:
+                limiter.settle(provider, model, reserved, 0)
+                delay = self._retry_delay(provider, model, attempt, e)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                continue
+            limiter.settle(provider, model, reserved, self._used_tokens(response, reserved))
+            response.queue_seconds = waited
+            return response
+
     def generate_content(
         self,
         provider: str,
         model: str,
         system_prompt: str,
-        user_prompt: str
+        user_prompt: str,
+        context: str = "",
+        config: Optional[ModelConfig] = None
     ) -> Optional[str]:
         """
         Generates content using the selected provider and model.
         Returns the generated text or None if an error occurs.
         """
+        response = self.generate(provider, model, system_prompt, user_prompt, context, config)
+        return response.text if response else None
+
+    def stream_content(
+        self,
+        provider: str,
+        model: str,
+        system_prompt: str,
+        user_prompt: str,
+        context: str = "",
+        on_complete: Optional[Callable[[LLMResponse], None]] = None,
+        cancel: Optional[CancelToken] = None,
+        config: Optional[ModelConfig] = None
+    ) -> Iterator[str]:
+        """
+        Generates content like generate, yielding text deltas as the
+        provider produces them. Closing the iterator early, or cancelling
+        the token, closes the underlying HTTP stream.
+        
+        A cached response is yielded as a single delta. Only streams that
+        complete are stored in the cache and passed to on_complete.
+        
+        When the model has a hedge alternate (see _hedge_plan), a duplicate
+        request is sent if no token arrives in time and the first stream to
+        produce a token wins.
+        """
+        start = time.perf_counter()
+        key = self._cache_key(provider, model, system_prompt, self._full_user_prompt(context, user_prompt), config)
+        cached = self._cached_response(key, provider)
+        if cached is not None:
+            yield cached
+            response = LLMResponse(text=cached, provider=provider, model=model, from_cache=True)
+            self._record_call(provider, model, start, response, first_token_seconds=time.perf_counter() - start)
+            if on_complete:
+                on_complete(response)
+            return
+        
+        if provider not in self.MODELS:
+            return
+        
+        response = LLMResponse(text="", provider=provider, model=model, simulated=self._simulated(provider))
+        plan = self._hedge_plan(provider, model)
+        if plan:
+            deltas = self._hedged_stream(
+                provider, model, plan, system_prompt, user_prompt, context, response, cancel, config
+            )
+        else:
+            deltas = self._provider_stream(
+                provider, model, system_prompt, user_prompt, context, response, cancel, config
+            )
+        
+        parts = []
+        first_token_seconds = None
         try:
-            if provider == "OpenAI":
-                return self._generate_openai(model, system_prompt, user_prompt)
-            elif provider == "Anthropic":
-                return self._generate_anthropic(model, system_prompt, user_prompt)
+            for delta in deltas:
+                if first_token_seconds is None:
+                    first_token_seconds = time.perf_counter() - start
+                parts.append(delta)
+                yield delta
+        except GeneratorExit:
+            self._record_call(provider, model, start, response, first_token_seconds, error="closed before completion")
+            raise
         except Exception as e:
-            raise Exception(f"Error generating content with {provider} {model}: {e}")
+            self._record_call(provider, model, start, response, first_token_seconds, error=str(e))
+            raise
+        finally:
+            deltas.close()
+        response.text = "".join(parts).strip()
+        self._log_usage(response)
+        self._record_call(provider, model, start, response, first_token_seconds)
+        if self.use_cache and response.text and not response.simulated:
+            get_llm_cache().put(key, response.text, response.provider, response.model, time.perf_counter() - start)
+        if on_complete:
+            on_complete(response)
 
-    def _generate_openai(self, model: str, system_prompt: str, user_prompt: str) -> str:
-        """Generates content using OpenAI's API."""
-        response = self.openai_client.chat.completions.create(
-            model=model,
-            messages=[
+    def _provider_stream(
+        self,
+        provider: str,
+        model: str,
+        system_prompt: str,
+        user_prompt: str,
+        context: str,
+        response: LLMResponse,
+        cancel: Optional[CancelToken] = None,
+        config: Optional[ModelConfig] = None
+    ) -> Iterator[str]:
+        """
+        Streams from a single provider within the model's rate limits and
+        records its time to first token. Failures before the first token are
+        retried like blocking calls; once text has been yielded they are raised.
+        """
+        limiter = get_llm_limiter()
+        config = self._config(provider, model, config)
+        reserved = self._request_tokens(provider, model, system_prompt, user_prompt, context, config)
+        start = time.perf_counter()
+        first_token = True
+        attempt = 0
+        while True:
+            attempt += 1
+            response.queue_seconds += limiter.acquire(provider, model, reserved)
+            try:
+                with provider_slot(provider):
+                    deltas = self.providers[provider].stream(
+                        model, system_prompt, user_prompt, context, response, cancel, config
+                    )
+                    try:
+                        for delta in deltas:
+                            if cancel and cancel.cancelled:
+                                raise GenerationCancelled(f"{provider} {model} request was cancelled")
+                            if first_token:
+                                get_latency_tracker().record(provider, model, time.perf_counter() - start)
+                                first_token = False
+                            yield delta
+                    finally:
+                        deltas.close()
+            except (GeneratorExit, GenerationCancelled):
+                limiter.settle(provider, model, reserved, self._used_tokens(response, reserved))
+                raise
+            except Exception as e:
+                limiter.settle(provider, model, reserved, response.input_tokens + response.output_tokens)
+                if cancel and cancel.cancelled:
+                    raise GenerationCancelled(f"{provider} {model} request was cancelled")
+                delay = self._retry_delay(provider, model, attempt, e) if first_token else None
+                if delay is None:
+                    raise Exception(f"Error generating content with {provider} {model}: {e}")
+                time.sleep(delay)
+                continue
+            limiter.settle(provider, model, reserved, self._used_tokens(response, reserved))
+            return
+
+    def _hedge_plan(self, provider: str, model: str) -> Optional[Tuple[str, str, float]]:
+        """
+        Decides whether a request should be hedged.
+        
+        Returns:
+            (alternate provider, alternate model, delay in seconds) when hedging
+            is enabled, the model has an available alternate and enough latency
+            has been observed to derive the delay; otherwise None
+        """
+        if not HEDGE_ENABLED or model not in HEDGE_ALTERNATES:
+            return None
+        alt_provider, alt_model = HEDGE_ALTERNATES[model]
+        if alt_model not in self.MODELS.get(alt_provider, {}) or not self.check_api_keys().get(alt_provider):
+            return None
+        threshold = get_latency_tracker().percentile(provider, model, HEDGE_PERCENTILE)
+        if threshold is None:
+            return None
+        return alt_provider, alt_model, max(threshold, HEDGE_MIN_DELAY)
+
+    def _hedged_stream(
+        self,
+        provider: str,
+        model: str,
+        plan: Tuple[str, str, float],
+        system_prompt: str,
+        user_prompt: str,
+        context: str,
+        response: LLMResponse,
+        cancel: Optional[CancelToken] = None,
+        config: Optional[ModelConfig] = None
+    ) -> Iterator[str]:
+        """
+        Streams from the primary model, sending a duplicate request to the
+        alternate if the primary produces no token within the plan's delay
+        (or fails first). The first stream to produce a token wins and the
+        other is cancelled, which closes its connection. The alternate gets
+        the same output cap and stop sequences as the primary.
+        
+        The losing request is recorded in the telemetry log on its own, with
+        the usage it reported or, if it was cut off first, an estimate of it.
+        """
+        alt_provider, alt_model, delay = plan
+        events: "queue.Queue" = queue.Queue()
+        contenders: Dict[Tuple[str, str], Tuple[CancelToken, LLMResponse]] = {}
+        # The first contender to produce output claims the win before queueing it
+        claimed: List[Tuple[str, str]] = []
+        claim_lock = threading.Lock()
+        
+        def start(contender_provider: str, contender_model: str) -> None:
+            token = CancelToken()
+            contender_response = LLMResponse(
+                text="", provider=contender_provider, model=contender_model,
+                simulated=self._simulated(contender_provider)
+            )
+            contenders[(contender_provider, contender_model)] = (token, contender_response)
+            if cancel:
+                cancel.on_cancel(token.cancel)
+            
+            contender_config = self._config(contender_provider, contender_model)
+            if config:
+                contender_config = replace(contender_config, max_tokens=config.max_tokens, stop=config.stop)
+            
+            def put(name: Tuple[str, str], kind: str, payload) -> None:
+                with claim_lock:
+                    if kind != "error" and not claimed:
+                        claimed.append(name)
+                    events.put((name, kind, payload))
+            
+            def pump():
+                name = (contender_provider, contender_model)
+                pump_started = time.perf_counter()
+                first_token_seconds = None
+                streamed_chars = 0
+                error = ""
+                deltas = self._provider_stream(
+                    contender_provider, contender_model, system_prompt, user_prompt, context,
+                    contender_response, token, contender_config
+                )
+                try:
+                    for delta in deltas:
+                        if first_token_seconds is None:
+                            first_token_seconds = time.perf_counter() - pump_started
+                        streamed_chars += len(delta)
+                        put(name, "delta", delta)
+                    put(name, "done", None)
+                except Exception as e:
+                    error = str(e)
+                    put(name, "error", e)
+                finally:
+                    deltas.close()
+                
+                # The winner is recorded by stream_content; a loser is a call of its own
+                if claimed and claimed[0] != name:
+                    if not contender_response.input_tokens:
+                        prompt_chars = len(system_prompt) + len(user_prompt) + len(context)
+                        contender_response.input_tokens = prompt_chars // 4
+                    if not contender_response.output_tokens:
+                        contender_response.output_tokens = streamed_chars // 4
+                    self._record_call(
+                        contender_provider, contender_model, pump_started, contender_response,
+                        first_token_seconds, error="lost the hedge race" if token.cancelled else error
+                    )
+            
+            threading.Thread(target=pump, name="llm-hedge", daemon=True).start()
+        
+        started = time.perf_counter()
+        start(provider, model)
+        winner = None
+        errors = []
+        try:
+            while True:
+                hedge_pending = winner is None and len(contenders) == 1
+                timeout = max(delay - (time.perf_counter() - started), 0) if hedge_pending else None
+                try:
+                    name, kind, payload = events.get(timeout=timeout)
+                except queue.Empty:
+                    print(
+                        f"[Hedging] No token from {provider} {model} after {delay:.2f}s "
+                        f"(p{HEDGE_PERCENTILE}); sending a duplicate to {alt_provider} {alt_model}"
+                    )
+                    start(alt_provider, alt_model)
+                    continue
+                
+                if winner is None:
+                    if kind == "error":
+                        errors.append(payload)
+                        if len(contenders) == 1:
+                            print(f"[Hedging] {provider} {model} failed ({payload}); trying {alt_provider} {alt_model}")
+                            start(alt_provider, alt_model)
+                        elif len(errors) == len(contenders):
+                            raise errors[0]
+                        continue
+                    winner = claimed[0]
+                    elapsed = time.perf_counter() - started
+                    if len(contenders) > 1:
+                        print(f"[Hedging] {winner[0]} {winner[1]} answered first after {elapsed:.2f}s; cancelling the other request")
+                    for other, (token, _) in contenders.items():
+                        if other != winner:
+                            token.cancel()
+                
+                if name != winner:
+                    continue
+                if kind == "delta":
+                    yield payload
+                elif kind == "done":
+                    break
+                else:
+                    raise payload
+        finally:
+            for token, _ in contenders.values():
+                token.cancel()
+        
+        winner_response = contenders[winner][1]
+        response.provider = winner_response.provider
+        response.model = winner_response.model
+        response.input_tokens = winner_response.input_tokens
+        response.cached_input_tokens = winner_response.cached_input_tokens
+        response.cache_write_tokens = winner_response.cache_write_tokens
+        response.output_tokens = winner_response.output_tokens
+        response.simulated = winner_response.simulated
+        response.hedged = len(contenders) > 1
+
+    def submit_batch(self, provider: str, requests: List[BatchRequest]) -> BatchJob:
+        """
+        Submits requests through the provider's batch API, or the local
+        stand-in for providers without one. Batched calls bypass the
+        response cache and the interactive concurrency limits.
+        """
+        return batch_service.submit_batch(self, provider, requests)
+
+    def poll_batch(self, job: BatchJob) -> BatchJob:
+        """Refreshes the status of a submitted batch."""
+        return batch_service.poll_batch(self, job)
+
+    def get_batch_results(self, job: BatchJob) -> Dict[str, BatchResult]:
+        """Returns the results of a finished batch keyed by custom_id."""
+        return batch_service.get_batch_results(self, job)
+
+    def run_batch(
+        self,
+        requests: Dict[str, List[BatchRequest]],
+        poll_interval: float = BATCH_POLL_INTERVAL,
+        timeout: float = BATCH_TIMEOUT
+    ) -> Dict[str, BatchResult]:
+        """
+        Submits one batch per provider and waits for all of them to finish.
+        
+        Args:
+            requests: Requests to run, keyed by provider name
+            poll_interval: Seconds between status checks
+            timeout: Seconds to wait before collecting whatever has finished
+            
+        Returns:
+            BatchResult for every request, keyed by custom_id
+        """
+        jobs = [self.submit_batch(provider, batch) for provider, batch in requests.items() if batch]
+        deadline = time.monotonic() + timeout
+        pending = list(jobs)
+        while pending:
+            for job in list(pending):
+                self.poll_batch(job)
+                print(f"[Batch] {job.provider} batch {job.batch_id}: {job.status}")
+                if job.done:
+                    pending.remove(job)
+            if not pending:
+                break
+            if time.monotonic() >= deadline:
+                print(f"[Batch] Timed out waiting for {len(pending)} batches")
+                break
+            time.sleep(min(poll_interval, max(deadline - time.monotonic(), 0)))
+        
+        results = {}
+        for job in jobs:
+            if job.done:
+                results.update(self.get_batch_results(job))
+            else:
+                results.update({
+                    custom_id: BatchResult(custom_id, error=f"Batch still {job.status} after {timeout}s")
+                    for custom_id in job.custom_ids
+                })
+        return results
+
+    def _openai_request(
+        self,
+        model: str,
+        system_prompt: str,
+        user_prompt: str,
+        context: str,
+        config: Optional[ModelConfig] = None
+    ) -> Dict:
+        """
+        Builds the chat completion arguments. OpenAI caches long prompt
+        prefixes automatically, so the stable parts just have to come first.
+        """
+        config = self._config("OpenAI", model, config)
+        request = {
+            "model": model,
+            "messages": [
                 {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
+                {"role": "user", "content": self._full_user_prompt(context, user_prompt)}
             ],
-            temperature=self.MODELS["OpenAI"][model].temperature,
-            max_tokens=self.MODELS["OpenAI"][model].max_tokens
+            "temperature": config.temperature,
+            "max_tokens": config.max_tokens
+        }
+        if config.stop:
+            request["stop"] = config.stop[:4]  # the API accepts at most four
+        return request
+
+    @staticmethod
+    def _read_openai_usage(usage, response: LLMResponse) -> None:
+        if not usage:
+            return
+        response.input_tokens = usage.prompt_tokens or 0
+        response.output_tokens = usage.completion_tokens or 0
+        details = getattr(usage, "prompt_tokens_details", None)
+        response.cached_input_tokens = (getattr(details, "cached_tokens", 0) or 0) if details else 0
+
+    def _generate_openai(
+        self,
+        model: str,
+        system_prompt: str,
+        user_prompt: str,
+        context: str = "",
+        config: Optional[ModelConfig] = None
+    ) -> LLMResponse:
+        """Generates content using OpenAI's API."""
+        completion = self.openai_client.with_options(max_retries=0).chat.completions.create(
+            **self._openai_request(model, system_prompt, user_prompt, context, config)
         )
-        return response.choices[0].message.content.strip()
+        response = LLMResponse(text=completion.choices[0].message.content.strip(), provider="OpenAI", model=model)
+        self._read_openai_usage(completion.usage, response)
+        return response
 
-    def _generate_anthropic(self, model: str, system_prompt: str, user_prompt: str) -> str:
-        """Generates content using Anthropic's API."""
-        response = self.anthropic_client.messages.create(
-            model=model,
-            max_tokens=self.MODELS["Anthropic"][model].max_tokens,
-            system=system_prompt,
-            messages=[
-                {"role": "user", "content": user_prompt}
+    def _anthropic_request(
+        self,
+        model: str,
+        system_prompt: str,
+        user_prompt: str,
+        context: str,
+        config: Optional[ModelConfig] = None
+    ) -> Dict:
+        """
+        Builds the messages arguments, marking the system prompt and the
+        context with cache_control breakpoints when prompt caching is enabled.
+        """
+        config = self._config("Anthropic", model, config)
+        cache_control = {"cache_control": {"type": "ephemeral"}} if PROMPT_CACHING_ENABLED else {}
+        if context:
+            content = [
+                {"type": "text", "text": context, **cache_control},
+                {"type": "text", "text": user_prompt}
             ]
+        else:
+            content = user_prompt
+        request = {
+            "model": model,
+            "max_tokens": config.max_tokens,
+            "system": [{"type": "text", "text": system_prompt, **cache_control}],
+            "messages": [
+                {"role": "user", "content": content}
+            ]
+        }
+        if config.stop:
+            request["stop_sequences"] = config.stop
+        return request
+
+    @staticmethod
+    def _read_anthropic_usage(usage, response: LLMResponse) -> None:
+        if not usage:
+            return
+        cache_read = getattr(usage, "cache_read_input_tokens", 0) or 0
+        cache_write = getattr(usage, "cache_creation_input_tokens", 0) or 0
+        # input_tokens only counts the tokens after the last cache breakpoint
+        response.input_tokens = (usage.input_tokens or 0) + cache_read + cache_write
+        response.cached_input_tokens = cache_read
+        response.cache_write_tokens = cache_write
+        response.output_tokens = usage.output_tokens or 0
+
+    def _generate_anthropic(
+        self,
+        model: str,
+        system_prompt: str,
+        user_prompt: str,
+        context: str = "",
+        config: Optional[ModelConfig] = None
+    ) -> LLMResponse:
+        """Generates content using Anthropic's API."""
+        message = self.anthropic_client.with_options(max_retries=0).messages.create(
+            **self._anthropic_request(model, system_prompt, user_prompt, context, config)
+        )
+        response = LLMResponse(text=message.content[0].text.strip(), provider="Anthropic", model=model)
+        self._read_anthropic_usage(message.usage, response)
+        return response
+
+    def _generate_stub(
+        self,
+        model: str,
+        system_prompt: str,
+        user_prompt: str,
+        context: str = "",
+        config: Optional[ModelConfig] = None
+    ) -> LLMResponse:
+        """Generates a deterministic offline response, cut at the first stop sequence like the real APIs."""
+        config = self._config(LOCAL_STUB_PROVIDER, model, config)
+        response = get_stub_provider().complete(
+            model,
+            system_prompt,
+            user_prompt,
+            context=context,
+            max_tokens=config.max_tokens,
+            cache_prefix=PROMPT_CACHING_ENABLED
         )
-        return response.content[0].text.strip()
\ No newline at end of file
+        for stop in config.stop:
+            response.text = response.text.split(stop, 1)[0]
+        return response
+
+    @staticmethod
+    def _open_stream(open_stream: Callable[[], Any], close: Callable[[Any], None], cancel: Optional[CancelToken]) -> Any:
+        """
+        Sends a streaming request, returning once the response headers arrive
+        or the token is cancelled, whichever is first.
+        
+        The SDKs block until the headers arrive, which for a busy model can
+        take as long as the first token. With a cancel token the request is
+        sent from a helper thread, so a cancelled caller returns (and frees
+        its provider slot) at once; the stream is closed as soon as it opens.
+        
+        Raises:
+            GenerationCancelled: If the token was cancelled first
+        """
+        if cancel is None:
+            return open_stream()
+        
+        opened: Dict[str, Any] = {}
+        finished = threading.Event()
+        
+        def send():
+            try:
+                opened["stream"] = open_stream()
+            except Exception as e:
+                opened["error"] = e
+            finished.set()
+            if "stream" in opened:
+                # Runs at once if the caller has already given up
+                cancel.on_cancel(lambda: close(opened["stream"]))
+        
+        threading.Thread(target=send, name="llm-open-stream", daemon=True).start()
+        cancel.on_cancel(finished.set)
+        finished.wait()
+        if cancel.cancelled:
+            raise GenerationCancelled("Request was cancelled before the response started")
+        if "error" in opened:
+            raise opened["error"]
+        return opened["stream"]
+
+    def _stream_openai(
+        self,
+        model: str,
+        system_prompt: str,
+        user_prompt: str,
+        context: str,
+        response: LLMResponse,
+        cancel: Optional[CancelToken] = None,
+        config: Optional[ModelConfig] = None
+    ) -> Iterator[str]:
+        """Streams content deltas from OpenAI's API, filling in the usage of response."""
+        request = self._openai_request(model, system_prompt, user_prompt, context, config)
+        stream = self._open_stream(
+            lambda: self.openai_client.with_options(max_retries=0).chat.completions.create(
+                **request, stream=True, stream_options={"include_usage": True}
+            ),
+            lambda opened: opened.close(),
+            cancel
+        )
+        try:
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+                if getattr(chunk, "usage", None):
+                    self._read_openai_usage(chunk.usage, response)
+        finally:
+            stream.close()
+
+    def _stream_anthropic(
+        self,
+        model: str,
+        system_prompt: str,
+        user_prompt: str,
+        context: str,
+        response: LLMResponse,
+        cancel: Optional[CancelToken] = None,
+        config: Optional[ModelConfig] = None
+    ) -> Iterator[str]:
+        """Streams content deltas from Anthropic's API, filling in the usage of response."""
+        manager = self.anthropic_client.with_options(max_retries=0).messages.stream(
+            **self._anthropic_request(model, system_prompt, user_prompt, context, config)
+        )
+        # The request is sent when the stream manager is entered
+        stream = self._open_stream(manager.__enter__, lambda opened: opened.close(), cancel)
+        try:
+            yield from stream.text_stream
+            self._read_anthropic_usage(stream.get_final_message().usage, response)
+        finally:
+            stream.close()
+
+    def _stream_stub(
+        self,
+        model: str,
+        system_prompt: str,
+        user_prompt: str,
+        context: str,
+        response: LLMResponse,
+        cancel: Optional[CancelToken] = None,
+        config: Optional[ModelConfig] = None
+    ) -> Iterator[str]:
+        """Streams a deterministic offline response, filling in the usage of response."""
+        completed = self._generate_stub(model, system_prompt, user_prompt, context, config)
+        response.input_tokens = completed.input_tokens
+        response.cached_input_tokens = completed.cached_input_tokens
+        response.cache_write_tokens = completed.cache_write_tokens
+        response.output_tokens = completed.output_tokens
+        yield from get_stub_provider().stream(completed)
+
+
+_llm_service: Optional[LLMService] = None
+_llm_service_lock = threading.Lock()
+
+
+def get_llm_service() -> LLMService:
+    """Returns the process-wide LLM service; use with_options for per-session settings."""
+    global _llm_service
+    with _llm_service_lock:
+        if _llm_service is None:
+            _llm_service = LLMService()
+        return _llm_service
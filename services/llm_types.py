@@ -0,0 +1,89 @@
+import threading
+from dataclasses import dataclass, asdict, field
+from typing import Callable, Dict, List
+
+
+@dataclass
+class ModelConfig:
+    display_name: str
+    max_tokens: int = 500
+    temperature: float = 0.7
+    stop: List[str] = field(default_factory=list)  # sequences that end the response early
+
+
+@dataclass
+class LLMResponse:
+    """Text and token accounting of a single LLM call."""
+    text: str
+    provider: str = ""
+    model: str = ""
+    input_tokens: int = 0  # all prompt tokens, cached or not
+    cached_input_tokens: int = 0  # prompt tokens read from the provider's prompt cache
+    cache_write_tokens: int = 0  # prompt tokens written to the provider's prompt cache
+    output_tokens: int = 0
+    from_cache: bool = False  # served by the local response cache without calling the provider
+    hedged: bool = False  # a duplicate request was sent to an alternate model
+    simulated: bool = False  # answered by a fake, replayed or stub backend, not by the provider
+    queue_seconds: float = 0.0  # time spent waiting for the rate limiter
+
+    @property
+    def uncached_input_tokens(self) -> int:
+        return max(self.input_tokens - self.cached_input_tokens, 0)
+
+    def usage(self) -> Dict[str, int]:
+        """Returns the token counts without the text."""
+        usage = asdict(self)
+        usage.pop("text")
+        usage["uncached_input_tokens"] = self.uncached_input_tokens
+        return usage
+
+
+class GenerationCancelled(Exception):
+    """Raised when a generation is cancelled before it completes."""
+
+
+class CancelToken:
+    """
+    Cancellation signal shared between a caller and a running generation.
+
+    Streams register a close callback with on_cancel, so cancelling from any
+    thread also closes the underlying HTTP connection.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._callbacks: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def on_cancel(self, callback: Callable[[], None]) -> None:
+        """Registers a callback to run on cancellation, or runs it now if already cancelled."""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        self._run(callback)
+
+    def wait(self, timeout: float) -> bool:
+        """Waits up to timeout seconds for cancellation; returns True if cancelled."""
+        return self._event.wait(timeout)
+
+    def cancel(self) -> None:
+        """Signals cancellation and runs the registered callbacks once."""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            self._run(callback)
+
+    @staticmethod
+    def _run(callback: Callable[[], None]) -> None:
+        try:
+            callback()
+        except Exception as e:
+            print(f"[LLM] Error while cancelling: {e}")
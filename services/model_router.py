@@ -0,0 +1,186 @@
+import threading
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional
+
+from config.settings import SECTION_ROUTING_POLICY, ROUTING_FAST_MODELS
+from services.llm_service import LLMService, ModelConfig, MODEL_PRICES
+from services.llm_types import LLMResponse
+from services.telemetry import get_telemetry_log
+
+
+@dataclass
+class Route:
+    """The model and settings chosen for one section request."""
+    section_type: str
+    provider: str
+    model: str
+    config: ModelConfig
+    baseline_model: str  # the model selected in the sidebar
+    baseline_max_tokens: int
+    reason: str
+
+
+def section_type(section_key: str) -> str:
+    """Returns the policy key of a section, e.g. "rearview" for "rearview_2"."""
+    return section_key.split("_", 1)[0]
+
+
+class ModelRouter:
+    """
+    Picks the model, output cap and stop sequences of a section request from
+    SECTION_ROUTING_POLICY.
+
+    The provider is always the one selected in the sidebar. A section whose
+    tier is "fast" is sent to the provider's fast model unless the user
+    explicitly chose a model, in which case only the section's output cap and
+    stop sequences apply. With routing turned off, every section uses the
+    selected model with its default settings.
+
+    Each routed call is compared with the unrouted baseline (the selected
+    model with its default output cap): the cost difference uses the call's
+    own token counts, and the latency difference the models' average time
+    per output token from the telemetry log.
+    """
+
+    def __init__(
+        self,
+        policy: Dict[str, Dict] = SECTION_ROUTING_POLICY,
+        fast_models: Dict[str, str] = ROUTING_FAST_MODELS
+    ):
+        self.policy = policy
+        self.fast_models = fast_models
+        self.routed_calls = 0
+        self.downgraded_calls = 0
+        self.saved_cost = 0.0
+        self.saved_seconds = 0.0
+        self._seconds_per_token: Dict[str, List[float]] = {}  # model -> [total seconds, total output tokens]
+        self._lock = threading.Lock()
+        self._load_rates()
+
+    def _load_rates(self) -> None:
+        """Seeds the per-model output speed from the calls in the telemetry log."""
+        for name, totals in get_telemetry_log().summary(by="model").items():
+            if totals["output_tokens"]:
+                model = name.split(" ")[-1]
+                self._seconds_per_token[model] = [totals["wall_seconds"], totals["output_tokens"]]
+
+    def seconds_per_output_token(self, model: str) -> Optional[float]:
+        """Returns a model's average call time per output token, or None before its first call."""
+        seconds, tokens = self._seconds_per_token.get(model, (0.0, 0))
+        return seconds / tokens if tokens else None
+
+    def route(
+        self,
+        llm_service: LLMService,
+        section_key: str,
+        provider: str,
+        model: str,
+        stories: int = 1
+    ) -> Route:
+        """
+        Chooses the model and settings for a section request.
+
+        Args:
+            llm_service: LLMService whose MODELS are routed between
+            section_key: Section key, e.g. "windshield" or "rearview_2"
+            provider: Provider selected in the sidebar
+            model: Model selected in the sidebar
+            stories: Number of stories generated by the request; the output
+                cap is scaled by it and stop sequences are dropped, since a
+                batched reply has its own format
+
+        Returns:
+            Route with the model and the ModelConfig to send
+        """
+        kind = section_type(section_key)
+        models = llm_service.MODELS.get(provider, {})
+        baseline = models.get(model) or ModelConfig(model)
+        rule = self.policy.get(kind)
+        if not rule or not llm_service.route_models or model not in models:
+            return Route(kind, provider, model, baseline, model, baseline.max_tokens, "routing off")
+
+        routed_model = model
+        reason = f"{kind} policy"
+        if rule.get("tier") == "fast":
+            fast_model = self.fast_models.get(provider)
+            if llm_service.explicit_model:
+                reason = f"{kind} policy, model chosen by user"
+            elif fast_model in models:
+                routed_model = fast_model
+                reason = f"{kind} policy, fast tier"
+
+        config = replace(
+            models[routed_model],
+            max_tokens=rule.get("max_tokens", baseline.max_tokens) * stories,
+            stop=list(rule.get("stop", [])) if stories == 1 else []
+        )
+        return Route(kind, provider, routed_model, config, model, baseline.max_tokens * stories, reason)
+
+    def record(self, route: Route, response: Optional[LLMResponse], seconds: float) -> Dict:
+        """
+        Records a routed call and returns its savings against the baseline.
+
+        Args:
+            route: Route the call was sent with
+            response: The call's response, if it succeeded
+            seconds: Wall time of the call
+
+        Returns:
+            Dict for the prompt record with the route, its cost, and the
+            estimated cost and latency of the baseline
+        """
+        stats = {
+            "section_type": route.section_type,
+            "model": route.model,
+            "baseline_model": route.baseline_model,
+            "max_tokens": route.config.max_tokens,
+            "baseline_max_tokens": route.baseline_max_tokens,
+            "stop": route.config.stop,
+            "reason": route.reason
+        }
+        if response is None or response.from_cache or response.simulated:
+            # Simulated calls would skew the measured speed of the real models
+            return stats
+
+        routed_price = MODEL_PRICES.get(route.model)
+        baseline_price = MODEL_PRICES.get(route.baseline_model)
+        with self._lock:
+            totals = self._seconds_per_token.setdefault(route.model, [0.0, 0])
+            totals[0] += seconds
+            totals[1] += response.output_tokens
+            self.routed_calls += 1
+            if route.model != route.baseline_model:
+                self.downgraded_calls += 1
+            if routed_price and baseline_price:
+                stats["cost"] = round(routed_price.cost(response), 6)
+                stats["baseline_cost"] = round(baseline_price.cost(response), 6)
+                self.saved_cost += stats["baseline_cost"] - stats["cost"]
+            routed_rate = self.seconds_per_output_token(route.model)
+            baseline_rate = self.seconds_per_output_token(route.baseline_model)
+            if route.model != route.baseline_model and routed_rate and baseline_rate:
+                stats["baseline_seconds"] = round(seconds * baseline_rate / routed_rate, 3)
+                self.saved_seconds += stats["baseline_seconds"] - seconds
+        return stats
+
+    def stats(self) -> Dict[str, float]:
+        """Returns how many calls were routed and the estimated savings so far."""
+        with self._lock:
+            return {
+                "routed_calls": self.routed_calls,
+                "downgraded_calls": self.downgraded_calls,
+                "saved_cost": round(self.saved_cost, 4),
+                "saved_seconds": round(self.saved_seconds, 1)
+            }
+
+
+_model_router: Optional[ModelRouter] = None
+_model_router_lock = threading.Lock()
+
+
+def get_model_router() -> ModelRouter:
+    """Returns the process-wide model router."""
+    global _model_router
+    with _model_router_lock:
+        if _model_router is None:
+            _model_router = ModelRouter()
+        return _model_router
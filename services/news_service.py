@@ -1,6 +1,8 @@
 # newsapi_service.py
 import os
-import requests
+import threading
+from typing import Optional
+from services.http_session import get_session
 from datetime import datetime, timedelta
 
 NEWSAPI_API_KEY = os.getenv("NEWSAPI_API_KEY")
@@ -23,6 +25,19 @@ class NewsAPIService:
             "pageSize": page_size,
             "apiKey": self.api_key
         }
-        response = requests.get(self.BASE_URL, params=params)
+        response = get_session().get(self.BASE_URL, params=params)
         response.raise_for_status()
         return response.json()["articles"]
+
+
+_news_service: Optional[NewsAPIService] = None
+_news_service_lock = threading.Lock()
+
+
+def get_news_service() -> NewsAPIService:
+    """Returns the process-wide NewsAPI service; raises ValueError if the API key is not set."""
+    global _news_service
+    with _news_service_lock:
+        if _news_service is None:
+            _news_service = NewsAPIService()
+        return _news_service
@@ -0,0 +1,130 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple
+
+from config.settings import PREFETCH_MAX_WORKERS, PREFETCH_FAILED_LIMIT
+from services.article_cache import canonicalize_url
+from services.fetch_service import FetchResult, FetchService, get_fetch_service
+
+# Readiness states reported for each URL
+PENDING = "pending"
+FETCHING = "fetching"
+READY = "ready"
+FAILED = "failed"
+
+
+class PrefetchService:
+    """
+    Fetches section URLs in the background as soon as they are entered, so the
+    article text is already in the article cache when "Gen" is pressed.
+
+    Only running and failed fetches are tracked here. Whether a URL is ready
+    is read from the article cache, so a URL whose entry expired or was
+    evicted is reported as pending and fetched again.
+    """
+
+    def __init__(
+        self,
+        fetch_service: FetchService,
+        max_workers: int = PREFETCH_MAX_WORKERS,
+        failed_limit: int = PREFETCH_FAILED_LIMIT
+    ):
+        self.fetch_service = fetch_service
+        self.failed_limit = failed_limit
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="article-prefetch")
+        # canonical URL -> FETCHING or FAILED; failures oldest first
+        self._status: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Prefetching only helps when results can be parked in the article cache."""
+        return self.fetch_service.cache is not None
+
+    def prefetch(self, urls: List[str], extract: Callable[[str], str]) -> None:
+        """
+        Starts fetching URLs that are neither ready nor already being fetched.
+        URLs that failed are skipped until they are forgotten.
+
+        Args:
+            urls: URLs to fetch
+            extract: Function turning the page HTML into article text
+        """
+        if not self.enabled:
+            return
+        for url in urls:
+            key = canonicalize_url(url)
+            if self._is_cached(url):
+                continue
+            with self._lock:
+                if key in self._status:
+                    continue
+                self._status[key] = FETCHING
+            print(f"[Prefetch] Fetching {url} in the background")
+            self._executor.submit(self._run, key, url, extract)
+
+    def _run(self, key: str, url: str, extract: Callable[[str], str]) -> None:
+        try:
+            result: FetchResult = self.fetch_service.fetch_one(url, extract)
+            failed = not result.ok
+        except Exception as e:
+            print(f"[Prefetch] Error prefetching {url}: {e}")
+            failed = True
+        with self._lock:
+            if not failed:
+                # Ready now lives in the article cache
+                self._status.pop(key, None)
+                return
+            self._status[key] = FAILED
+            self._status.move_to_end(key)
+            failures = [k for k, status in self._status.items() if status == FAILED]
+            for stale in failures[:max(len(failures) - self.failed_limit, 0)]:
+                del self._status[stale]
+
+    def forget(self, urls: List[str]) -> None:
+        """Clears the recorded state of URLs so they are fetched again."""
+        with self._lock:
+            for url in urls:
+                self._status.pop(canonicalize_url(url), None)
+
+    def status(self, url: str) -> str:
+        """
+        Returns the readiness of a URL.
+
+        Args:
+            url: URL to check
+
+        Returns:
+            One of "pending", "fetching", "ready" or "failed"
+        """
+        with self._lock:
+            status = self._status.get(canonicalize_url(url))
+        if status:
+            return status
+        if self.fetch_service.is_in_flight(url):
+            return FETCHING
+        return READY if self._is_cached(url) else PENDING
+
+    def _is_cached(self, url: str) -> bool:
+        """True if the article cache holds a fresh copy of the URL."""
+        cache = self.fetch_service.cache
+        cached = cache.get(url) if cache else None
+        return bool(cached and cache.is_fresh(cached))
+
+    def statuses(self, urls: List[str]) -> List[Tuple[str, str]]:
+        """Returns (url, readiness) pairs in input order."""
+        return [(url, self.status(url)) for url in urls]
+
+
+_prefetch_service: Optional[PrefetchService] = None
+_prefetch_service_lock = threading.Lock()
+
+
+def get_prefetch_service() -> PrefetchService:
+    """Returns the process-wide prefetch service."""
+    global _prefetch_service
+    with _prefetch_service_lock:
+        if _prefetch_service is None:
+            _prefetch_service = PrefetchService(get_fetch_service())
+        return _prefetch_service
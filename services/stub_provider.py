@@ -0,0 +1,112 @@
+import hashlib
+import re
+import threading
+from typing import Iterator, List, Optional, Set, Tuple
+
+from config.settings import PROMPT_CACHE_MIN_TOKENS, LOCAL_STUB_PROVIDER
+from services.llm_types import LLMResponse
+
+
+def count_tokens(text: str) -> int:
+    """Rough token count used by the stub (about four characters per token)."""
+    return len(text) // 4
+
+
+class StubProvider:
+    """
+    Offline stand-in for an LLM provider.
+
+    Responses are deterministic: the first words of the prompt's article
+    context (or of the user prompt), capped at max_tokens. Prompt caching is
+    simulated the way the real providers do it: a prefix of at least
+    min_cacheable_tokens that was sent before is reported as cached input.
+    """
+
+    def __init__(self, min_cacheable_tokens: int = PROMPT_CACHE_MIN_TOKENS):
+        self.min_cacheable_tokens = min_cacheable_tokens
+        self._seen_prefixes: Set[str] = set()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _prefix_hash(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def _prefix_cache(self, prefixes: List[str]) -> Tuple[int, int]:
+        """
+        Looks up prefixes in the simulated prompt cache, remembering new ones.
+
+        Returns:
+            Tuple of (tokens read from the cache, tokens written to it)
+        """
+        read = written = 0
+        with self._lock:
+            for prefix in prefixes:
+                tokens = count_tokens(prefix)
+                if tokens < self.min_cacheable_tokens:
+                    continue
+                key = self._prefix_hash(prefix)
+                if key in self._seen_prefixes:
+                    read = max(read, tokens)
+                else:
+                    self._seen_prefixes.add(key)
+                    written = max(written, tokens)
+        return read, max(written - read, 0)
+
+    def complete(
+        self,
+        model: str,
+        system_prompt: str,
+        user_prompt: str,
+        context: str = "",
+        max_tokens: int = 500,
+        cache_prefix: bool = True
+    ) -> LLMResponse:
+        """
+        Returns a deterministic response with simulated token accounting.
+
+        Args:
+            model: Model identifier, echoed in the response
+            system_prompt: System prompt
+            user_prompt: Request-specific part of the user prompt
+            context: Stable part of the user prompt sent before user_prompt
+            max_tokens: Maximum output tokens
+            cache_prefix: Whether the caller marked the prefixes as cacheable
+
+        Returns:
+            LLMResponse with the text and token counts
+        """
+        source = context or user_prompt
+        words = re.findall(r"\S+", source)
+        budget = max(1, min(max_tokens, 120))
+        text = f"[{model}] " + " ".join(words[:budget])
+
+        prompt = system_prompt + context + user_prompt
+        prefixes = [system_prompt, system_prompt + context] if context else [system_prompt]
+        read, written = self._prefix_cache(prefixes) if cache_prefix else (0, 0)
+        return LLMResponse(
+            text=text,
+            provider=LOCAL_STUB_PROVIDER,
+            model=model,
+            input_tokens=count_tokens(prompt),
+            cached_input_tokens=read,
+            cache_write_tokens=written,
+            output_tokens=count_tokens(text)
+        )
+
+    def stream(self, response: LLMResponse) -> Iterator[str]:
+        """Yields a completed response word by word."""
+        for match in re.finditer(r"\S+\s*", response.text):
+            yield match.group(0)
+
+
+_stub_provider: Optional[StubProvider] = None
+_stub_provider_lock = threading.Lock()
+
+
+def get_stub_provider() -> StubProvider:
+    """Returns the process-wide stub provider so its simulated prompt cache is shared."""
+    global _stub_provider
+    with _stub_provider_lock:
+        if _stub_provider is None:
+            _stub_provider = StubProvider()
+        return _stub_provider
@@ -0,0 +1,173 @@
+import json
+import threading
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from config.settings import TELEMETRY_ENABLED, TELEMETRY_LOG_PATH
+
+
+@dataclass
+class CallRecord:
+    """Latency, token usage and cost of a single LLM call."""
+    timestamp: float
+    issue: str  # newsletter the call was made for, "" outside the app
+    provider: str
+    model: str
+    wall_seconds: float
+    first_token_seconds: Optional[float] = None  # streamed calls only
+    queue_seconds: float = 0.0  # waiting for the rate limiter, included in wall_seconds
+    input_tokens: int = 0
+    cached_input_tokens: int = 0
+    cache_write_tokens: int = 0
+    output_tokens: int = 0
+    cost: float = 0.0  # estimated USD
+    from_cache: bool = False
+    hedged: bool = False
+    error: str = ""
+
+
+class TelemetryLog:
+    """
+    Append-only JSON Lines log of LLM calls.
+
+    Each record is written as one line, so the file can be tailed or loaded
+    into a dataframe and is never rewritten.
+
+    Summaries are kept as running totals per issue and model. Each summary
+    only parses the lines appended since the previous one, so showing them
+    on every rerun does not re-read the whole log.
+    """
+
+    def __init__(self, path: str = TELEMETRY_LOG_PATH, enabled: bool = TELEMETRY_ENABLED):
+        self.path = Path(path)
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._totals: Dict[Tuple[str, str], Dict] = {}  # (issue, "provider model") -> running totals
+        self._offset = 0  # bytes of the log already added to _totals
+
+    def append(self, record: CallRecord) -> None:
+        """Appends a record to the log."""
+        if not self.enabled:
+            return
+        line = json.dumps(asdict(record), ensure_ascii=False)
+        with self._lock:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+            except OSError as e:
+                print(f"[Telemetry] Could not write call record: {e}")
+
+    def read(self, since: float = 0.0) -> List[CallRecord]:
+        """
+        Reads the records in the log.
+
+        Args:
+            since: Only return records with a timestamp at or after this
+
+        Returns:
+            Records in the order they were written; malformed lines are skipped
+        """
+        if not self.path.exists():
+            return []
+        records = []
+        with self._lock:
+            with open(self.path, "r", encoding="utf-8") as f:
+                lines = f.readlines()
+        for line in lines:
+            try:
+                record = CallRecord(**json.loads(line))
+            except (ValueError, TypeError):
+                continue
+            if record.timestamp >= since:
+                records.append(record)
+        return records
+
+    def _add(self, record: CallRecord) -> None:
+        """Adds a record to the running totals; the caller holds the lock."""
+        total = self._totals.setdefault((record.issue, f"{record.provider} {record.model}"), {
+            "calls": 0, "errors": 0, "input_tokens": 0, "cached_input_tokens": 0, "output_tokens": 0,
+            "cost": 0.0, "wall_seconds": 0.0, "queue_seconds": 0.0, "first_token_seconds": 0.0, "first_tokens": 0
+        })
+        total["calls"] += 1
+        total["errors"] += bool(record.error)
+        total["input_tokens"] += record.input_tokens
+        total["cached_input_tokens"] += record.cached_input_tokens
+        total["output_tokens"] += record.output_tokens
+        total["cost"] += record.cost
+        total["wall_seconds"] += record.wall_seconds
+        total["queue_seconds"] += record.queue_seconds
+        if record.first_token_seconds is not None:
+            total["first_token_seconds"] += record.first_token_seconds
+            total["first_tokens"] += 1
+
+    def _refresh(self) -> None:
+        """Adds the lines appended since the last refresh to the running totals."""
+        with self._lock:
+            try:
+                size = self.path.stat().st_size
+            except OSError:
+                size = 0
+            if size < self._offset:
+                # The log was truncated or replaced; start over
+                self._totals, self._offset = {}, 0
+            if size == self._offset:
+                return
+            with open(self.path, "rb") as f:
+                f.seek(self._offset)
+                data = f.read(size - self._offset)
+            # A line still being written by another process is read next time
+            data = data[:data.rfind(b"\n") + 1]
+            self._offset += len(data)
+            for line in data.decode("utf-8", errors="replace").splitlines():
+                try:
+                    self._add(CallRecord(**json.loads(line)))
+                except (ValueError, TypeError):
+                    continue
+
+    def summary(self, by: str, issue: Optional[str] = None) -> Dict[str, Dict]:
+        """
+        Totals the log per issue or per model.
+
+        Args:
+            by: "issue" or "model"
+            issue: Only include calls made for this issue
+
+        Returns:
+            Mapping of issue or "provider model" to calls, errors, tokens,
+            cost, total wall and queue time and average time to first token
+        """
+        self._refresh()
+        with self._lock:
+            running = list(self._totals.items())
+
+        totals: Dict[str, Dict] = {}
+        for (record_issue, model), running_total in running:
+            if issue is not None and record_issue != issue:
+                continue
+            name = (record_issue or "(none)") if by == "issue" else model
+            total = totals.setdefault(name, dict.fromkeys(running_total, 0))
+            for field_name, value in running_total.items():
+                total[field_name] += value
+
+        for total in totals.values():
+            first_token_seconds, first_tokens = total.pop("first_token_seconds"), total.pop("first_tokens")
+            total["avg_first_token_seconds"] = first_token_seconds / first_tokens if first_tokens else None
+            total["cost"] = round(total["cost"], 4)
+            total["wall_seconds"] = round(total["wall_seconds"], 2)
+            total["queue_seconds"] = round(total["queue_seconds"], 2)
+        return totals
+
+
+_telemetry_log: Optional[TelemetryLog] = None
+_telemetry_log_lock = threading.Lock()
+
+
+def get_telemetry_log() -> TelemetryLog:
+    """Returns the process-wide LLM call log."""
+    global _telemetry_log
+    with _telemetry_log_lock:
+        if _telemetry_log is None:
+            _telemetry_log = TelemetryLog()
+        return _telemetry_log
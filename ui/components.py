@@ -1,5 +1,9 @@
 import streamlit as st
-from typing import Dict, Callable
+import time
+import uuid
+from typing import Any, Dict, Callable
+from config.settings import GENERATION_JOB_POLL_INTERVAL
+from services.generation_jobs import get_generation_jobs
 
 class KeyboardShortcuts:
     """Manages keyboard shortcuts for the application."""
@@ -215,14 +219,54 @@ def show_completion_status(sections, generated_sections):
     # Close the div for the progress bar
     st.markdown("</div>", unsafe_allow_html=True)
 
+PREFETCH_STATUS_ICONS = {
+    "pending": "⚪",
+    "fetching": "⏳",
+    "ready": "✅",
+    "failed": "❌"
+}
+
+def _prefetch_urls(urls_key):
+    """Start fetching a section's URLs in the background when the URL field changes."""
+    from utils.content_utils import prefetch_article_urls
+    prefetch_article_urls(st.session_state.get(urls_key, ""))
+
+def prefetch_status_indicator(urls):
+    """Show the background fetch readiness of each URL; returns True while any is still being fetched."""
+    from urllib.parse import urlparse
+    from utils.content_utils import get_prefetch_statuses
+    statuses = get_prefetch_statuses(urls)
+    if statuses:
+        st.caption("  ".join(
+            f"{PREFETCH_STATUS_ICONS.get(status, '⚪')} {urlparse(url).netloc or url}"
+            for url, status in statuses
+        ))
+    return any(status == "fetching" for _, status in statuses)
+
+@st.fragment(run_every=1)
+def _live_prefetch_status(urls):
+    # A fragment keeps polling until the next full run, so rerun the app once the fetches are done
+    if not prefetch_status_indicator(urls):
+        st.rerun()
+
 def section_input_form(section_name, urls_key, notes_key, prompt_key, default_prompt):
     """Render a standard section input form."""
     st.subheader(section_name)
     urls = st.text_input(
         "Enter article URLs (separated by ';;')",
         value=st.session_state.get(urls_key, ""),
-        key=urls_key
+        key=urls_key,
+        on_change=_prefetch_urls,
+        args=(urls_key,)
     )
+    if urls:
+        from utils.content_utils import get_prefetch_statuses
+        still_fetching = any(status == "fetching" for _, status in get_prefetch_statuses(urls))
+        # Keep refreshing the indicator while fetches are running
+        if still_fetching:
+            _live_prefetch_status(urls)
+        else:
+            prefetch_status_indicator(urls)
     notes = st.text_area(
         "Notes",
         value=st.session_state.get(notes_key, ""),
@@ -301,6 +345,58 @@ def add_theme_selector():
             from ui.styles import apply_base_styles
             apply_base_styles()
 
+def session_job_key(name: str) -> str:
+    """Returns the key of this session's background job for a section or edit."""
+    if "session_id" not in st.session_state:
+        st.session_state.session_id = uuid.uuid4().hex
+    return f"{st.session_state.session_id}:{name}"
+
+def render_generation_job(name: str, label: str, on_done: Callable[[Any], None]):
+    """
+    Display this session's background job for a section, if there is one.
+    
+    While the job runs, the text streamed so far and a Cancel button are
+    refreshed every GENERATION_JOB_POLL_INTERVAL seconds without rerunning
+    the whole app. Once it finishes, on_done is called with the job's result
+    and the app reruns to show it.
+    
+    Args:
+        name: Job name passed to session_job_key, e.g. "windshield"
+        label: Section name shown to the user
+        on_done: Stores the job's result in session state
+    """
+    notice = st.session_state.get("job_notices", {}).pop(name, None)
+    if notice:
+        st.caption(notice)
+    key = session_job_key(name)
+    if get_generation_jobs().get(key) is not None:
+        _generation_job_status(name, key, label, on_done)
+
+@st.fragment(run_every=GENERATION_JOB_POLL_INTERVAL)
+def _generation_job_status(name: str, key: str, label: str, on_done: Callable[[Any], None]):
+    jobs = get_generation_jobs()
+    job = jobs.get(key)
+    if job is None:
+        return
+    if job.active:
+        if job.text:
+            st.markdown(f"{job.text} ▌")
+        else:
+            loading_animation()
+        st.caption(f"Generating {label}... {time.time() - job.started:.0f}s")
+        if st.button("⏹ Cancel", key=f"cancel_job_{name}"):
+            jobs.cancel(key)
+            st.rerun()
+        return
+    
+    jobs.pop(key, job.job_id)
+    if job.status == "done":
+        on_done(job.result)
+    else:
+        reason = "was cancelled" if job.status == "cancelled" else f"failed: {job.error}"
+        st.session_state.setdefault("job_notices", {})[name] = f"⏹ {label} {reason}"
+    st.rerun()
+
 def display_prompt_expander(section_key: str):
     """Display the full prompt used for content generation."""
     if "section_prompts" in st.session_state and section_key in st.session_state.section_prompts:
@@ -312,6 +408,49 @@ def display_prompt_expander(section_key: str):
             st.text_area("", value=prompt_data["user_prompt"], height=300, disabled=True)
             st.markdown(f"**Provider:** {prompt_data['provider']}  \n**Model:** {prompt_data['model']}")
 
+            pipeline = prompt_data.get("pipeline", {})
+            condense = pipeline.get("condense", {})
+            if condense.get("rounds"):
+                st.markdown(
+                    f"**Source condensing:** {condense['original_chars']:,} → {condense['condensed_chars']:,} characters "
+                    f"in {condense['chunks']} chunks with {condense['model']} "
+                    f"(~{condense['input_tokens']:,} in / ~{condense['output_tokens']:,} out tokens)"
+                )
+                st.caption(" · ".join(f"{stage}: {seconds:.2f}s" for stage, seconds in condense["stage_seconds"].items()))
+            generate = pipeline.get("generate", {})
+            if "seconds" in generate:
+                approx = "~" if generate.get("estimated", "cached_input_tokens" not in generate) else ""
+                details = []
+                if generate.get("first_token_seconds") is not None:
+                    details.append(f"first token after {generate['first_token_seconds']:.2f}s")
+                if generate.get("batched_stories"):
+                    details.append(f"one request for all {generate['batched_stories']} Rearview stories")
+                if generate.get("hedged"):
+                    details.append(f"hedged, answered by {generate['served_by']}")
+                if generate.get("from_cache"):
+                    details.append("served from the response cache")
+                elif "cached_input_tokens" in generate:
+                    details.append(
+                        f"{generate['cached_input_tokens']:,} of the input tokens read from the provider's prompt cache"
+                    )
+                st.caption(
+                    f"Generation: {generate['seconds']:.2f}s, {approx}{generate.get('input_tokens', 0):,} in / "
+                    f"{approx}{generate.get('output_tokens', 0):,} out tokens"
+                    + (f" ({', '.join(details)})" if details else "")
+                )
+            route = pipeline.get("route", {})
+            if route:
+                savings = []
+                if "baseline_cost" in route and route["baseline_cost"] > route["cost"]:
+                    savings.append(f"${route['cost']:.4f} instead of ~${route['baseline_cost']:.4f}")
+                if "baseline_seconds" in route:
+                    savings.append(f"~{route['baseline_seconds']:.1f}s with {route['baseline_model']}")
+                st.caption(
+                    f"Routing: {route['reason']}, {route['model']}, max {route['max_tokens']:,} output tokens "
+                    f"(default {route['baseline_max_tokens']:,})"
+                    + (f" • {', '.join(savings)}" if savings else "")
+                )
+
 def add_section_controls(section_name: str, section_data: Dict):
     """Add controls for managing a section."""
     col1, col2, col3, col4 = st.columns([1, 1, 1, 1])
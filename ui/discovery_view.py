@@ -1,7 +1,7 @@
 # discovery_view.py
 import streamlit as st
 from datetime import datetime, timedelta
-from services.news_service import NewsAPIService
+from services.news_service import get_news_service
 from models.newsletter import Newsletter
 
 def render_news_discovery():
@@ -185,9 +185,8 @@ def render_news_discovery():
                 final_query += f" {custom_query.strip()}"
 
             # Call NewsAPI
-            newsapi = NewsAPIService()
             try:
-                articles = newsapi.fetch_articles(
+                articles = get_news_service().fetch_articles(
                     query=final_query,
                     from_date=from_date,
                     to_date=to_date,
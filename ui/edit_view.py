@@ -1,10 +1,14 @@
 import streamlit as st
 from utils.content_utils import (
-    edit_section_content, 
+    run_section_edit_job, 
+    get_stored_section_source,
+    store_section_source,
     generate_newsletter_html,
     render_newsletter_preview
 )
 from services.llm_service import LLMService
+from services.generation_jobs import get_generation_jobs
+from ui.components import session_job_key, render_generation_job
 
 def render_edit_view(llm_service: LLMService):
     """
@@ -47,6 +51,9 @@ def render_edit_view(llm_service: LLMService):
         
         col1, col2, col3 = st.columns([1, 1, 1])
         
+        with col3:
+            st.subheader("Edited Result")
+        
         with col1:
             st.subheader("Original Content")
             original_text = st.session_state.get("generated_sections", {}).get(selected_section, "")
@@ -82,80 +89,107 @@ def render_edit_view(llm_service: LLMService):
                 elif not edit_prompt:
                     st.error("Please provide editing instructions.")
                 else:
-                    with st.spinner("Applying edits..."):
-                        # Get the latest version (either original or manually edited)
-                        if "edited_sections" not in st.session_state:
-                            st.session_state.edited_sections = {}
-                            
-                        text_to_edit = st.session_state.edited_sections.get(selected_section, original_text)
-                        
-                        # Gather context information for the selected section
-                        # First, determine which section we're editing to get the right context
-                        section_type = ""
-                        section_index = 0
-                        
-                        if selected_section == "Windshield View":
-                            section_type = "windshield"
-                        elif selected_section.startswith("Rearview Mirror "):
-                            section_type = "rearview"
-                            # Extract the index from "Rearview Mirror X"
-                            section_index = int(selected_section.split(" ")[-1])
-                        elif selected_section == "Dashboard Data":
-                            section_type = "dashboard"
-                        elif selected_section == "The Next Lane":
-                            section_type = "nextlane"
-                        
-                        # Get the URL sources for this section
-                        url_key = f"{section_type}_urls"
-                        if section_type == "rearview":
-                            url_key = f"rearview_urls_{section_index}"
-                            
-                        # Get notes for this section
-                        notes_key = f"{section_type}_notes"
-                        if section_type == "rearview":
-                            notes_key = f"rearview_notes_{section_index}"
-                            
-                        # Get section-specific prompt
-                        prompt_key = f"{section_type}_prompt"
-                        if section_type == "rearview":
-                            prompt_key = f"rearview_prompt_{section_index}"
-                        
-                        # Extract article text from URLs
-                        from utils.content_utils import extract_article_text
-                        urls = st.session_state.get(url_key, "")
-                        article_text = extract_article_text(urls) if urls else ""
-                        
-                        # Get user notes
-                        notes = st.session_state.get(notes_key, "")
-                        
-                        # Get section prompt
-                        section_prompt = st.session_state.get(prompt_key, "")
-                        
-                        # Get overall prompt
-                        overall_prompt = st.session_state.get("overall_prompt", "")
-                        
-                        # Call the enhanced edit_section_content function with all context
-                        edited_text = edit_section_content(
+                    # Get the latest version (either original or manually edited)
+                    if "edited_sections" not in st.session_state:
+                        st.session_state.edited_sections = {}
+
+                    text_to_edit = st.session_state.edited_sections.get(selected_section, original_text)
+
+                    # Gather context information for the selected section
+                    # First, determine which section we're editing to get the right context
+                    section_type = ""
+                    section_index = 0
+
+                    if selected_section == "Windshield View":
+                        section_type = "windshield"
+                    elif selected_section.startswith("Rearview Mirror "):
+                        section_type = "rearview"
+                        # Extract the index from "Rearview Mirror X"
+                        section_index = int(selected_section.split(" ")[-1])
+                    elif selected_section == "Dashboard Data":
+                        section_type = "dashboard"
+                    elif selected_section == "The Next Lane":
+                        section_type = "nextlane"
+
+                    # Get the URL sources for this section
+                    url_key = f"{section_type}_urls"
+                    if section_type == "rearview":
+                        url_key = f"rearview_urls_{section_index}"
+
+                    # Get notes for this section
+                    notes_key = f"{section_type}_notes"
+                    if section_type == "rearview":
+                        notes_key = f"rearview_notes_{section_index}"
+
+                    # Get section-specific prompt
+                    prompt_key = f"{section_type}_prompt"
+                    if section_type == "rearview":
+                        prompt_key = f"rearview_prompt_{section_index}"
+
+                    # Reuse the article text from generation unless the URLs changed since;
+                    # otherwise the job fetches them, so Cancel also covers the fetch
+                    urls = st.session_state.get(url_key, "")
+                    stored_article_text = get_stored_section_source(selected_section, urls)
+
+                    # Get user notes
+                    notes = st.session_state.get(notes_key, "")
+
+                    # Get section prompt
+                    section_prompt = st.session_state.get(prompt_key, "")
+
+                    # Get overall prompt
+                    overall_prompt = st.session_state.get("overall_prompt", "")
+
+                    # The edit runs in the background; its result is stored by the job display in col3
+                    provider = st.session_state.get("selected_provider", "OpenAI")
+                    model = st.session_state.get("selected_model", "gpt-4o")
+                    get_generation_jobs().submit(
+                        session_job_key(f"edit:{selected_section}"),
+                        lambda generation_job: run_section_edit_job(
                             llm_service=llm_service,
                             section_key=selected_section,
                             original_text=text_to_edit,
                             edit_prompt=edit_prompt,
-                            provider=st.session_state.get("selected_provider", "OpenAI"),
-                            model=st.session_state.get("selected_model", "gpt-4o"),
-                            article_text=article_text,
+                            urls=urls,
+                            stored_article_text=stored_article_text,
+                            provider=provider,
+                            model=model,
                             notes=notes,
                             section_prompt=section_prompt,
-                            overall_prompt=overall_prompt
+                            overall_prompt=overall_prompt,
+                            on_delta=generation_job.update,
+                            cancel=generation_job.cancel_token
                         )
-                        
-                        st.session_state.edited_sections[selected_section] = edited_text
-                        st.success("Edit applied!")
+                    )
         
         with col3:
-            st.subheader("Edited Result")
+            def store_edit(result):
+                edited_text, stats, fetched_source = result
+                if fetched_source is not None:
+                    store_section_source(selected_section, *fetched_source)
+                st.session_state.setdefault("edited_sections", {})[selected_section] = edited_text
+                if stats:
+                    st.session_state.setdefault("edit_stats", {})[selected_section] = stats
+                st.toast("Edit applied!")
+            
+            render_generation_job(f"edit:{selected_section}", selected_section, store_edit)
             edited_text = st.session_state.get("edited_sections", {}).get(selected_section, "")
             if edited_text:
                 st.write(edited_text)
+                edit_stats = st.session_state.get("edit_stats", {}).get(selected_section)
+                if edit_stats and edit_stats["mode"] == "patch":
+                    st.caption(
+                        f"Patch edit: {edit_stats['replacements']} replacements, "
+                        f"{edit_stats['output_tokens']:,} output tokens instead of ~{edit_stats['rewrite_output_tokens']:,} "
+                        f"for a full rewrite, {edit_stats['seconds']:.2f}s"
+                        + (f" (~{edit_stats['saved_seconds']:.1f}s saved)" if "saved_seconds" in edit_stats else "")
+                    )
+                elif edit_stats and "fallback_reason" in edit_stats:
+                    st.caption(
+                        f"Full rewrite: {edit_stats.get('output_tokens', 0):,} output tokens, {edit_stats['seconds']:.2f}s "
+                        f"(the patch did not apply: {edit_stats['fallback_reason']}; "
+                        f"{edit_stats['patch_seconds']:.2f}s spent on it)"
+                    )
                 if st.button("Keep this edit"):
                     # Update the generated_sections with the edited version
                     if "generated_sections" not in st.session_state:
@@ -5,17 +5,129 @@ from ui.components import (
     show_completion_status, 
     loading_animation,
     display_language_indicator,
-    display_prompt_expander
+    display_prompt_expander,
+    session_job_key,
+    render_generation_job
 )
 from utils.content_utils import (
-    extract_article_text, 
-    generate_section_content, 
+    store_section_source,
+    generate_all_sections,
+    run_section_job,
+    SectionJob,
+    SectionOutcome,
     generate_newsletter_html,
     render_newsletter_preview
 )
 from services.llm_service import LLMService
+from services.generation_jobs import get_generation_jobs
 import streamlit.components.v1 as components
 
+def store_section_outcome(outcome: SectionOutcome):
+    """Stores a finished section's text, source and prompt in session state."""
+    job = outcome.job
+    store_section_source(job.section_name, job.urls, outcome.article_text)
+    if outcome.prompt_record:
+        st.session_state.setdefault("section_prompts", {})[job.section_key] = outcome.prompt_record
+    st.session_state.setdefault("generated_sections", {})[job.section_name] = outcome.generated_text
+
+def start_generate_all(llm_service: LLMService, name: str, jobs):
+    """
+    Starts generating every section with URLs or notes in one background job.
+    
+    The sections' own jobs are cancelled first, and a section started again
+    while the run is in flight keeps its newer result (see
+    render_generate_all_job).
+    
+    Args:
+        llm_service: Instance of LLMService for content generation
+        name: Job name, e.g. "generate_all"
+        jobs: SectionJob for every section to generate
+    """
+    jobs = [job for job in jobs if job.urls.strip() or job.notes.strip()]
+    if not jobs:
+        st.warning("Add URLs or notes to at least one section first.")
+        return
+    
+    provider = st.session_state.get("selected_provider", "OpenAI")
+    model = st.session_state.get("selected_model", "gpt-4o")
+    language = st.session_state.get("language", "English")
+    generation_jobs = get_generation_jobs()
+    for job in jobs:
+        generation_jobs.cancel(session_job_key(job.section_key))
+    
+    def work(generation_job):
+        outcomes = []
+        lines = []
+        for outcome in generate_all_sections(
+            llm_service, jobs, provider, model, language, cancel=generation_job.cancel_token
+        ):
+            outcomes.append(outcome)
+            icon = "✅" if outcome.ok else "⚠️"
+            lines.append(f"- {icon} {outcome.job.section_name} ({outcome.seconds:.1f}s)")
+            generation_job.update(f"{len(outcomes)} of {len(jobs)} sections generated\n\n" + "\n".join(lines))
+        return generation_job.started, outcomes
+    
+    submitted = generation_jobs.submit(session_job_key(name), work)
+    started = st.session_state.setdefault("section_job_started", {})
+    for job in jobs:
+        started[job.section_key] = submitted.started
+
+def render_generate_all_job(name: str, label: str):
+    """
+    Shows a Generate All job, storing its sections in session state once it
+    finishes. Sections started again after the run began are skipped so a
+    newer result is never overwritten.
+    """
+    def store(result):
+        run_started, outcomes = result
+        started = st.session_state.get("section_job_started", {})
+        stored = failed = 0
+        for outcome in outcomes:
+            if started.get(outcome.job.section_key, run_started) > run_started:
+                print(f"[Generate All] Skipping {outcome.job.section_name}; it was generated again since")
+                continue
+            store_section_outcome(outcome)
+            stored += 1
+            failed += not outcome.ok
+        if failed:
+            notice = f"⚠️ {failed} of {stored} sections failed; see the section text for details."
+        else:
+            notice = f"✅ {stored} sections generated!"
+        st.session_state.setdefault("job_notices", {})[name] = notice
+    
+    render_generation_job(name, label, store)
+
+def start_section_job(llm_service: LLMService, job: SectionJob):
+    """
+    Starts fetching and generating a section in the background. A job still
+    running for the same section is cancelled and its result discarded.
+    
+    Args:
+        llm_service: Instance of LLMService for content generation
+        job: The section's inputs
+    """
+    provider = st.session_state.get("selected_provider", "OpenAI")
+    model = st.session_state.get("selected_model", "gpt-4o")
+    language = st.session_state.get("language", "English")
+    submitted = get_generation_jobs().submit(
+        session_job_key(job.section_key),
+        lambda generation_job: run_section_job(
+            llm_service, job, provider, model, language,
+            on_delta=generation_job.update,
+            cancel=generation_job.cancel_token
+        )
+    )
+    st.session_state.setdefault("section_job_started", {})[job.section_key] = submitted.started
+
+def render_section_job(job: SectionJob):
+    """Shows the section's background job, storing its outcome in session state once it finishes."""
+    def store(outcome: SectionOutcome):
+        # The outcome's own job holds the inputs it was generated from
+        store_section_outcome(outcome)
+        st.toast(f"{job.section_name} generated!" if outcome.ok else f"{job.section_name} failed")
+    
+    render_generation_job(job.section_key, job.section_name, store)
+
 def render_generate_view(llm_service: LLMService):
     """
     Render the Generate Mode view.
@@ -25,6 +137,7 @@ def render_generate_view(llm_service: LLMService):
     """
     # Two-column layout
     main_panel, right_panel = st.columns([1, 2])
+    section_jobs = []
 
     with main_panel:
         st.header("Content Generation")
@@ -45,27 +158,13 @@ def render_generate_view(llm_service: LLMService):
             "windshield_prompt",
             DEFAULT_PROMPTS["windshield"]
         )
+        section_jobs.append(SectionJob("Windshield View", "windshield", windshield_urls, windshield_notes, windshield_prompt))
         
         st.markdown('<div class="section-controls-row">', unsafe_allow_html=True)
         col1, col2, col3, col4 = st.columns([1, 1, 1, 1], gap="small")
         with col1:
             if st.button("🔄 Gen", key="generate_windshield", help="Generate section"):
-                with st.spinner("Generating Windshield section..."):
-                    article_text = extract_article_text(windshield_urls)
-                    generated_text = generate_section_content(
-                        llm_service=llm_service,
-                        section_key="windshield",
-                        article_text=article_text,
-                        notes=windshield_notes,
-                        section_prompt=windshield_prompt,
-                        provider=st.session_state.get("selected_provider", "OpenAI"),
-                        model=st.session_state.get("selected_model", "gpt-4o"),
-                        language=st.session_state.get("language", "English")
-                    )
-                    if "generated_sections" not in st.session_state:
-                        st.session_state.generated_sections = {}
-                    st.session_state.generated_sections["Windshield View"] = generated_text
-                    st.success("Windshield section generated!")
+                start_section_job(llm_service, section_jobs[-1])
         with col2:
             if st.button("✏️ Edit", key="edit_windshield", help="Edit section"):
                 st.session_state.edit_section = True
@@ -80,6 +179,7 @@ def render_generate_view(llm_service: LLMService):
                 st.session_state.show_prompt = True
                 st.session_state.current_section = "Windshield View"
         st.markdown('</div>', unsafe_allow_html=True)
+        render_section_job(section_jobs[-1])
         if st.session_state.get("show_prompt", False) and st.session_state.get("current_section") == "Windshield View":
             display_prompt_expander("windshield")
             if st.button("Close Prompt", key="close_prompt_windshield"):
@@ -106,29 +206,13 @@ def render_generate_view(llm_service: LLMService):
                 f"rearview_prompt_{i}",
                 DEFAULT_PROMPTS["rearview"]
             )
+            section_jobs.append(SectionJob(f"Rearview Mirror {i}", f"rearview_{i}", story_urls, story_notes, story_prompt))
             
             st.markdown('<div class="section-controls-row">', unsafe_allow_html=True)
             col1, col2, col3, col4 = st.columns([1, 1, 1, 1], gap="small")
             with col1:
                 if st.button(f"🔄 Gen", key=f"generate_rearview_{i}", help="Generate section"):
-                    with st.spinner(f"Generating Rearview {i} section..."):
-                        article_text = extract_article_text(story_urls)
-                        generated_text = generate_section_content(
-                            llm_service=llm_service,
-                            section_key=f"rearview_{i}",
-                            article_text=article_text,
-                            notes=story_notes,
-                            section_prompt=story_prompt,
-                            provider=st.session_state.get("selected_provider", "OpenAI"),
-                            model=st.session_state.get("selected_model", "gpt-4o"),
-                            language=st.session_state.get("language", "English")
-                        )
-                        
-                        if "generated_sections" not in st.session_state:
-                            st.session_state.generated_sections = {}
-                        
-                        st.session_state.generated_sections[f"Rearview Mirror {i}"] = generated_text
-                        st.success(f"Rearview {i} section generated!")
+                    start_section_job(llm_service, section_jobs[-1])
             
             with col2:
                 if st.button(f"✏️ Edit", key=f"edit_rearview_{i}", help="Edit section"):
@@ -147,11 +231,24 @@ def render_generate_view(llm_service: LLMService):
                     st.session_state.current_section = f"Rearview Mirror {i}"
             
             st.markdown('</div>', unsafe_allow_html=True)
+            render_section_job(section_jobs[-1])
             if st.session_state.get("show_prompt", False) and st.session_state.get("current_section") == f"Rearview Mirror {i}":
                 display_prompt_expander(f"rearview_{i}")
                 if st.button("Close Prompt", key=f"close_prompt_rearview_{i}"):
                     st.session_state.show_prompt = False
                     st.rerun()
+        
+        if st.button(
+            "⚡ Gen All Stories",
+            key="generate_rearview_batch",
+            help="Generate every Rearview story with a single request"
+        ):
+            start_generate_all(
+                llm_service,
+                "generate_rearview_batch",
+                [job for job in section_jobs if job.section_key.startswith("rearview_")]
+            )
+        render_generate_all_job("generate_rearview_batch", "all Rearview stories")
 
         # Dashboard Data Section
         st.subheader("Dashboard Data")
@@ -162,29 +259,13 @@ def render_generate_view(llm_service: LLMService):
             "dashboard_prompt",
             DEFAULT_PROMPTS["dashboard"]
         )
+        section_jobs.append(SectionJob("Dashboard Data", "dashboard", dashboard_urls, dashboard_notes, dashboard_prompt))
         
         st.markdown('<div class="section-controls-row">', unsafe_allow_html=True)
         col1, col2, col3, col4 = st.columns([1, 1, 1, 1], gap="small")
         with col1:
             if st.button("🔄 Gen", key="generate_dashboard", help="Generate section"):
-                with st.spinner("Generating Dashboard section..."):
-                    article_text = extract_article_text(dashboard_urls)
-                    generated_text = generate_section_content(
-                        llm_service=llm_service,
-                        section_key="dashboard",
-                        article_text=article_text,
-                        notes=dashboard_notes,
-                        section_prompt=dashboard_prompt,
-                        provider=st.session_state.get("selected_provider", "OpenAI"),
-                        model=st.session_state.get("selected_model", "gpt-4o"),
-                        language=st.session_state.get("language", "English")
-                    )
-                    
-                    if "generated_sections" not in st.session_state:
-                        st.session_state.generated_sections = {}
-                    
-                    st.session_state.generated_sections["Dashboard Data"] = generated_text
-                    st.success("Dashboard section generated!")
+                start_section_job(llm_service, section_jobs[-1])
         
         with col2:
             if st.button("✏️ Edit", key="edit_dashboard", help="Edit section"):
@@ -203,6 +284,7 @@ def render_generate_view(llm_service: LLMService):
                 st.session_state.current_section = "Dashboard Data"
         
         st.markdown('</div>', unsafe_allow_html=True)
+        render_section_job(section_jobs[-1])
         if st.session_state.get("show_prompt", False) and st.session_state.get("current_section") == "Dashboard Data":
             display_prompt_expander("dashboard")
             if st.button("Close Prompt", key="close_prompt_dashboard"):
@@ -218,29 +300,13 @@ def render_generate_view(llm_service: LLMService):
             "nextlane_prompt",
             DEFAULT_PROMPTS["nextlane"]
         )
+        section_jobs.append(SectionJob("The Next Lane", "nextlane", nextlane_urls, nextlane_notes, nextlane_prompt))
         
         st.markdown('<div class="section-controls-row">', unsafe_allow_html=True)
         col1, col2, col3, col4 = st.columns([1, 1, 1, 1], gap="small")
         with col1:
             if st.button("🔄 Gen", key="generate_nextlane", help="Generate section"):
-                with st.spinner("Generating The Next Lane section..."):
-                    article_text = extract_article_text(nextlane_urls)
-                    generated_text = generate_section_content(
-                        llm_service=llm_service,
-                        section_key="nextlane",
-                        article_text=article_text,
-                        notes=nextlane_notes,
-                        section_prompt=nextlane_prompt,
-                        provider=st.session_state.get("selected_provider", "OpenAI"),
-                        model=st.session_state.get("selected_model", "gpt-4o"),
-                        language=st.session_state.get("language", "English")
-                    )
-                    
-                    if "generated_sections" not in st.session_state:
-                        st.session_state.generated_sections = {}
-                    
-                    st.session_state.generated_sections["The Next Lane"] = generated_text
-                    st.success("The Next Lane section generated!")
+                start_section_job(llm_service, section_jobs[-1])
         
         with col2:
             if st.button("✏️ Edit", key="edit_nextlane", help="Edit section"):
@@ -259,12 +325,19 @@ def render_generate_view(llm_service: LLMService):
                 st.session_state.current_section = "The Next Lane"
         
         st.markdown('</div>', unsafe_allow_html=True)
+        render_section_job(section_jobs[-1])
         if st.session_state.get("show_prompt", False) and st.session_state.get("current_section") == "The Next Lane":
             display_prompt_expander("nextlane")
             if st.button("Close Prompt", key="close_prompt_nextlane"):
                 st.session_state.show_prompt = False
                 st.rerun()
 
+        # Generate every section at once
+        st.subheader("Generate All Sections")
+        if st.button("🚀 Generate All", key="generate_all", help="Fetch and generate all sections concurrently"):
+            start_generate_all(llm_service, "generate_all", section_jobs)
+        render_generate_all_job("generate_all", "all sections")
+
     with right_panel:
         st.header("Newsletter Summary")
         # Display language selection
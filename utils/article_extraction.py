@@ -0,0 +1,478 @@
+"""
+Article text extraction engines.
+
+The default "scoring" engine streams the page through a single parser pass
+(lxml when installed, the standard library otherwise), skips boilerplate
+subtrees as soon as they open and scores content blocks readability-style.
+The "legacy" engine is the original BeautifulSoup implementation and is kept
+as a fallback.
+
+When PARSE_POOL_ENABLED is set, extraction runs in a pool of worker
+processes so parsing scales with cores while network I/O stays on threads.
+"""
+import multiprocessing
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from html.parser import HTMLParser
+from typing import Callable, Dict, List, Optional, Tuple
+
+from bs4 import BeautifulSoup
+
+from config.settings import (
+    ARTICLE_EXTRACTION_ENGINE,
+    PARSE_POOL_ENABLED,
+    PARSE_POOL_WORKERS,
+    PARSE_POOL_MAX_PENDING,
+    PARSE_POOL_MIN_BYTES,
+    PARSE_POOL_TASK_TIMEOUT
+)
+
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
+# Subtrees that never contain article text
+SKIP_TAGS = {
+    "script", "style", "noscript", "nav", "header", "footer", "aside", "form",
+    "iframe", "svg", "button", "select", "template", "canvas", "object"
+}
+# Elements without an end tag
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link",
+    "meta", "param", "source", "track", "wbr"
+}
+# Elements whose own text forms one content block
+TEXT_BLOCK_TAGS = {"p", "pre", "blockquote", "h1", "h2", "h3", "h4", "li", "td"}
+# Elements that score content blocks
+SCORING_TAGS = {"p", "pre", "blockquote", "td"}
+# Elements that start a new block when they open or close
+BLOCK_TAGS = TEXT_BLOCK_TAGS | {
+    "div", "section", "article", "main", "body", "ul", "ol", "table", "tr",
+    "figure", "figcaption", "dl", "dt", "dd", "h5", "h6"
+}
+
+# Inline elements that cannot span a block boundary
+INLINE_TAGS = {"a", "span", "em", "strong", "b", "i", "u", "font", "small", "abbr", "cite", "code", "time", "label"}
+
+POSITIVE_HINTS = re.compile(r"article|body|content|entry|main|page|post|text|blog|story", re.I)
+NEGATIVE_HINTS = re.compile(
+    r"comment|contact|foot|masthead|meta|outbrain|promo|related|share|sidebar|sponsor|"
+    r"shopping|tags|widget|advert|newsletter|subscribe|cookie|banner|social|breadcrumb|menu|nav|popup",
+    re.I
+)
+TAG_WEIGHTS = {"article": 10, "main": 5, "div": 5, "section": 3, "pre": 3, "td": 3, "blockquote": 3, "ul": -3, "ol": -3}
+
+MIN_SCORING_LENGTH = 25
+MIN_ARTICLE_LENGTH = 200
+MAX_LINK_DENSITY = 0.5
+
+
+class _BlockScorer:
+    """
+    Parser target that scores content blocks while the page is being parsed.
+
+    Works with lxml's target parser interface (start/end/data/close) and is
+    driven by _StdlibFeeder when lxml is unavailable.
+    """
+
+    def __init__(self):
+        self.tags: List[str] = []
+        self.parents: List[int] = []
+        self.weights: List[int] = []
+        self.scores: Dict[int, float] = {}
+        self.stack: List[int] = []
+        # Open tags inside a skipped subtree, outermost first
+        self.skip_stack: List[str] = []
+        self.link_depth = 0
+        # (text, ancestor ids with the owning element last, link density, owner tag)
+        self.blocks: List[Tuple[str, Tuple[int, ...], float, str]] = []
+        self._buffer: List[str] = []
+        self._link_chars = 0
+
+    def _flush(self) -> None:
+        """Closes the text collected so far as a block owned by the innermost element."""
+        if not self._buffer:
+            return
+        text = " ".join("".join(self._buffer).split())
+        link_chars = self._link_chars
+        self._buffer = []
+        self._link_chars = 0
+        if not text or not self.stack:
+            return
+
+        # Inline elements (links, spans, ...) belong to the enclosing block
+        owner = self.stack[-1]
+        for node in reversed(self.stack):
+            if self.tags[node] in BLOCK_TAGS:
+                owner = node
+                break
+        link_density = min(link_chars / len(text), 1.0)
+        self.blocks.append((text, tuple(self.stack[:self.stack.index(owner) + 1]), link_density, self.tags[owner]))
+
+        if len(text) < MIN_SCORING_LENGTH or link_density > MAX_LINK_DENSITY:
+            return
+        score = 1 + text.count(",") + min(len(text) // 100, 3)
+        # Paragraph-like blocks credit their container; loose text credits its own element
+        target = self.parents[owner] if self.tags[owner] in SCORING_TAGS else owner
+        if target >= 0:
+            self.scores[target] = self.scores.get(target, 0) + score
+            grandparent = self.parents[target]
+            if grandparent >= 0:
+                self.scores[grandparent] = self.scores.get(grandparent, 0) + score / 2
+
+    def _pop(self) -> None:
+        tag = self.tags[self.stack[-1]]
+        if tag in BLOCK_TAGS:
+            self._flush()
+        self.stack.pop()
+        if tag == "a":
+            self.link_depth -= 1
+
+    def start(self, tag, attrib) -> None:
+        tag = tag.lower() if isinstance(tag, str) else ""
+        if self.skip_stack:
+            if tag not in VOID_TAGS:
+                self.skip_stack.append(tag)
+            return
+        if tag in SKIP_TAGS:
+            self._flush()
+            self.skip_stack.append(tag)
+            return
+        if tag == "a":
+            self.link_depth += 1
+        if tag in VOID_TAGS:
+            if tag == "br":
+                self._buffer.append(" ")
+            return
+        if tag in BLOCK_TAGS:
+            # Browsers implicitly close an open <p> (or sibling <li>) here;
+            # stray inline elements left open are closed along with it
+            while self.stack and (
+                self.tags[self.stack[-1]] in INLINE_TAGS
+                or self.tags[self.stack[-1]] == "p"
+                or (tag == "li" and self.tags[self.stack[-1]] == "li")
+            ):
+                self._pop()
+            self._flush()
+
+        hints = f"{attrib.get('class', '')} {attrib.get('id', '')}"
+        weight = TAG_WEIGHTS.get(tag, 0)
+        if hints.strip():
+            if POSITIVE_HINTS.search(hints):
+                weight += 25
+            if NEGATIVE_HINTS.search(hints):
+                weight -= 25
+
+        self.tags.append(tag)
+        self.parents.append(self.stack[-1] if self.stack else -1)
+        self.weights.append(weight)
+        self.stack.append(len(self.tags) - 1)
+
+    def end(self, tag) -> None:
+        tag = tag.lower() if isinstance(tag, str) else ""
+        if self.skip_stack:
+            if tag in self.skip_stack:
+                del self.skip_stack[len(self.skip_stack) - 1 - self.skip_stack[::-1].index(tag):]
+            return
+        if tag in VOID_TAGS:
+            return
+        # Tolerate unbalanced markup by closing up to the matching element
+        for depth in range(len(self.stack) - 1, max(len(self.stack) - 8, -1), -1):
+            if self.tags[self.stack[depth]] == tag:
+                while len(self.stack) > depth:
+                    self._pop()
+                return
+
+    def data(self, text) -> None:
+        if self.skip_stack or not text:
+            return
+        self._buffer.append(text)
+        if self.link_depth:
+            self._link_chars += len(text.strip())
+
+    def comment(self, text) -> None:
+        pass
+
+    def close(self) -> str:
+        while self.stack:
+            self._pop()
+        self._flush()
+        return self.result()
+
+    def result(self) -> str:
+        """Returns the text of the best-scoring container and its qualifying siblings."""
+        if not self.scores:
+            return ""
+        final_scores = {node: score + self.weights[node] for node, score in self.scores.items()}
+        top = max(final_scores, key=final_scores.get)
+        threshold = max(10, final_scores[top] * 0.2)
+        selected = {top} | {
+            node for node, score in final_scores.items()
+            if self.parents[node] == self.parents[top] and self.parents[top] >= 0 and score >= threshold
+        }
+
+        lines = []
+        for text, ancestors, link_density, owner_tag in self.blocks:
+            if link_density > MAX_LINK_DENSITY or not any(node in selected for node in ancestors):
+                continue
+            if owner_tag == "li" and len(text) < MIN_SCORING_LENGTH:
+                continue
+            lines.append(text)
+        return "\n".join(lines)
+
+    def paragraphs(self) -> str:
+        """Returns every scoring-sized paragraph on the page, ignoring containers."""
+        return "\n".join(
+            text for text, _, link_density, owner_tag in self.blocks
+            if owner_tag == "p" and link_density <= MAX_LINK_DENSITY
+        )
+
+
+class _StdlibFeeder(HTMLParser):
+    """Drives a parser target from the standard library HTML parser."""
+
+    def __init__(self, target: _BlockScorer):
+        super().__init__(convert_charrefs=True)
+        self.target = target
+
+    def handle_starttag(self, tag, attrs):
+        self.target.start(tag, {key: value or "" for key, value in attrs})
+
+    def handle_startendtag(self, tag, attrs):
+        self.target.start(tag, {key: value or "" for key, value in attrs})
+        if tag not in VOID_TAGS:
+            self.target.end(tag)
+
+    def handle_endtag(self, tag):
+        self.target.end(tag)
+
+    def handle_data(self, data):
+        self.target.data(data)
+
+
+def _run_scorer(html: str) -> _BlockScorer:
+    """Parses the page once, feeding every event to a fresh scorer."""
+    scorer = _BlockScorer()
+    if etree is not None:
+        try:
+            parser = etree.HTMLParser(target=scorer, encoding="utf-8", remove_comments=True, no_network=True)
+            parser.feed(html.encode("utf-8", errors="replace"))
+            parser.close()
+            return scorer
+        except Exception:
+            scorer = _BlockScorer()
+
+    feeder = _StdlibFeeder(scorer)
+    feeder.feed(html)
+    feeder.close()
+    scorer.close()
+    return scorer
+
+
+def scoring_extract(html: str) -> str:
+    """
+    Extracts article text in a single streaming pass with block scoring.
+
+    Args:
+        html: Raw HTML of the page
+
+    Returns:
+        Extracted article text, or an empty string if nothing was found
+    """
+    scorer = _run_scorer(html)
+    article = scorer.result()
+    if len(article) >= MIN_ARTICLE_LENGTH:
+        return article
+
+    # Short or unscored pages: fall back to plain paragraphs, then the legacy heuristics
+    paragraphs = scorer.paragraphs()
+    if len(paragraphs) > len(article):
+        article = paragraphs
+    return article or legacy_extract(html)
+
+
+def legacy_extract(html: str) -> str:
+    """
+    Extracts the main article text with the original BeautifulSoup heuristics.
+
+    Args:
+        html: Raw HTML of the page
+
+    Returns:
+        Extracted article text, or an empty string if nothing was found
+    """
+    soup = BeautifulSoup(html, "html.parser")
+
+    # Try multiple methods to extract content
+    article = ""
+
+    # Method 1: Look for article content in common containers
+    article_containers = soup.find_all(['article', 'main', 'div'], class_=lambda x: x and any(term in str(x).lower() for term in ['article', 'content', 'post', 'entry']))
+    if article_containers:
+        paragraphs = article_containers[0].find_all(['p', 'div', 'section'])
+        article = "\n".join(p.get_text().strip() for p in paragraphs if p.get_text().strip())
+
+    # Method 2: If no content found, try all paragraphs
+    if not article:
+        paragraphs = soup.find_all('p')
+        article = "\n".join(p.get_text().strip() for p in paragraphs if p.get_text().strip())
+
+    # Method 3: If still no content, try looking for text in any div
+    if not article:
+        divs = soup.find_all('div')
+        article = "\n".join(d.get_text().strip() for d in divs if len(d.get_text().strip()) > 100)
+
+    return article
+
+
+EXTRACTION_ENGINES: Dict[str, Callable[[str], str]] = {
+    "scoring": scoring_extract,
+    "legacy": legacy_extract,
+}
+
+
+def _extract_in_worker(engine_name: str, html: str) -> str:
+    """Runs an extraction engine inside a pool worker process."""
+    return EXTRACTION_ENGINES[engine_name](html)
+
+
+class ParsePool:
+    """
+    Runs extraction engines in worker processes with a bounded queue.
+
+    A full queue or a crashed pool falls back to parsing in the calling
+    thread. A page that takes longer than task_timeout is given up on: its
+    worker is stopped by recycling the pool and the page yields no text,
+    since parsing it again in-process would take just as long.
+
+    A queue slot stays taken until the worker has finished with the page, so
+    max_pending also bounds work that callers stopped waiting for.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = PARSE_POOL_WORKERS,
+        max_pending: int = PARSE_POOL_MAX_PENDING,
+        min_bytes: int = PARSE_POOL_MIN_BYTES,
+        task_timeout: float = PARSE_POOL_TASK_TIMEOUT
+    ):
+        self.max_workers = max_workers
+        self.min_bytes = min_bytes
+        self.task_timeout = task_timeout
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn avoids forking a process that is running Streamlit's threads
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def _reset(self, executor: ProcessPoolExecutor, terminate: bool = False) -> None:
+        """
+        Drops an executor so the next call starts a fresh one.
+
+        Args:
+            executor: The executor that broke or hung; nothing happens if it
+                was already replaced
+            terminate: Also stop its worker processes, e.g. one stuck on a page
+        """
+        with self._lock:
+            if self._executor is not executor:
+                return
+            self._executor = None
+        # Taken before shutdown, which forgets the processes
+        processes = list((getattr(executor, "_processes", None) or {}).values())
+        executor.shutdown(wait=False, cancel_futures=True)
+        if terminate:
+            # Other pages still in the pool fail with BrokenProcessPool and are parsed by their callers
+            for process in processes:
+                process.terminate()
+
+    def extract(self, engine_name: str, html: str) -> str:
+        """
+        Extracts article text, in a worker process when worthwhile.
+
+        Args:
+            engine_name: Name of the engine in EXTRACTION_ENGINES
+            html: Raw HTML of the page
+
+        Returns:
+            Extracted article text
+        """
+        engine = EXTRACTION_ENGINES[engine_name]
+        if len(html) < self.min_bytes or not self._slots.acquire(blocking=False):
+            return engine(html)
+        executor = self._get_executor()
+        try:
+            future = executor.submit(_extract_in_worker, engine_name, html)
+        except Exception as e:
+            self._slots.release()
+            print(f"[Article Extraction] Parse pool unavailable, restarting it: {e}")
+            self._reset(executor)
+            return engine(html)
+        # Released when the worker is done with the page, not when we stop waiting
+        future.add_done_callback(lambda _: self._slots.release())
+
+        try:
+            return future.result(timeout=self.task_timeout)
+        except FutureTimeoutError:
+            print(
+                f"[Article Extraction] Parsing a {len(html) / 1024:.0f} KB page took over {self.task_timeout}s; "
+                "skipping it and recycling the parse pool"
+            )
+            self._reset(executor, terminate=True)
+            return ""
+        except BrokenProcessPool as e:
+            print(f"[Article Extraction] Parse pool broke, restarting it: {e}")
+            self._reset(executor)
+        except Exception as e:
+            print(f"[Article Extraction] Parse pool failed, parsing in-process: {e}")
+        return engine(html)
+
+
+_parse_pool: Optional[ParsePool] = None
+_parse_pool_lock = threading.Lock()
+
+
+def get_parse_pool() -> ParsePool:
+    """Returns the process-wide parse pool shared by all fetch threads."""
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            _parse_pool = ParsePool()
+        return _parse_pool
+
+
+def get_extractor(name: Optional[str] = None) -> Callable[[str], str]:
+    """
+    Returns an extraction engine by name.
+
+    Args:
+        name: Engine name, defaults to ARTICLE_EXTRACTION_ENGINE
+
+    Returns:
+        Function turning page HTML into article text. When PARSE_POOL_ENABLED
+        is set, the function hands the work to the shared parse pool.
+    """
+    name = name or ARTICLE_EXTRACTION_ENGINE
+    if name not in EXTRACTION_ENGINES:
+        raise ValueError(f"Unknown extraction engine: {name}")
+    engine = EXTRACTION_ENGINES[name]
+    if not PARSE_POOL_ENABLED:
+        return engine
+
+    def pooled_extract(html: str) -> str:
+        return get_parse_pool().extract(name, html)
+
+    # Keep the engine's name; the article cache uses it to tell engines apart
+    pooled_extract.__name__ = engine.__name__
+    return pooled_extract
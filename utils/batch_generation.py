@@ -0,0 +1,140 @@
+"""
+Non-interactive generation of whole newsletters through the providers' batch APIs.
+
+Sources are fetched and condensed once per section, then every section of
+every newsletter is generated in every requested language as a single batch
+per provider. Results are mapped back to their sections by custom_id.
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+from config.prompts import DEFAULT_PROMPTS
+from config.settings import BATCH_POLL_INTERVAL, BATCH_TIMEOUT
+from models.newsletter import Newsletter
+from services.batch_service import BatchRequest, BatchResult
+from services.llm_service import LLMService
+from utils.content_utils import (
+    SectionJob,
+    build_section_prompts,
+    extract_article_text,
+    url_fingerprint
+)
+from utils.source_condenser import condense_source_text
+
+LANGUAGE_CODES = {"English": "en", "Hebrew": "he"}
+
+
+@dataclass
+class BatchedNewsletter:
+    """A newsletter generated in one language by a batch run."""
+    index: int  # position of the source newsletter in the input list
+    language: str
+    newsletter: Newsletter
+    failed_sections: Dict[str, str]  # section name -> error
+
+
+def newsletter_section_jobs(newsletter: Newsletter) -> List[SectionJob]:
+    """
+    Returns a SectionJob for every section of a newsletter that has URLs or notes.
+
+    Sections without their own prompt use the default prompt for their type.
+    """
+    sections = [("Windshield View", "windshield", "windshield", newsletter.windshield)]
+    for i, section in sorted(newsletter.rearview_sections.items()):
+        sections.append((f"Rearview Mirror {i}", f"rearview_{i}", "rearview", section))
+    sections.append(("Dashboard Data", "dashboard", "dashboard", newsletter.dashboard))
+    sections.append(("The Next Lane", "nextlane", "nextlane", newsletter.nextlane))
+
+    return [
+        SectionJob(name, key, section.urls, section.notes, section.prompt or DEFAULT_PROMPTS[prompt_type])
+        for name, key, prompt_type, section in sections
+        if section.urls.strip() or section.notes.strip()
+    ]
+
+
+def batch_custom_id(newsletter_index: int, language: str, section_key: str) -> str:
+    """Returns the batch custom_id of a section, e.g. "n0-en-rearview_2"."""
+    return f"n{newsletter_index}-{LANGUAGE_CODES.get(language, language.lower()[:2])}-{section_key}"
+
+
+def _section_source(llm_service: LLMService, newsletter: Newsletter, job: SectionJob, provider: str) -> str:
+    """Returns a section's condensed article text, reusing the text stored with the newsletter when the URLs match."""
+    if not job.urls.strip():
+        return ""
+    section = newsletter.get_sections_by_name()[job.section_name]
+    if section.source_text and section.source_fingerprint == url_fingerprint(job.urls):
+        article_text = section.source_text
+    else:
+        article_text = extract_article_text(job.urls)
+        section.source_text = article_text
+        section.source_fingerprint = url_fingerprint(job.urls)
+    return condense_source_text(llm_service, article_text, provider).text
+
+
+def generate_newsletters_in_batch(
+    llm_service: LLMService,
+    newsletters: List[Newsletter],
+    languages: List[str],
+    provider: str,
+    model: str,
+    poll_interval: float = BATCH_POLL_INTERVAL,
+    timeout: float = BATCH_TIMEOUT
+) -> List[BatchedNewsletter]:
+    """
+    Generates every section of every newsletter in every language as one batch.
+
+    Args:
+        llm_service: Instance of LLMService
+        newsletters: Newsletters whose URLs, notes and prompts are filled in
+        languages: Languages to generate each newsletter in
+        provider: LLM provider name
+        model: Model identifier
+        poll_interval: Seconds between batch status checks
+        timeout: Seconds to wait for the batch before giving up
+
+    Returns:
+        One BatchedNewsletter per newsletter and language, with the generated
+        sections filled in
+    """
+    requests: List[BatchRequest] = []
+    targets: Dict[str, Tuple[int, str, str]] = {}  # custom_id -> (newsletter index, language, section name)
+
+    for index, newsletter in enumerate(newsletters):
+        for job in newsletter_section_jobs(newsletter):
+            article_text = _section_source(llm_service, newsletter, job, provider)
+            for language in languages:
+                system_prompt, context, user_prompt = build_section_prompts(
+                    article_text, job.notes, job.section_prompt, language
+                )
+                custom_id = batch_custom_id(index, language, job.section_key)
+                requests.append(BatchRequest(custom_id, model, system_prompt, user_prompt, context))
+                targets[custom_id] = (index, language, job.section_name)
+
+    print(
+        f"[Batch Generation] {len(requests)} section requests for {len(newsletters)} newsletters "
+        f"in {len(languages)} languages"
+    )
+    results: Dict[str, BatchResult] = llm_service.run_batch(
+        {provider: requests}, poll_interval=poll_interval, timeout=timeout
+    ) if requests else {}
+
+    outputs: Dict[Tuple[int, str], BatchedNewsletter] = {}
+    for index, newsletter in enumerate(newsletters):
+        for language in languages:
+            copy = Newsletter.from_dict(newsletter.to_dict())
+            copy.language = language
+            copy.selected_provider = provider
+            copy.selected_model = model
+            outputs[(index, language)] = BatchedNewsletter(index, language, copy, {})
+
+    for custom_id, (index, language, section_name) in targets.items():
+        output = outputs[(index, language)]
+        result = results.get(custom_id)
+        if result and result.ok:
+            output.newsletter.get_sections_by_name()[section_name].content = result.response.text
+        else:
+            output.failed_sections[section_name] = result.error if result else "No result"
+
+    failed = sum(len(output.failed_sections) for output in outputs.values())
+    print(f"[Batch Generation] {len(targets) - failed} sections generated, {failed} failed")
+    return list(outputs.values())
@@ -1,18 +1,113 @@
-import requests
 from bs4 import BeautifulSoup
 import datetime
+import hashlib
+import time
 import streamlit.components.v1 as components
-from typing import List, Dict, Tuple
-from services.llm_service import LLMService
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Callable, Iterator, List, Dict, Optional, Tuple
+from config.settings import (
+    DEDUP_ENABLED,
+    PREFETCH_ENABLED,
+    GENERATE_ALL_MAX_WORKERS,
+    STREAM_RENDER_INTERVAL,
+    REARVIEW_BATCH_ENABLED,
+    REARVIEW_BATCH_MIN_STORIES,
+    EDIT_PATCH_ENABLED,
+    EDIT_PATCH_MIN_CHARS
+)
+from services.llm_service import LLMService, ModelConfig
+from services.llm_types import CancelToken, GenerationCancelled, LLMResponse
+from services.article_cache import canonicalize_url
+from services.fetch_service import FetchResult, get_fetch_service
+from services.model_router import get_model_router
+from services.prefetch_service import get_prefetch_service
+from utils.article_extraction import get_extractor
+from utils.text_dedup import deduplicate_paragraphs
+from utils.source_condenser import condense_source_text, estimate_tokens
+from utils.rearview_batch import RearviewStory, build_rearview_batch_prompts, parse_rearview_batch
+from utils.text_patch import PatchError, apply_patch, parse_patch
 from ui.components import loading_animation
-import pdfkit
-import docx
-from docx.shared import Inches
-import html2text
 import json
-import yaml
 import streamlit as st
 
+# Starts the note extract_article_text adds for URLs that could not be fetched
+EXTRACTION_FAILURE_NOTE = "⚠️ Could not extract content from"
+
+def split_urls(urls: str) -> List[str]:
+    """Splits a section's URL field on ";;" into a list of URLs."""
+    return [url.strip() for url in urls.split(";;") if url.strip()]
+
+def prefetch_article_urls(urls: str) -> None:
+    """
+    Starts fetching a section's URLs in the background so the article text is
+    cached by the time the section is generated. URLs that failed before are retried.
+    
+    Args:
+        urls: String containing URLs separated by ";;"
+    """
+    if not PREFETCH_ENABLED:
+        return
+    url_list = split_urls(urls)
+    prefetcher = get_prefetch_service()
+    prefetcher.forget([url for url, status in prefetcher.statuses(url_list) if status == "failed"])
+    prefetcher.prefetch(url_list, get_extractor())
+
+def get_prefetch_statuses(urls: str) -> List[Tuple[str, str]]:
+    """
+    Returns the background fetch readiness of each of a section's URLs.
+    
+    Args:
+        urls: String containing URLs separated by ";;"
+        
+    Returns:
+        List of (url, status) pairs, status being "pending", "fetching", "ready" or "failed"
+    """
+    if not PREFETCH_ENABLED:
+        return []
+    return get_prefetch_service().statuses(split_urls(urls))
+
+def fetch_article_results(urls: str) -> List[FetchResult]:
+    """
+    Fetches and extracts every URL in the list concurrently.
+    
+    Args:
+        urls: String containing URLs separated by ";;"
+        
+    Returns:
+        One FetchResult per URL in input order, including per-URL timings
+    """
+    url_list = split_urls(urls)
+    print(f"[Article Extraction] Found {len(url_list)} URLs to process")
+    
+    results = get_fetch_service().fetch_all(url_list, get_extractor())
+    
+    for result in results:
+        cache_note = f", cache {result.cache_status}" if result.cache_status else ""
+        if result.ok:
+            print(
+                f"[Article Extraction] {result.url}: {len(result.text)} characters "
+                f"(fetch {result.fetch_time:.2f}s, parse {result.parse_time:.2f}s{cache_note})"
+            )
+        else:
+            print(f"[Article Extraction] Error fetching URL {result.url}: {result.error} ({result.elapsed:.2f}s{cache_note})")
+    
+    cache = get_fetch_service().cache
+    if cache:
+        stats = cache.stats()
+        print(
+            f"[Article Cache] hits: {stats['hits']} (revalidated: {stats['revalidated']}), "
+            f"misses: {stats['misses']}, entries: {stats['entries']}, size: {stats['bytes'] / 1024:.0f} KB"
+        )
+    
+    policy = get_fetch_service().policy
+    if policy:
+        for host, breaker in policy.stats().items():
+            if breaker["state"] != "closed":
+                print(f"[Fetch Policy] {host} circuit {breaker['state']} after {breaker['failures']} failures")
+    
+    return results
+
 def extract_article_text(urls: str) -> str:
     """
     Fetches and combines article content from multiple URLs.
@@ -24,75 +119,237 @@ def extract_article_text(urls: str) -> str:
         Combined text from all articles or error message if extraction fails
     """
     print(f"\n[Article Extraction] Starting extraction for URLs: {urls}")
-    combined_text = ""
-    url_list = [url.strip() for url in urls.split(";;") if url.strip()]
-    
-    print(f"[Article Extraction] Found {len(url_list)} URLs to process")
+    results = fetch_article_results(urls)
     
-    if not url_list:
+    if not results:
         return ""
     
-    # Add headers to mimic a real browser
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-        'Accept-Language': 'en-US,en;q=0.5',
-        'Connection': 'keep-alive',
-    }
+    failed_urls = [result.url for result in results if not result.ok]
+    texts = [result.text.strip() for result in results if result.ok]
     
-    failed_urls = []
-    for url in url_list:
-        try:
-            print(f"[Article Extraction] Fetching content from: {url}")
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
-            print(f"[Article Extraction] Response status code: {response.status_code}")
-            
-            soup = BeautifulSoup(response.text, "html.parser")
-            
-            # Try multiple methods to extract content
-            article = ""
-            
-            # Method 1: Look for article content in common containers
-            article_containers = soup.find_all(['article', 'main', 'div'], class_=lambda x: x and any(term in str(x).lower() for term in ['article', 'content', 'post', 'entry']))
-            if article_containers:
-                paragraphs = article_containers[0].find_all(['p', 'div', 'section'])
-                article = "\n".join(p.get_text().strip() for p in paragraphs if p.get_text().strip())
-            
-            # Method 2: If no content found, try all paragraphs
-            if not article:
-                paragraphs = soup.find_all('p')
-                article = "\n".join(p.get_text().strip() for p in paragraphs if p.get_text().strip())
-            
-            # Method 3: If still no content, try looking for text in any div
-            if not article:
-                divs = soup.find_all('div')
-                article = "\n".join(d.get_text().strip() for d in divs if len(d.get_text().strip()) > 100)
-            
-            print(f"[Article Extraction] Extracted text length: {len(article)} characters")
-            
-            if len(article.strip()) == 0:
-                failed_urls.append(url)
-                continue
-                
-            combined_text += article + "\n\n"
-        except Exception as e:
-            error_msg = f"Error fetching URL {url}: {str(e)}"
-            print(f"[Article Extraction] {error_msg}")
-            failed_urls.append(url)
+    # Drop wire-service paragraphs repeated across sources
+    if DEDUP_ENABLED and texts:
+        texts, dedup_stats = deduplicate_paragraphs(texts)
+        if dedup_stats.paragraphs_removed:
+            print(
+                f"[Article Extraction] Removed {dedup_stats.paragraphs_removed} duplicate paragraphs "
+                f"({dedup_stats.chars_saved} characters saved)"
+            )
     
-    final_text = combined_text.strip()
+    final_text = "\n\n".join(text for text in texts if text)
     print(f"[Article Extraction] Final combined text length: {len(final_text)} characters")
     
     # If all URLs failed or no content was extracted, return error message
-    if len(failed_urls) == len(url_list):
-        return f"⚠️ Could not extract content from any of the provided URLs: {', '.join(failed_urls)}"
+    if len(failed_urls) == len(results):
+        return f"{EXTRACTION_FAILURE_NOTE} any of the provided URLs: {', '.join(failed_urls)}"
     elif failed_urls:
-        return f"{final_text}\n\n⚠️ Could not extract content from: {', '.join(failed_urls)}"
+        return f"{final_text}\n\n{EXTRACTION_FAILURE_NOTE}: {', '.join(failed_urls)}"
     
     return final_text
 
-def generate_section_content(
+def url_fingerprint(urls: str) -> str:
+    """
+    Computes a fingerprint of a section's URL list.
+    
+    Args:
+        urls: String containing URLs separated by ";;"
+        
+    Returns:
+        Hash of the canonicalized URLs in order; empty URL lists give ""
+    """
+    url_list = [canonicalize_url(url) for url in urls.split(";;") if url.strip()]
+    if not url_list:
+        return ""
+    return hashlib.sha256("\n".join(url_list).encode("utf-8")).hexdigest()[:16]
+
+def store_section_source(section_name: str, urls: str, article_text: str) -> None:
+    """
+    Remembers the article text a section was generated from.
+    
+    Text from an extraction where some URL failed is not kept, so the next
+    edit fetches again; the URLs that worked are then served by the article
+    cache and only the failed ones are retried.
+    
+    Args:
+        section_name: Display name of the section (e.g. "Windshield View")
+        urls: The section's URL field at generation time
+        article_text: Text extracted from those URLs
+    """
+    if "section_sources" not in st.session_state:
+        st.session_state.section_sources = {}
+    
+    if EXTRACTION_FAILURE_NOTE in article_text:
+        st.session_state.section_sources.pop(section_name, None)
+        return
+    
+    st.session_state.section_sources[section_name] = {
+        "fingerprint": url_fingerprint(urls),
+        "text": article_text
+    }
+
+def get_section_source_text(section_name: str, urls: str) -> str:
+    """
+    Returns the article text for a section, reusing the text stored at
+    generation time unless the section's URLs have changed since.
+    
+    Args:
+        section_name: Display name of the section
+        urls: The section's current URL field
+        
+    Returns:
+        Article text for the section
+    """
+    if not urls:
+        return ""
+    
+    stored_text = get_stored_section_source(section_name, urls)
+    if stored_text is not None:
+        return stored_text
+    
+    article_text = extract_article_text(urls)
+    store_section_source(section_name, urls, article_text)
+    return article_text
+
+def get_stored_section_source(section_name: str, urls: str) -> Optional[str]:
+    """
+    Returns the article text stored for a section at generation time, or
+    None if there is none or the section's URLs have changed since.
+    
+    Args:
+        section_name: Display name of the section
+        urls: The section's current URL field
+        
+    Returns:
+        The stored article text, or None if it has to be fetched
+    """
+    source = st.session_state.get("section_sources", {}).get(section_name)
+    if source and source.get("text") and source.get("fingerprint") == url_fingerprint(urls):
+        print(f"[Article Extraction] Reusing source text stored for {section_name}")
+        return source["text"]
+    return None
+
+def build_section_prompts(
+    article_text: str,
+    notes: str,
+    section_prompt: str,
+    language: str = "English"
+) -> Tuple[str, str, str]:
+    """
+    Builds the prompts for generating a section.
+    
+    The article text is returned separately as the context so it can be sent
+    ahead of the section instructions and cached by the provider when the
+    section is regenerated.
+    
+    Args:
+        article_text: Combined (possibly condensed) text from articles
+        notes: Additional notes from the user
+        section_prompt: Prompt specific to this section
+        language: Target language for generation
+        
+    Returns:
+        Tuple of (system_prompt, context, user_prompt)
+    """
+    context = f"Combined Article Content:\n{article_text}"
+    user_content = f"{section_prompt}\n\nNotes: {notes if notes else ''}"
+    
+    # Select the appropriate overall prompt based on language
+    from config.prompts import DEFAULT_PROMPTS
+    
+    if language == "Hebrew":
+        system_prompt = DEFAULT_PROMPTS["overall_hebrew"]
+    else:
+        system_prompt = DEFAULT_PROMPTS["overall"]
+    
+    return system_prompt, context, user_content
+
+def stream_llm_text(
+    llm_service: LLMService,
+    provider: str,
+    model: str,
+    system_prompt: str,
+    user_prompt: str,
+    on_delta: Callable[[str], None],
+    render_interval: float = STREAM_RENDER_INTERVAL,
+    context: str = "",
+    config: Optional[ModelConfig] = None,
+    cancel: Optional[CancelToken] = None
+) -> Tuple[str, Optional[str], Optional[float], Optional[LLMResponse]]:
+    """
+    Streams a completion, passing the accumulated text to on_delta as it grows.
+    
+    on_delta is called at most once per render_interval, plus once with the
+    final text.
+    
+    Args:
+        llm_service: Instance of LLMService
+        provider: LLM provider name
+        model: Model identifier
+        system_prompt: System prompt
+        user_prompt: User prompt
+        on_delta: Called with the text received so far
+        render_interval: Minimum seconds between on_delta calls
+        context: Stable part of the user message, sent before user_prompt
+        config: Settings for this call instead of the model's defaults
+        cancel: Cancels the call and closes the provider stream
+        
+    Returns:
+        Tuple of (text received, error message if the stream failed, seconds to
+        first token, LLMResponse with token accounting if the stream completed)
+        
+    Raises:
+        GenerationCancelled: If the token was cancelled
+    """
+    start = time.perf_counter()
+    parts = []
+    first_token = None
+    last_render = 0.0
+    error = None
+    completed = []
+    try:
+        for delta in llm_service.stream_content(
+            provider, model, system_prompt, user_prompt, context=context, on_complete=completed.append, config=config,
+            cancel=cancel
+        ):
+            now = time.perf_counter()
+            if first_token is None:
+                first_token = now - start
+            parts.append(delta)
+            if now - last_render >= render_interval:
+                on_delta("".join(parts))
+                last_render = now
+    except GenerationCancelled:
+        # The caller's job is over; none of its follow-up work should run
+        raise
+    except Exception as e:
+        error = str(e)
+    text = "".join(parts).strip()
+    if text:
+        on_delta(text)
+    return text, error, first_token, completed[0] if completed else None
+
+def usage_stats(response: Optional[LLMResponse], fallback_input: str, fallback_output: str) -> Dict:
+    """
+    Returns token counts for a pipeline stage, estimating them when the
+    provider did not report usage.
+    """
+    if response and (response.input_tokens or response.from_cache):
+        return {
+            "input_tokens": response.input_tokens,
+            "cached_input_tokens": response.cached_input_tokens,
+            "cache_write_tokens": response.cache_write_tokens,
+            "output_tokens": response.output_tokens,
+            "from_cache": response.from_cache,
+            "hedged": response.hedged,
+            "served_by": f"{response.provider} {response.model}"
+        }
+    return {
+        "input_tokens": estimate_tokens(fallback_input),
+        "output_tokens": estimate_tokens(fallback_output),
+        "estimated": True
+    }
+
+def run_section_generation(
     llm_service: LLMService, 
     section_key: str, 
     article_text: str, 
@@ -100,10 +357,17 @@ def generate_section_content(
     section_prompt: str,
     provider: str = "OpenAI",
     model: str = "gpt-4o",
-    language: str = "English"
-) -> str:
+    language: str = "English",
+    on_delta: Optional[Callable[[str], None]] = None,
+    cancel: Optional[CancelToken] = None
+) -> Tuple[str, Dict]:
     """
-    Generates content for a newsletter section using the selected LLM.
+    Runs the section generation pipeline without touching Streamlit state,
+    so it can also be called from worker threads.
+    
+    Long article text is condensed first (see utils.source_condenser), then
+    the section is generated from the condensed digest with the model and
+    output cap its section type is routed to (see services.model_router).
     
     Args:
         llm_service: Instance of LLMService
@@ -112,76 +376,464 @@ def generate_section_content(
         notes: Additional notes from the user
         section_prompt: Prompt specific to this section
         provider: LLM provider name
-        model: Model identifier
+        model: Model identifier selected by the user
         language: Target language for generation
+        on_delta: If given, the response is streamed and this is called with
+            the text received so far
+        cancel: Cancels the generation and closes the provider stream; with
+            a token the response is streamed even without on_delta
         
     Returns:
-        Generated content for the section
+        Tuple of (generated content or error message, prompt record with pipeline statistics)
+        
+    Raises:
+        GenerationCancelled: If the token was cancelled
     """
     print(f"\n[Content Generation] Starting content generation for section: {section_key}")
-    print(f"[Content Generation] Using provider: {provider}, model: {model}")
+    router = get_model_router()
+    route = router.route(llm_service, section_key, provider, model)
+    model = route.model
+    print(f"[Content Generation] Using provider: {provider}, model: {model} ({route.reason}, max {route.config.max_tokens} tokens)")
     print(f"[Content Generation] Article text length: {len(article_text)} characters")
     print(f"[Content Generation] Notes: {notes}")
     print(f"[Content Generation] Section prompt: {section_prompt}")
     
-    loading_animation()
-    
-    user_content = (
-        f"{section_prompt}\n\nCombined Article Content:\n{article_text}\n\nNotes: {notes if notes else ''}"
-    )
+    condensed = condense_source_text(llm_service, article_text, provider)
+    if cancel and cancel.cancelled:
+        raise GenerationCancelled(f"Generation of {section_key} was cancelled")
+    if condensed.rounds:
+        print(
+            f"[Content Generation] Condensed article text from {condensed.original_chars} "
+            f"to {condensed.condensed_chars} characters"
+        )
     
-    print(f"[Content Generation] Combined prompt length: {len(user_content)} characters")
+    system_prompt, context, user_content = build_section_prompts(condensed.text, notes, section_prompt, language)
+    full_user_prompt = f"{context}\n\n{user_content}"
+    print(f"[Content Generation] Combined prompt length: {len(full_user_prompt)} characters")
     
-    # Select the appropriate overall prompt based on language
-    from config.prompts import DEFAULT_PROMPTS
+    prompt_record = {
+        "system_prompt": system_prompt,
+        "user_prompt": full_user_prompt,
+        "provider": provider,
+        "model": model,
+        "pipeline": {
+            "condense": condensed.to_dict(),
+            "generate": {"input_tokens": estimate_tokens(system_prompt + full_user_prompt)}
+        }
+    }
+    generate_stats = prompt_record["pipeline"]["generate"]
     
-    if language == "Hebrew":
-        system_prompt = DEFAULT_PROMPTS["overall_hebrew"]
+    start = time.perf_counter()
+    if on_delta is not None or cancel is not None:
+        # Only a stream can be cut short, so a cancellable call streams even with no one watching
+        print("[Content Generation] Streaming from LLM service...")
+        generated_text, error, first_token, response = stream_llm_text(
+            llm_service, provider, model, system_prompt, user_content, on_delta or (lambda _: None),
+            context=context, config=route.config, cancel=cancel
+        )
+        if first_token is not None:
+            generate_stats["first_token_seconds"] = round(first_token, 3)
+        if error and generated_text:
+            # Keep what arrived before the stream was cut off
+            print(f"[Content Generation] Stream interrupted after {len(generated_text)} characters: {error}")
+            generate_stats["output_tokens"] = estimate_tokens(generated_text)
+            generated_text = f"{generated_text}\n\n⚠️ Generation was interrupted: {error}"
+        elif error:
+            generated_text = f"Error generating content: {error}"
+            print(f"[Content Generation] {generated_text}")
+        else:
+            print(f"[Content Generation] Successfully generated content of length: {len(generated_text)} characters")
+            generate_stats.update(usage_stats(response, system_prompt + full_user_prompt, generated_text))
     else:
-        system_prompt = DEFAULT_PROMPTS["overall"]
+        try:
+            print("[Content Generation] Calling LLM service...")
+            response = llm_service.generate(
+                provider=provider,
+                model=model,
+                system_prompt=system_prompt,
+                user_prompt=user_content,
+                context=context,
+                config=route.config
+            )
+            generated_text = response.text
+            print(f"[Content Generation] Successfully generated content of length: {len(generated_text)} characters")
+            generate_stats.update(usage_stats(response, system_prompt + full_user_prompt, generated_text))
+        except Exception as e:
+            generated_text = f"Error generating content: {str(e)}"
+            print(f"[Content Generation] {generated_text}")
+            response = None
+    generate_stats["seconds"] = round(time.perf_counter() - start, 3)
+    prompt_record["pipeline"]["route"] = router.record(route, response, generate_stats["seconds"])
+    
+    return generated_text, prompt_record
+
+def generate_section_content(
+    llm_service: LLMService, 
+    section_key: str, 
+    article_text: str, 
+    notes: str, 
+    section_prompt: str,
+    provider: str = "OpenAI",
+    model: str = "gpt-4o",
+    language: str = "English"
+) -> str:
+    """
+    Generates content for a newsletter section using the selected LLM.
+    
+    Args:
+        llm_service: Instance of LLMService
+        section_key: Identifier for the section
+        article_text: Combined text from articles
+        notes: Additional notes from the user
+        section_prompt: Prompt specific to this section
+        provider: LLM provider name
+        model: Model identifier
+        language: Target language for generation
+        
+    Returns:
+        Generated content for the section
+    """
+    # The spinner is replaced by the text as it streams in
+    output = st.empty()
+    with output.container():
+        loading_animation()
+    
+    generated_text, prompt_record = run_section_generation(
+        llm_service=llm_service,
+        section_key=section_key,
+        article_text=article_text,
+        notes=notes,
+        section_prompt=section_prompt,
+        provider=provider,
+        model=model,
+        language=language,
+        on_delta=lambda text: output.markdown(f"{text} ▌")
+    )
+    output.empty()
     
     # Store the full prompt in session state
     if "section_prompts" not in st.session_state:
         st.session_state.section_prompts = {}
     
-    st.session_state.section_prompts[section_key] = {
-        "system_prompt": system_prompt,
-        "user_prompt": user_content,
-        "provider": provider,
-        "model": model
-    }
+    st.session_state.section_prompts[section_key] = prompt_record
     
+    return generated_text
+
+@dataclass
+class SectionJob:
+    """Inputs for generating one section in a "Generate All" run."""
+    section_name: str  # display name, e.g. "Rearview Mirror 2"
+    section_key: str  # prompt key, e.g. "rearview_2"
+    urls: str
+    notes: str
+    section_prompt: str
+
+@dataclass
+class SectionOutcome:
+    """Result of one section in a "Generate All" run."""
+    job: SectionJob
+    article_text: str
+    generated_text: str
+    prompt_record: Dict
+    seconds: float
+    
+    @property
+    def ok(self) -> bool:
+        return not self.generated_text.startswith("Error generating content")
+
+def run_section_job(
+    llm_service: LLMService,
+    job: SectionJob,
+    provider: str,
+    model: str,
+    language: str,
+    on_delta: Optional[Callable[[str], None]] = None,
+    cancel: Optional[CancelToken] = None
+) -> SectionOutcome:
+    """Fetches and generates one section; runs on a worker thread."""
+    if cancel and cancel.cancelled:
+        raise GenerationCancelled(f"Generation of {job.section_key} was cancelled")
+    start = time.perf_counter()
+    article_text = extract_article_text(job.urls) if job.urls else ""
+    if cancel and cancel.cancelled:
+        raise GenerationCancelled(f"Generation of {job.section_key} was cancelled")
     try:
-        print("[Content Generation] Calling LLM service...")
-        generated_text = llm_service.generate_content(
+        generated_text, prompt_record = run_section_generation(
+            llm_service=llm_service,
+            section_key=job.section_key,
+            article_text=article_text,
+            notes=job.notes,
+            section_prompt=job.section_prompt,
             provider=provider,
             model=model,
-            system_prompt=system_prompt,
-            user_prompt=user_content
+            language=language,
+            on_delta=on_delta,
+            cancel=cancel
         )
-        print(f"[Content Generation] Successfully generated content of length: {len(generated_text)} characters")
-        return generated_text
+    except GenerationCancelled:
+        raise
     except Exception as e:
-        error_msg = f"Error generating content: {str(e)}"
-        print(f"[Content Generation] {error_msg}")
-        return error_msg
+        generated_text, prompt_record = f"Error generating content: {str(e)}", {}
+    return SectionOutcome(job, article_text, generated_text, prompt_record, time.perf_counter() - start)
 
-def edit_section_content(
-    llm_service: LLMService, 
-    section_key: str, 
-    original_text: str, 
+def _prepare_rearview_story(llm_service: LLMService, job: SectionJob, provider: str):
+    """Fetches and condenses one Rearview story's articles; runs on a worker thread."""
+    article_text = extract_article_text(job.urls) if job.urls else ""
+    return article_text, condense_source_text(llm_service, article_text, provider)
+
+def _run_rearview_batch_job(
+    llm_service: LLMService,
+    jobs: List[SectionJob],
+    provider: str,
+    model: str,
+    language: str,
+    cancel: Optional[CancelToken] = None
+) -> List[SectionOutcome]:
+    """
+    Generates several Rearview Mirror stories with a single LLM request.
+    
+    Every story's articles are fetched and condensed concurrently, then all
+    stories are requested at once and the reply is parsed back per story.
+    Stories missing from the reply, or whose line does not parse, are
+    generated with their own call as usual.
+    
+    Args:
+        llm_service: Instance of LLMService
+        jobs: SectionJob of each Rearview story (section keys "rearview_{i}")
+        provider: LLM provider name
+        model: Model identifier
+        language: Target language for generation
+        cancel: Token that stops the batch between its steps
+        
+    Returns:
+        SectionOutcome for every job, in job order
+        
+    Raises:
+        GenerationCancelled: If the token was cancelled
+    """
+    start = time.perf_counter()
+    story_ids = [int(job.section_key.rsplit("_", 1)[1]) for job in jobs]
+    with ThreadPoolExecutor(max_workers=len(jobs), thread_name_prefix="rearview-batch") as executor:
+        prepared = list(executor.map(lambda job: _prepare_rearview_story(llm_service, job, provider), jobs))
+    if cancel and cancel.cancelled:
+        raise GenerationCancelled("Rearview batch was cancelled")
+    
+    stories = [
+        RearviewStory(story_id, condensed.text, job.notes, job.section_prompt)
+        for story_id, job, (_, condensed) in zip(story_ids, jobs, prepared)
+    ]
+    system_prompt, context, user_prompt = build_rearview_batch_prompts(stories, language)
+    full_user_prompt = f"{context}\n\n{user_prompt}"
+    print(f"[Rearview Batch] Generating {len(jobs)} stories in one request ({len(full_user_prompt)} characters)")
+    
+    router = get_model_router()
+    route = router.route(llm_service, jobs[0].section_key, provider, model, stories=len(jobs))
+    generate_start = time.perf_counter()
+    generate_stats = {"batched_stories": len(jobs)}
+    response = None
+    try:
+        response = llm_service.generate(
+            provider, route.model, system_prompt, user_prompt, context=context, config=route.config
+        )
+        parsed = parse_rearview_batch(response.text, story_ids)
+        generate_stats.update(usage_stats(response, system_prompt + full_user_prompt, response.text))
+    except Exception as e:
+        print(f"[Rearview Batch] Batched request failed: {e}")
+        parsed = {}
+    generate_stats["seconds"] = round(time.perf_counter() - generate_start, 3)
+    route_stats = router.record(route, response, generate_stats["seconds"])
+    if cancel and cancel.cancelled:
+        raise GenerationCancelled("Rearview batch was cancelled")
+    batch_seconds = time.perf_counter() - start
+    
+    outcomes: Dict[int, SectionOutcome] = {}
+    missing = []
+    for story_id, job, (article_text, condensed) in zip(story_ids, jobs, prepared):
+        if story_id not in parsed:
+            missing.append((story_id, job, article_text, condensed))
+            continue
+        prompt_record = {
+            "system_prompt": system_prompt,
+            "user_prompt": full_user_prompt,
+            "provider": provider,
+            "model": route.model,
+            "pipeline": {"condense": condensed.to_dict(), "generate": generate_stats, "route": route_stats}
+        }
+        outcomes[story_id] = SectionOutcome(job, article_text, parsed[story_id], prompt_record, batch_seconds)
+    
+    if missing:
+        print(f"[Rearview Batch] {len(missing)} stories missing from the reply; generating them one by one")
+        
+        def fallback(story):
+            story_id, job, article_text, condensed = story
+            fallback_start = time.perf_counter()
+            try:
+                # The condensed text is already within budget, so it is not condensed again
+                generated_text, prompt_record = run_section_generation(
+                    llm_service=llm_service,
+                    section_key=job.section_key,
+                    article_text=condensed.text,
+                    notes=job.notes,
+                    section_prompt=job.section_prompt,
+                    provider=provider,
+                    model=model,
+                    language=language,
+                    cancel=cancel
+                )
+                prompt_record["pipeline"]["condense"] = condensed.to_dict()
+            except GenerationCancelled:
+                raise
+            except Exception as e:
+                generated_text, prompt_record = f"Error generating content: {str(e)}", {}
+            seconds = batch_seconds + time.perf_counter() - fallback_start
+            return story_id, SectionOutcome(job, article_text, generated_text, prompt_record, seconds)
+        
+        with ThreadPoolExecutor(max_workers=len(missing), thread_name_prefix="rearview-fallback") as executor:
+            outcomes.update(executor.map(fallback, missing))
+    
+    return [outcomes[story_id] for story_id in story_ids]
+
+def generate_all_sections(
+    llm_service: LLMService,
+    jobs: List[SectionJob],
+    provider: str = "OpenAI",
+    model: str = "gpt-4o",
+    language: str = "English",
+    max_workers: int = GENERATE_ALL_MAX_WORKERS,
+    batch_rearview: bool = REARVIEW_BATCH_ENABLED,
+    cancel: Optional[CancelToken] = None
+) -> Iterator[SectionOutcome]:
+    """
+    Fetches and generates several sections concurrently.
+    
+    Each section's article fetch and LLM calls run on their own worker, so a
+    full issue takes about as long as its slowest section. Concurrent calls
+    to the provider are capped by LLM_PROVIDER_CONCURRENCY.
+    
+    With batch_rearview, the Rearview Mirror stories share one worker and a
+    single LLM request (see _run_rearview_batch_job) when there are at least
+    REARVIEW_BATCH_MIN_STORIES of them.
+    
+    Outcomes are yielded as sections finish, on the caller's thread, so the
+    caller can report progress right away. Cancelling the token stops every
+    section in flight and drops the sections not yet started.
+    
+    Args:
+        llm_service: Instance of LLMService
+        jobs: Sections to generate
+        provider: LLM provider name
+        model: Model identifier
+        language: Target language for generation
+        max_workers: Maximum sections processed at once
+        batch_rearview: Generate the Rearview stories in one request
+        cancel: Token that stops the whole run
+        
+    Yields:
+        SectionOutcome for each section, in completion order
+        
+    Raises:
+        GenerationCancelled: If the token was cancelled
+    """
+    if not jobs:
+        return
+    
+    rearview_jobs = [job for job in jobs if job.section_key.startswith("rearview_")]
+    if not batch_rearview or len(rearview_jobs) < REARVIEW_BATCH_MIN_STORIES:
+        rearview_jobs = []
+    
+    print(f"\n[Generate All] Generating {len(jobs)} sections with {provider} {model}")
+    start = time.perf_counter()
+    workers = len(jobs) - len(rearview_jobs) + (1 if rearview_jobs else 0)
+    with ThreadPoolExecutor(max_workers=min(max_workers, workers), thread_name_prefix="generate-all") as executor:
+        futures = [
+            executor.submit(run_section_job, llm_service, job, provider, model, language, cancel=cancel)
+            for job in jobs
+            if job not in rearview_jobs
+        ]
+        if rearview_jobs:
+            futures.append(executor.submit(
+                _run_rearview_batch_job, llm_service, rearview_jobs, provider, model, language, cancel=cancel
+            ))
+        try:
+            for future in as_completed(futures):
+                result = future.result()
+                for outcome in result if isinstance(result, list) else [result]:
+                    print(f"[Generate All] {outcome.job.section_name} finished in {outcome.seconds:.2f}s")
+                    yield outcome
+        except GenerationCancelled:
+            for future in futures:
+                future.cancel()
+            print(f"[Generate All] Cancelled after {time.perf_counter() - start:.2f}s")
+            raise
+    
+    print(f"[Generate All] All sections finished in {time.perf_counter() - start:.2f}s")
+
+def _patch_edit(
+    llm_service: LLMService,
+    original_text: str,
+    system_prompt: str,
+    context: str,
+    user_content: str,
+    provider: str,
+    model: str,
+    cancel: Optional[CancelToken] = None
+) -> Tuple[Optional[str], Dict]:
+    """
+    Asks for an edit as a list of replacements and applies it to original_text.
+    
+    Returns:
+        Tuple of (edited text, or None if the patch failed or did not apply,
+        edit statistics)
+    """
+    from config.prompts import EDIT_PATCH_PROMPT
+    
+    start = time.perf_counter()
+    stats = {"mode": "patch"}
+    try:
+        patch_text, error, _, response = stream_llm_text(
+            llm_service, provider, model, system_prompt, f"{user_content}\n\n{EDIT_PATCH_PROMPT}", lambda _: None,
+            context=context, cancel=cancel
+        )
+        if error:
+            raise Exception(error)
+        stats.update(usage_stats(response, system_prompt + context + user_content, patch_text))
+        replacements = parse_patch(patch_text)
+        edited_text = apply_patch(original_text, replacements).strip()
+        stats["replacements"] = len(replacements)
+    except GenerationCancelled:
+        raise
+    except PatchError as e:
+        stats["fallback_reason"] = str(e)
+        edited_text = None
+    except Exception as e:
+        stats["fallback_reason"] = f"patch request failed: {e}"
+        edited_text = None
+    stats["seconds"] = round(time.perf_counter() - start, 3)
+    return edited_text, stats
+
+def run_section_edit(
+    llm_service: LLMService,
+    section_key: str,
+    original_text: str,
     edit_prompt: str,
     provider: str = "OpenAI",
     model: str = "gpt-4o",
-    # Add new parameters for context
     article_text: str = "",
     notes: str = "",
     section_prompt: str = "",
-    overall_prompt: str = ""
-) -> str:
+    overall_prompt: str = "",
+    on_delta: Optional[Callable[[str], None]] = None,
+    use_patch: bool = EDIT_PATCH_ENABLED,
+    cancel: Optional[CancelToken] = None
+) -> Tuple[str, Dict]:
     """
-    Edits content for a newsletter section using the selected LLM,
-    with full context from the original content generation.
+    Runs an AI edit without touching Streamlit state, so it can also be
+    called from worker threads.
+    
+    Sections of at least EDIT_PATCH_MIN_CHARS characters are first edited
+    with a patch: the model returns only the replacements, which are applied
+    locally. If the patch is malformed or does not apply cleanly, the section
+    is rewritten in full as before.
     
     Args:
         llm_service: Instance of LLMService
@@ -194,42 +846,208 @@ def edit_section_content(
         notes: Additional notes from the user provided during original generation
         section_prompt: Prompt specific to this section used in original generation
         overall_prompt: Overall newsletter style prompt
+        on_delta: If given, the response is streamed and this is called with
+            the text received so far
+        use_patch: Try a patch-style edit before a full rewrite
+        cancel: Cancels the edit and closes the provider stream
         
     Returns:
-        Edited content for the section
+        Tuple of (edited content or error message, edit statistics including
+        the output tokens and time a patch saved over a full rewrite; empty
+        if the edit failed)
     """
-    loading_animation()
-    
-    # Build a more comprehensive prompt with all the context
-    user_content = (
-        f"Please edit the following newsletter section according to these instructions: {edit_prompt}\n\n"
-        f"Original Section Content:\n{original_text}\n\n"
-    )
-    
-    # Add context information if available
+    # The context is the same on every edit iteration, so it goes first where
+    # it can be served from the provider's prompt cache
+    context = ""
     if article_text:
-        user_content += f"Original Article Content Used:\n{article_text}\n\n"
+        context += f"Original Article Content Used:\n{article_text}\n\n"
     
     if notes:
-        user_content += f"User's Notes:\n{notes}\n\n"
+        context += f"User's Notes:\n{notes}\n\n"
     
     if section_prompt:
-        user_content += f"Section-Specific Guidelines:\n{section_prompt}\n\n"
+        context += f"Section-Specific Guidelines:\n{section_prompt}\n\n"
+    context = context.strip()
+    
+    user_content = (
+        f"Please edit the following newsletter section according to these instructions: {edit_prompt}\n\n"
+        f"Original Section Content:\n{original_text}"
+    )
     
     # Use the provided overall_prompt if available, otherwise use the default
     from config.prompts import DEFAULT_PROMPTS
     system_prompt = overall_prompt if overall_prompt else DEFAULT_PROMPTS["overall"]
     
-    try:
-        edited_text = llm_service.generate_content(
-            provider=provider,
-            model=model,
-            system_prompt=system_prompt,
-            user_prompt=user_content
+    patch_stats = None
+    if use_patch and len(original_text) >= EDIT_PATCH_MIN_CHARS:
+        edited_text, patch_stats = _patch_edit(
+            llm_service, original_text, system_prompt, context, user_content, provider, model, cancel
         )
-        return edited_text
-    except Exception as e:
-        return f"Error editing content: {str(e)}"
+        if cancel and cancel.cancelled:
+            return "Error editing content: the edit was cancelled", {}
+        if edited_text is not None:
+            # A full rewrite would have returned about as many tokens as the edited text
+            rewrite_tokens = estimate_tokens(edited_text)
+            patch_stats["rewrite_output_tokens"] = rewrite_tokens
+            rate = get_model_router().seconds_per_output_token(model)
+            if rate and not patch_stats.get("from_cache"):
+                saved_tokens = max(rewrite_tokens - patch_stats["output_tokens"], 0)
+                patch_stats["saved_seconds"] = round(saved_tokens * rate, 2)
+            print(
+                f"[Edit] Applied {patch_stats['replacements']} replacements to {section_key} "
+                f"({patch_stats['output_tokens']} output tokens instead of ~{rewrite_tokens})"
+            )
+            if on_delta is not None:
+                on_delta(edited_text)
+            return edited_text, patch_stats
+        print(f"[Edit] Patch for {section_key} failed, rewriting in full: {patch_stats['fallback_reason']}")
+    
+    start = time.perf_counter()
+    if on_delta is not None:
+        edited_text, error, _, response = stream_llm_text(
+            llm_service, provider, model, system_prompt, user_content, on_delta, context=context, cancel=cancel
+        )
+        if error and edited_text:
+            # Keep what arrived before the stream was cut off
+            return f"{edited_text}\n\n⚠️ Edit was interrupted: {error}", {}
+        if error:
+            return f"Error editing content: {error}", {}
+    else:
+        try:
+            response = llm_service.generate(
+                provider=provider,
+                model=model,
+                system_prompt=system_prompt,
+                user_prompt=user_content,
+                context=context
+            )
+            edited_text = response.text
+        except Exception as e:
+            return f"Error editing content: {str(e)}", {}
+    
+    stats = {"mode": "rewrite", "seconds": round(time.perf_counter() - start, 3)}
+    stats.update(usage_stats(response, system_prompt + context + user_content, edited_text))
+    if patch_stats is not None:
+        # The failed patch's time and tokens are part of this edit's cost
+        stats["fallback_reason"] = patch_stats["fallback_reason"]
+        stats["patch_seconds"] = patch_stats["seconds"]
+        stats["patch_output_tokens"] = patch_stats.get("output_tokens", 0)
+    return edited_text, stats
+
+def run_section_edit_job(
+    llm_service: LLMService,
+    section_key: str,
+    original_text: str,
+    edit_prompt: str,
+    urls: str,
+    stored_article_text: Optional[str],
+    provider: str = "OpenAI",
+    model: str = "gpt-4o",
+    notes: str = "",
+    section_prompt: str = "",
+    overall_prompt: str = "",
+    on_delta: Optional[Callable[[str], None]] = None,
+    cancel: Optional[CancelToken] = None
+) -> Tuple[str, Dict, Optional[Tuple[str, str]]]:
+    """
+    Fetches a section's articles unless their stored text can be reused,
+    then runs the AI edit; runs on a worker thread.
+    
+    Args:
+        llm_service: Instance of LLMService
+        section_key: Identifier for the section
+        original_text: Section content to edit
+        edit_prompt: Instructions for editing
+        urls: The section's URL field
+        stored_article_text: Text from get_stored_section_source, or None to fetch the URLs
+        provider: LLM provider name
+        model: Model identifier
+        notes: Additional notes from the user provided during original generation
+        section_prompt: Prompt specific to this section used in original generation
+        overall_prompt: Overall newsletter style prompt
+        on_delta: Called with the edited text received so far
+        cancel: Cancels the fetch and the edit
+        
+    Returns:
+        Tuple of (edited text, edit statistics, fetched source); the fetched
+        source is (urls, article text) for the caller to store with
+        store_section_source, or None if the stored text was used
+    """
+    fetched_source = None
+    article_text = stored_article_text
+    if article_text is None:
+        article_text = extract_article_text(urls) if urls else ""
+        fetched_source = (urls, article_text)
+    if cancel and cancel.cancelled:
+        raise GenerationCancelled(f"Edit of {section_key} was cancelled")
+    edited_text, stats = run_section_edit(
+        llm_service=llm_service,
+        section_key=section_key,
+        original_text=original_text,
+        edit_prompt=edit_prompt,
+        provider=provider,
+        model=model,
+        article_text=article_text,
+        notes=notes,
+        section_prompt=section_prompt,
+        overall_prompt=overall_prompt,
+        on_delta=on_delta,
+        cancel=cancel
+    )
+    return edited_text, stats, fetched_source
+
+def edit_section_content(
+    llm_service: LLMService, 
+    section_key: str, 
+    original_text: str, 
+    edit_prompt: str,
+    provider: str = "OpenAI",
+    model: str = "gpt-4o",
+    # Add new parameters for context
+    article_text: str = "",
+    notes: str = "",
+    section_prompt: str = "",
+    overall_prompt: str = "",
+    on_delta: Optional[Callable[[str], None]] = None,
+    use_patch: bool = EDIT_PATCH_ENABLED
+) -> str:
+    """
+    Edits content for a newsletter section using the selected LLM,
+    with full context from the original content generation.
+    
+    See run_section_edit for the patch-style edit and its fallback. The
+    statistics of the edit are stored in st.session_state.edit_stats[section_key].
+    
+    Args:
+        llm_service: Instance of LLMService
+        section_key: Identifier for the section
+        original_text: Original section content
+        edit_prompt: Instructions for editing
+        provider: LLM provider name
+        model: Model identifier
+        article_text: Combined text from articles used to generate the original content
+        notes: Additional notes from the user provided during original generation
+        section_prompt: Prompt specific to this section used in original generation
+        overall_prompt: Overall newsletter style prompt
+        on_delta: If given, the response is streamed and this is called with
+            the text received so far
+        use_patch: Try a patch-style edit before a full rewrite
+        
+    Returns:
+        Edited content for the section
+    """
+    if on_delta is None:
+        loading_animation()
+    
+    edited_text, stats = run_section_edit(
+        llm_service, section_key, original_text, edit_prompt, provider, model,
+        article_text, notes, section_prompt, overall_prompt, on_delta, use_patch
+    )
+    if stats:
+        if "edit_stats" not in st.session_state:
+            st.session_state.edit_stats = {}
+        st.session_state.edit_stats[section_key] = stats
+    return edited_text
 
 def generate_newsletter_html(
     sections_content: str, 
@@ -310,8 +1128,13 @@ def render_newsletter_preview(newsletter_html: str, height: int = 600) -> None:
     """
     components.html(newsletter_html, height=height, scrolling=True)
 
+# The export libraries are imported by their export functions, so they are
+# only loaded when a newsletter is exported in that format.
+
 def export_to_pdf(html_content: str, output_path: str) -> None:
     """Export newsletter to PDF format."""
+    import pdfkit
+    
     options = {
         'page-size': 'A4',
         'margin-top': '0.75in',
@@ -325,6 +1148,8 @@ def export_to_pdf(html_content: str, output_path: str) -> None:
 
 def export_to_docx(html_content: str, output_path: str) -> None:
     """Export newsletter to DOCX format."""
+    import docx
+    
     doc = docx.Document()
     
     # Convert HTML to plain text (basic conversion)
@@ -339,6 +1164,8 @@ def export_to_docx(html_content: str, output_path: str) -> None:
 
 def export_to_markdown(html_content: str, output_path: str) -> None:
     """Export newsletter to Markdown format."""
+    import html2text
+    
     # Convert HTML to Markdown
     h = html2text.HTML2Text()
     h.ignore_links = False
@@ -356,6 +1183,8 @@ def export_to_json(newsletter_data: Dict, output_path: str) -> None:
 
 def export_to_yaml(newsletter_data: Dict, output_path: str) -> None:
     """Export newsletter to YAML format."""
+    import yaml
+    
     with open(output_path, 'w', encoding='utf-8') as f:
         yaml.dump(newsletter_data, f, allow_unicode=True, sort_keys=False)
 
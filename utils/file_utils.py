@@ -82,6 +82,7 @@ def update_session_state_from_newsletter(newsletter: Newsletter) -> None:
     st.session_state["num_rearview"] = newsletter.num_rearview
     st.session_state["generated_sections"] = newsletter.get_generated_sections()
     st.session_state["edited_sections"] = newsletter.edited_sections
+    st.session_state["section_sources"] = newsletter.get_section_sources()
     
     # Windshield section
     st.session_state["windshield_urls"] = newsletter.windshield.urls
@@ -144,4 +145,7 @@ def create_newsletter_from_session_state() -> Newsletter:
         newsletter.rearview_sections[i].prompt = st.session_state.get(f"rearview_prompt_{i}", "")
         newsletter.rearview_sections[i].content = st.session_state.get("generated_sections", {}).get(f"Rearview Mirror {i}", "")
     
+    # Source text extracted at generation time, reused by Edit Mode
+    newsletter.set_section_sources(st.session_state.get("section_sources", {}))
+    
     return newsletter
\ No newline at end of file
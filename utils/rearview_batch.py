@@ -0,0 +1,85 @@
+"""
+Prompts and parsing for generating all Rearview Mirror stories in one request.
+
+Every story's sources go into a single context, followed by each story's own
+instructions. The model answers with one JSON object per line, so a reply
+cut off by the token limit still yields every story before the cut.
+"""
+import json
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+from config.prompts import DEFAULT_PROMPTS, REARVIEW_BATCH_PROMPT
+
+
+@dataclass
+class RearviewStory:
+    """Inputs of one story in a batched Rearview request."""
+    story_id: int  # the i of "Rearview Mirror {i}"
+    article_text: str  # condensed article text
+    notes: str
+    section_prompt: str
+
+
+def build_rearview_batch_prompts(stories: List[RearviewStory], language: str = "English") -> Tuple[str, str, str]:
+    """
+    Builds the prompts for generating several Rearview stories in one request.
+
+    Args:
+        stories: Stories to generate, in order
+        language: Target language for generation
+
+    Returns:
+        Tuple of (system_prompt, context, user_prompt); the context holds every
+        story's articles so it can be cached by the provider
+    """
+    system_prompt = DEFAULT_PROMPTS["overall_hebrew"] if language == "Hebrew" else DEFAULT_PROMPTS["overall"]
+    context = "\n\n".join(
+        f"Story {story.story_id} - Combined Article Content:\n{story.article_text}"
+        for story in stories
+    )
+    instructions = "\n\n".join(
+        f"Story {story.story_id}:\n{story.section_prompt}\nNotes: {story.notes}"
+        for story in stories
+    )
+    user_prompt = f"{REARVIEW_BATCH_PROMPT}\n\n{instructions}"
+    return system_prompt, context, user_prompt
+
+
+def parse_rearview_batch(text: str, story_ids: List[int]) -> Dict[int, str]:
+    """
+    Parses the per-story results of a batched Rearview reply.
+
+    Lines that are not a JSON object with a known id and non-empty text are
+    ignored, as are repeated ids after the first.
+
+    Args:
+        text: Model reply
+        story_ids: Ids of the stories that were requested
+
+    Returns:
+        Story text keyed by story id, for every story that parsed
+    """
+    results: Dict[int, str] = {}
+    for line in text.splitlines():
+        line = line.strip().rstrip(",")
+        # Tolerate replies wrapped in a code fence or a JSON array
+        line = re.sub(r"^(```(json)?|\[)\s*", "", line)
+        line = re.sub(r"\s*(```|\])$", "", line)
+        if not line.startswith("{"):
+            continue
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            continue
+        if not isinstance(entry, dict):
+            continue
+        try:
+            story_id = int(entry.get("id"))
+        except (TypeError, ValueError):
+            continue
+        story_text = entry.get("text")
+        if story_id in story_ids and story_id not in results and isinstance(story_text, str) and story_text.strip():
+            results[story_id] = story_text.strip()
+    return results
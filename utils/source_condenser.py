@@ -0,0 +1,163 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Tuple
+
+from config.prompts import CONDENSE_PROMPT
+from config.settings import (
+    SOURCE_TEXT_BUDGET_CHARS,
+    CONDENSE_CHUNK_CHARS,
+    CONDENSE_MAX_WORKERS,
+    CONDENSE_MAX_ROUNDS,
+    CONDENSE_MODELS
+)
+from services.llm_service import LLMService
+
+WARNING_MARKER = "\n\n⚠️ "
+
+
+@dataclass
+class CondenseResult:
+    """Condensed source text and statistics for each pipeline stage."""
+    text: str
+    original_chars: int
+    condensed_chars: int
+    chunks: int = 0
+    rounds: int = 0
+    model: str = ""
+    input_tokens: int = 0
+    output_tokens: int = 0
+    stage_seconds: Dict[str, float] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict:
+        """Returns the statistics without the condensed text."""
+        stats = asdict(self)
+        stats.pop("text")
+        return stats
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for English text (about four characters per token)."""
+    return len(text) // 4
+
+
+def split_into_chunks(text: str, chunk_chars: int = CONDENSE_CHUNK_CHARS) -> List[str]:
+    """
+    Splits text into chunks of at most chunk_chars, preferring paragraph boundaries.
+
+    Args:
+        text: Text to split
+        chunk_chars: Maximum characters per chunk
+
+    Returns:
+        List of chunks in original order
+    """
+    chunks = []
+    current = ""
+    for paragraph in text.split("\n"):
+        # Hard-split paragraphs that are longer than a whole chunk
+        while len(paragraph) > chunk_chars:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(paragraph[:chunk_chars])
+            paragraph = paragraph[chunk_chars:]
+        if current and len(current) + len(paragraph) + 1 > chunk_chars:
+            chunks.append(current)
+            current = ""
+        current = f"{current}\n{paragraph}" if current else paragraph
+    if current.strip():
+        chunks.append(current)
+    return chunks
+
+
+def _condense_chunk(llm_service: LLMService, provider: str, model: str, chunk: str, budget: int) -> Tuple[str, int, int]:
+    """Condenses one chunk, falling back to a truncated copy if the model call fails."""
+    try:
+        response = llm_service.generate(
+            provider=provider,
+            model=model,
+            system_prompt=CONDENSE_PROMPT,
+            user_prompt=chunk
+        )
+        digest = response.text
+        if response.input_tokens:
+            return digest, response.input_tokens, response.output_tokens
+        return digest, estimate_tokens(CONDENSE_PROMPT + chunk), estimate_tokens(digest)
+    except Exception as e:
+        print(f"[Source Condensing] Chunk failed, keeping a truncated copy: {e}")
+        return chunk[:budget], 0, 0
+
+
+def condense_source_text(
+    llm_service: LLMService,
+    article_text: str,
+    provider: str,
+    budget_chars: int = SOURCE_TEXT_BUDGET_CHARS,
+    chunk_chars: int = CONDENSE_CHUNK_CHARS,
+    max_workers: int = CONDENSE_MAX_WORKERS
+) -> CondenseResult:
+    """
+    Condenses article text that exceeds the budget with a map-reduce pass.
+
+    The text is split into chunks, each chunk is condensed in parallel with
+    the provider's cheap model (map), and the digests are joined (reduce).
+    If the joined digest is still over budget another round is run.
+
+    Args:
+        llm_service: Instance of LLMService
+        article_text: Combined text from articles
+        provider: LLM provider name, used to pick the condensing model
+        budget_chars: Text at or below this length is returned unchanged
+        chunk_chars: Maximum characters per chunk
+        max_workers: Maximum chunks condensed at once
+
+    Returns:
+        CondenseResult with the digest and per-stage timings and token counts
+    """
+    result = CondenseResult(
+        text=article_text,
+        original_chars=len(article_text),
+        condensed_chars=len(article_text)
+    )
+    if len(article_text) <= budget_chars or provider not in CONDENSE_MODELS:
+        return result
+
+    # Keep extraction warnings out of the model input and re-attach them afterwards
+    text, marker, warning = article_text.partition(WARNING_MARKER)
+    result.model = CONDENSE_MODELS[provider]
+
+    while len(text) > budget_chars and result.rounds < CONDENSE_MAX_ROUNDS:
+        result.rounds += 1
+
+        start = time.perf_counter()
+        chunks = split_into_chunks(text, chunk_chars)
+        result.stage_seconds[f"split_{result.rounds}"] = round(time.perf_counter() - start, 3)
+        result.chunks += len(chunks)
+        chunk_budget = max(budget_chars // len(chunks), 200)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+            digests = list(executor.map(
+                lambda chunk: _condense_chunk(llm_service, provider, result.model, chunk, chunk_budget),
+                chunks
+            ))
+        result.stage_seconds[f"map_{result.rounds}"] = round(time.perf_counter() - start, 3)
+
+        start = time.perf_counter()
+        text = "\n\n".join(digest for digest, _, _ in digests if digest.strip())
+        result.input_tokens += sum(tokens for _, tokens, _ in digests)
+        result.output_tokens += sum(tokens for _, _, tokens in digests)
+        result.stage_seconds[f"reduce_{result.rounds}"] = round(time.perf_counter() - start, 3)
+
+        print(
+            f"[Source Condensing] Round {result.rounds}: {len(chunks)} chunks condensed to "
+            f"{len(text)} characters in {result.stage_seconds[f'map_{result.rounds}']:.2f}s"
+        )
+
+    if len(text) > budget_chars:
+        text = text[:budget_chars]
+
+    result.text = f"{text}{marker}{warning}" if marker else text
+    result.condensed_chars = len(result.text)
+    return result
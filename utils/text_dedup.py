@@ -0,0 +1,89 @@
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Set, Tuple
+
+from config.settings import DEDUP_SIMILARITY, DEDUP_MIN_PARAGRAPH_CHARS
+
+SHINGLE_SIZE = 3
+
+
+@dataclass
+class DedupStats:
+    """Summary of a deduplication pass."""
+    paragraphs_seen: int = 0
+    paragraphs_removed: int = 0
+    chars_saved: int = 0
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> Set[str]:
+    """
+    Returns the set of word shingles (overlapping word n-grams) of a text.
+
+    Args:
+        text: Paragraph text
+        size: Words per shingle
+
+    Returns:
+        Set of lowercase shingles, punctuation ignored
+    """
+    words = re.findall(r"\w+", text.lower())
+    if len(words) < size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def deduplicate_paragraphs(
+    texts: List[str],
+    similarity: float = DEDUP_SIMILARITY,
+    min_chars: int = DEDUP_MIN_PARAGRAPH_CHARS
+) -> Tuple[List[str], DedupStats]:
+    """
+    Drops paragraphs that repeat (or nearly repeat) an earlier paragraph.
+
+    Paragraphs are compared across all texts by the Jaccard similarity of
+    their word shingles, so the same wire-service copy quoted by several
+    sources is only kept the first time it appears. An inverted shingle
+    index limits comparisons to paragraphs that share at least one shingle.
+
+    Args:
+        texts: Article texts with one paragraph per line
+        similarity: Minimum Jaccard similarity for a paragraph to count as a duplicate
+        min_chars: Paragraphs shorter than this are never dropped
+
+    Returns:
+        Tuple of (texts with duplicates removed, DedupStats)
+    """
+    stats = DedupStats()
+    kept_sizes: List[int] = []
+    index: Dict[str, List[int]] = {}
+    deduplicated = []
+
+    for text in texts:
+        kept = []
+        for paragraph in text.split("\n"):
+            stats.paragraphs_seen += 1
+            paragraph_shingles = shingles(paragraph)
+            if len(paragraph.strip()) < min_chars or not paragraph_shingles:
+                kept.append(paragraph)
+                continue
+
+            shared = Counter(other for shingle in paragraph_shingles for other in index.get(shingle, ()))
+            is_duplicate = any(
+                count / (len(paragraph_shingles) + kept_sizes[other] - count) >= similarity
+                for other, count in shared.items()
+            )
+
+            if is_duplicate:
+                stats.paragraphs_removed += 1
+                stats.chars_saved += len(paragraph) + 1
+                continue
+
+            paragraph_id = len(kept_sizes)
+            kept_sizes.append(len(paragraph_shingles))
+            for shingle in paragraph_shingles:
+                index.setdefault(shingle, []).append(paragraph_id)
+            kept.append(paragraph)
+        deduplicated.append("\n".join(kept))
+
+    return deduplicated, stats
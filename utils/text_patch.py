@@ -0,0 +1,99 @@
+"""
+Parsing and applying patch-style edits.
+
+Instead of rewriting a whole section, the model replies with a list of
+replacements, one JSON object per line: {"find": ..., "replace": ...}. Each
+"find" must occur exactly once in the text being edited, so a patch either
+applies unambiguously or is rejected and the edit falls back to a full
+rewrite.
+"""
+import json
+import re
+from dataclasses import dataclass
+from typing import List
+
+
+class PatchError(ValueError):
+    """Raised when a patch cannot be parsed or does not apply cleanly."""
+
+
+@dataclass
+class TextReplacement:
+    """One replacement of a patch."""
+    find: str
+    replace: str
+
+
+def _replacement(entry) -> TextReplacement:
+    if not isinstance(entry, dict) or not isinstance(entry.get("find"), str) or not isinstance(entry.get("replace"), str):
+        raise PatchError(f"Not a replacement: {entry!r}")
+    if not entry["find"]:
+        raise PatchError("Replacement with an empty find")
+    return TextReplacement(entry["find"], entry["replace"])
+
+
+def parse_patch(text: str) -> List[TextReplacement]:
+    """
+    Parses a patch reply.
+
+    Accepts one JSON object per line, a JSON array, and either of them
+    wrapped in a code fence.
+
+    Args:
+        text: Model reply
+
+    Returns:
+        Replacements in the order they were given
+
+    Raises:
+        PatchError: If the reply holds no replacements or a line is not one
+    """
+    text = re.sub(r"^```(json)?\s*|\s*```$", "", text.strip())
+    if text.startswith("["):
+        try:
+            entries = json.loads(text)
+        except ValueError as e:
+            raise PatchError(f"Malformed patch: {e}")
+        replacements = [_replacement(entry) for entry in entries] if isinstance(entries, list) else []
+    else:
+        replacements = []
+        for line in text.splitlines():
+            line = line.strip().rstrip(",")
+            if not line:
+                continue
+            try:
+                replacements.append(_replacement(json.loads(line)))
+            except ValueError as e:
+                raise PatchError(f"Malformed patch line {line[:80]!r}: {e}")
+    if not replacements:
+        raise PatchError("Patch has no replacements")
+    return replacements
+
+
+def apply_patch(original: str, replacements: List[TextReplacement]) -> str:
+    """
+    Applies replacements in order, each to the result of the previous ones.
+
+    Args:
+        original: Text to edit
+        replacements: Replacements from parse_patch
+
+    Returns:
+        The edited text
+
+    Raises:
+        PatchError: If a find does not occur exactly once, or the patch
+            leaves the text unchanged or empty
+    """
+    text = original
+    for replacement in replacements:
+        count = text.count(replacement.find)
+        if count != 1:
+            where = "not found" if count == 0 else f"found {count} times"
+            raise PatchError(f"{replacement.find[:60]!r} {where}")
+        text = text.replace(replacement.find, replacement.replace)
+    if not text.strip():
+        raise PatchError("Patch leaves the text empty")
+    if text == original:
+        raise PatchError("Patch leaves the text unchanged")
+    return text